@@ -4,7 +4,6 @@ from util.utils import (
     create_logger_with_prefix,
     create_status_listener,
     string_to_version,
-    uint8array_to_hex,
 )
 from app_manager.constants.appId import APP_VERSION
 from app_manager.proto.generated.manager import (
@@ -91,6 +90,8 @@ async def update_firmware(
             await handle_legacy_device(sdk, version)
 
     force_status_update(UpdateFirmwareStatus.UPDATE_FIRMWARE_STATUS_USER_CONFIRMED)
+    # The versions known for the device are stale once it is flashed
+    await sdk.invalidate_capabilities()
 
     bootloader_sdk = await create_bootloader_sdk(
         sdk,
@@ -99,10 +100,7 @@ async def update_firmware(
     )
 
     await bootloader_sdk.before_operation()
-    await bootloader_sdk.send_bootloader_data(
-        uint8array_to_hex(firmware),
-        params.onProgress,
-    )
+    await bootloader_sdk.send_bootloader_data(firmware, params.onProgress)
     await bootloader_sdk.destroy()
 
     try:
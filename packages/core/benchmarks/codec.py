@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+"""
+Codec micro-benchmarks replaying the encoder and helper fixtures.
+
+Every benchmark runs one pass over a fixture set per operation and reports
+ops/sec and bytes/sec. Results are compared against `baseline.json`; a
+benchmark slower than its baseline by more than the tolerance fails the run.
+
+Usage:
+    python packages/core/benchmarks/codec.py [--filter NAME] [--tolerance 0.25]
+    python packages/core/benchmarks/codec.py --update-baseline
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+from core.encoders.packet.__fixtures__.legacy import (
+    create_ack_packet_test_cases,
+    xmodem_decode_test_cases,
+    xmodem_encode_test_cases,
+)
+from core.encoders.packet.__fixtures__.packet import (
+    packet_data_test_cases,
+    payload_data_test_cases,
+)
+from core.encoders.packet.legacy import (
+    create_ack_packet,
+    xmodem_decode,
+    xmodem_encode,
+)
+from core.encoders.packet.packet import (
+    decode_packet,
+    decode_payload_data,
+    encode_packet,
+    encode_payload_data,
+)
+from core.encoders.raw import decode_raw_data, decode_status, encode_raw_data
+from core.encoders.raw.__fixtures__ import (
+    decode_status_test_cases,
+    raw_data_test_cases,
+)
+from core.operations.helpers.__fixtures__.write_command import (
+    write_command_helper_test_cases,
+)
+from core.utils.packetversion import PacketVersionMap
+from util.utils import crc16, hex_to_uint8array, is_hex, uint8array_to_hex
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+DEFAULT_TOLERANCE = 0.25
+MIN_DURATION = 0.05
+ROUNDS = 15
+
+legacy_versions = [PacketVersionMap.v1, PacketVersionMap.v2]
+
+
+class Benchmark(NamedTuple):
+    name: str
+    run: Callable[[], None]
+    size: int
+
+
+class BenchmarkResult(NamedTuple):
+    name: str
+    ops_per_sec: float
+    bytes_per_sec: float
+
+
+def _v3_packet_cases() -> List[Dict]:
+    return packet_data_test_cases["valid_encodings"]
+
+
+def _legacy_encode_cases() -> List[Dict]:
+    return [
+        {**test_case["params"], "version": version}
+        for version in legacy_versions
+        for test_case in xmodem_encode_test_cases[f"valid_{version}"]
+    ]
+
+
+def _legacy_decode_cases() -> List[Dict]:
+    return [
+        {"packet_data": test_case["raw_packets"], "version": version}
+        for version in legacy_versions
+        for test_case in xmodem_decode_test_cases[f"valid_{version}"]
+    ] + [
+        {
+            "packet_data": b"".join(xmodem_encode(**test_case)),
+            "version": test_case["version"],
+        }
+        for test_case in _legacy_encode_cases()
+    ]
+
+
+def _write_command_packets() -> List[bytes]:
+    return [
+        packet
+        for test_case in write_command_helper_test_cases["valid"]
+        for packet in [test_case["packet"], *test_case["ack_packets"]]
+    ]
+
+
+def create_benchmarks() -> List[Benchmark]:
+    v3_packets = _v3_packet_cases()
+    encoded_v3 = [b"".join(test_case["encoded"]) for test_case in v3_packets]
+    payloads = [
+        test_case
+        for test_case in payload_data_test_cases["valid_encodings"]
+        if test_case["encoded"]
+    ]
+    legacy_encode = _legacy_encode_cases()
+    legacy_decode = _legacy_decode_cases()
+    ack_cases = [
+        {**test_case["params"], "version": version}
+        for version in legacy_versions
+        for test_case in create_ack_packet_test_cases[f"valid_{version}"]
+    ]
+    raw_data = raw_data_test_cases["valid_encodings"]
+    statuses = [
+        test_case["encoded"]
+        for test_case in decode_status_test_cases["valid_encodings"]
+        if test_case["encoded"]
+    ]
+    write_command_packets = _write_command_packets()
+    all_packets = (
+        encoded_v3
+        + write_command_packets
+        + [test_case["packet_data"] for test_case in legacy_decode]
+    )
+    hex_strings = [packet.hex() for packet in all_packets]
+
+    def encode_v3():
+        for test_case in v3_packets:
+            encode_packet(
+                raw_data=test_case.get("raw_data", ""),
+                proto_data=test_case.get("proto_data", ""),
+                version=PacketVersionMap.v3,
+                sequence_number=test_case["sequence_number"],
+                packet_type=test_case["packet_type"],
+            )
+
+    def decode_v3():
+        for packet in encoded_v3:
+            decode_packet(packet, PacketVersionMap.v3)
+
+    def decode_write_command():
+        for packet in write_command_packets:
+            decode_packet(packet, PacketVersionMap.v3)
+
+    def encode_payload():
+        for test_case in payloads:
+            encode_payload_data(
+                test_case["raw_data"], test_case["protobuf_data"], PacketVersionMap.v3
+            )
+
+    def decode_payload():
+        for test_case in payloads:
+            decode_payload_data(test_case["encoded"], PacketVersionMap.v3)
+
+    def encode_legacy():
+        for test_case in legacy_encode:
+            xmodem_encode(**test_case)
+
+    def decode_legacy():
+        for test_case in legacy_decode:
+            xmodem_decode(**test_case)
+
+    def create_ack():
+        for test_case in ack_cases:
+            create_ack_packet(**test_case)
+
+    def encode_raw():
+        for test_case in raw_data:
+            encode_raw_data(test_case["raw_data"], PacketVersionMap.v3)
+
+    def decode_raw():
+        for test_case in raw_data:
+            decode_raw_data(test_case["encoded"], PacketVersionMap.v3)
+
+    def decode_statuses():
+        for status in statuses:
+            decode_status(status, PacketVersionMap.v3)
+
+    def crc():
+        for packet in all_packets:
+            crc16(packet)
+
+    def to_hex():
+        for packet in all_packets:
+            uint8array_to_hex(packet)
+
+    def from_hex():
+        for hex_string in hex_strings:
+            hex_to_uint8array(hex_string)
+
+    def check_hex():
+        for hex_string in hex_strings:
+            is_hex(hex_string)
+
+    all_packets_size = sum(len(packet) for packet in all_packets)
+
+    return [
+        Benchmark("v3.encode_packet", encode_v3, sum(len(p) for p in encoded_v3)),
+        Benchmark("v3.decode_packet", decode_v3, sum(len(p) for p in encoded_v3)),
+        Benchmark(
+            "v3.decode_write_command",
+            decode_write_command,
+            sum(len(p) for p in write_command_packets),
+        ),
+        Benchmark(
+            "v3.encode_payload_data",
+            encode_payload,
+            sum(len(p["encoded"]) // 2 for p in payloads),
+        ),
+        Benchmark(
+            "v3.decode_payload_data",
+            decode_payload,
+            sum(len(p["encoded"]) // 2 for p in payloads),
+        ),
+        Benchmark(
+            "legacy.xmodem_encode",
+            encode_legacy,
+            sum(len(p["data"]) // 2 for p in legacy_encode),
+        ),
+        Benchmark(
+            "legacy.xmodem_decode",
+            decode_legacy,
+            sum(len(p["packet_data"]) for p in legacy_decode),
+        ),
+        Benchmark("legacy.create_ack_packet", create_ack, 0),
+        Benchmark(
+            "raw.encode_raw_data",
+            encode_raw,
+            sum(len(p["encoded"]) // 2 for p in raw_data),
+        ),
+        Benchmark(
+            "raw.decode_raw_data",
+            decode_raw,
+            sum(len(p["encoded"]) // 2 for p in raw_data),
+        ),
+        Benchmark(
+            "raw.decode_status",
+            decode_statuses,
+            sum(len(status) // 2 for status in statuses),
+        ),
+        Benchmark("util.crc16", crc, all_packets_size),
+        Benchmark("util.uint8array_to_hex", to_hex, all_packets_size),
+        Benchmark("util.hex_to_uint8array", from_hex, all_packets_size),
+        Benchmark("util.is_hex", check_hex, all_packets_size),
+    ]
+
+
+def measure(benchmark: Benchmark) -> BenchmarkResult:
+    """Time a benchmark, keeping the fastest of `ROUNDS` timed runs."""
+    benchmark.run()
+
+    iterations = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(iterations):
+            benchmark.run()
+        elapsed = time.perf_counter() - start
+        if elapsed >= MIN_DURATION:
+            break
+        iterations *= 2
+
+    best = elapsed
+    for _ in range(ROUNDS - 1):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            benchmark.run()
+        best = min(best, time.perf_counter() - start)
+
+    ops_per_sec = iterations / best
+    return BenchmarkResult(benchmark.name, ops_per_sec, ops_per_sec * benchmark.size)
+
+
+def load_baseline() -> Dict[str, float]:
+    if not BASELINE_PATH.exists():
+        return {}
+    with BASELINE_PATH.open() as file:
+        return json.load(file)["ops_per_sec"]
+
+
+def save_baseline(results: List[BenchmarkResult]) -> None:
+    ops_per_sec = load_baseline()
+    ops_per_sec.update(
+        {result.name: round(result.ops_per_sec, 1) for result in results}
+    )
+    baseline = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "ops_per_sec": dict(sorted(ops_per_sec.items())),
+    }
+    with BASELINE_PATH.open("w") as file:
+        json.dump(baseline, file, indent=2)
+        file.write("\n")
+
+
+def _format_rate(value: float, unit: str) -> str:
+    for prefix in ["", "K", "M", "G"]:
+        if value < 1000:
+            return f"{value:8.1f} {prefix}{unit}"
+        value /= 1000
+    return f"{value:8.1f} T{unit}"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--filter", default="", help="Run benchmarks matching NAME")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help="Allowed slowdown against the baseline, as a fraction",
+    )
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="Store the results as the new baseline",
+    )
+    args = parser.parse_args(argv)
+
+    benchmarks = [b for b in create_benchmarks() if args.filter in b.name]
+    baseline = load_baseline()
+    results: List[BenchmarkResult] = []
+    regressions: List[str] = []
+
+    for benchmark in benchmarks:
+        result = measure(benchmark)
+        results.append(result)
+
+        line = (
+            f"{result.name:28} {_format_rate(result.ops_per_sec, 'ops/s')}"
+            f"  {_format_rate(result.bytes_per_sec, 'B/s')}"
+        )
+        expected = baseline.get(result.name)
+        if expected:
+            change = result.ops_per_sec / expected - 1
+            line += f"  {change:+7.1%}"
+            if change < -args.tolerance:
+                regressions.append(result.name)
+                line += "  REGRESSION"
+        print(line)
+
+    if args.update_baseline:
+        save_baseline(results)
+        print(f"Baseline written to {BASELINE_PATH}")
+        return 0
+
+    if regressions:
+        print(f"{len(regressions)} benchmark(s) regressed: {', '.join(regressions)}")
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Command latency with fixed and backoff status polling on the simulated device.
+
+Each run sends a one packet raw command to a `SimulatedDevice` that takes a
+given time to execute, then waits for its output with
+`wait_for_command_output`. The reported latency runs from the end of the
+command write to the output, and polls counts the output requests made.
+
+Usage:
+    python packages/core/benchmarks/polling.py [--runs 10]
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from core.operations.raw import send_command, wait_for_command_output
+from core.simulator import SimulatedDevice, SimulatedDeviceConnection
+from core.utils.packetversion import PacketVersionMap
+
+DEFAULT_RUNS = 10
+ECHO_COMMAND = 12
+# Execution times of the simulated command, in seconds
+EXECUTION_TIMES = [0.0, 0.005, 0.02, 0.1, 1.0]
+
+STRATEGIES: Dict[str, Optional[Dict[str, Any]]] = {
+    "fixed 200 ms": {"interval": 200},
+    "backoff": None,
+}
+
+
+def echo(command):
+    return {"raw_data": command["raw_data"]}
+
+
+async def measure(
+    execution_time: float, options: Optional[Dict[str, Any]]
+) -> Tuple[float, int]:
+    device = SimulatedDevice({ECHO_COMMAND: echo}, execution_time=execution_time)
+    connection = SimulatedDeviceConnection(device, latency=0.0005)
+    sequence_number = await connection.get_new_sequence_number()
+    await send_command(
+        connection=connection,
+        command_type=ECHO_COMMAND,
+        data="00",
+        version=PacketVersionMap.v3,
+        sequence_number=sequence_number,
+    )
+
+    sent = connection.stats["sent"]
+    start = time.perf_counter()
+    await wait_for_command_output(
+        connection=connection,
+        sequence_number=sequence_number,
+        expected_command_types=[ECHO_COMMAND],
+        options=options,
+        version=PacketVersionMap.v3,
+    )
+    duration = time.perf_counter() - start
+
+    await connection.destroy()
+    return duration, connection.stats["sent"] - sent
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS)
+    args = parser.parse_args(argv)
+
+    for execution_time in EXECUTION_TIMES:
+        for name, options in STRATEGIES.items():
+            results = [
+                asyncio.run(measure(execution_time, options)) for _ in range(args.runs)
+            ]
+            latencies = [duration for duration, _ in results]
+            polls = [poll_count for _, poll_count in results]
+            print(
+                f"execution {execution_time * 1000:6.0f} ms  {name:12}"
+                f"  latency {statistics.median(latencies) * 1000:7.1f} ms"
+                f"  polls {statistics.mean(polls):5.1f}"
+            )
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+End-to-end command throughput against the simulated device.
+
+Every round sends a raw command through `send_command` and polls its output
+with `wait_for_command_output`, the same helpers the SDK uses, over a
+`SimulatedDeviceConnection`. Each link profile adds latency, jitter, loss or
+corruption, so the cost of retries and timeouts shows up without hardware.
+
+Usage:
+    python packages/core/benchmarks/simulator.py [--commands 200] [--size 512]
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+from core.operations.raw import send_command, wait_for_command_output
+from core.simulator import SimulatedDevice, SimulatedDeviceConnection
+from core.utils.packetversion import PacketVersionMap
+
+DEFAULT_COMMANDS = 200
+DEFAULT_SIZE = 512
+ECHO_COMMAND = 12
+
+PROFILES: Dict[str, Dict[str, Any]] = {
+    "ideal": {},
+    "usb": {"latency": 0.0005, "jitter": 0.0002},
+    "lossy": {
+        "latency": 0.0005,
+        "jitter": 0.0002,
+        "loss_rate": 0.01,
+        "corruption_rate": 0.01,
+    },
+}
+
+
+def echo(command):
+    return {"raw_data": command["raw_data"]}
+
+
+async def measure(profile: Dict[str, Any], commands: int, size: int) -> List[float]:
+    connection = SimulatedDeviceConnection(
+        SimulatedDevice({ECHO_COMMAND: echo}), seed=0, **profile
+    )
+    data = bytes(i % 256 for i in range(size)).hex()
+
+    durations: List[float] = []
+    for _ in range(commands):
+        start = time.perf_counter()
+        sequence_number = await connection.get_new_sequence_number()
+        await send_command(
+            connection=connection,
+            command_type=ECHO_COMMAND,
+            data=data,
+            version=PacketVersionMap.v3,
+            sequence_number=sequence_number,
+        )
+        output = await wait_for_command_output(
+            connection=connection,
+            sequence_number=sequence_number,
+            expected_command_types=[ECHO_COMMAND],
+            options={"interval": 1},
+            version=PacketVersionMap.v3,
+        )
+        if output["data"] != data:
+            raise RuntimeError("Simulated device returned different data")
+        durations.append(time.perf_counter() - start)
+
+    await connection.destroy()
+    return durations
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--commands", type=int, default=DEFAULT_COMMANDS)
+    parser.add_argument("--size", type=int, default=DEFAULT_SIZE)
+    args = parser.parse_args(argv)
+
+    for name, profile in PROFILES.items():
+        durations = asyncio.run(measure(profile, args.commands, args.size))
+        durations.sort()
+        print(
+            f"{name:6}"
+            f"  {len(durations) / sum(durations):8.1f} commands/s"
+            f"  median {statistics.median(durations) * 1000:7.3f} ms"
+            f"  p99 {durations[int(len(durations) * 0.99) - 1] * 1000:7.3f} ms"
+        )
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -50,9 +50,12 @@ v3 = dict_to_namespace(
         "ACK_BYTE": "06",
         "CHUNK_SIZE": 48 * 2,
         "ACK_TIME": 2000,
+        "MIN_ACK_TIME": 1000,
         "IDLE_TIMEOUT": 4000,
         "CMD_RESPONSE_TIME": 2000,
         "RECHECK_TIME": 2,
         "IDLE_RECHECK_TIME": 200,
+        "MIN_POLL_TIME": 5,
+        "MAX_POLL_TIME": 500,
     }
 )
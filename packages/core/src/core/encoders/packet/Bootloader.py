@@ -1,21 +1,29 @@
-from typing import TypedDict
+from typing import Iterator, TypedDict, Union
 from util.utils.assert_utils import assert_condition
 from util.utils import (
     crc16,
     hex_to_uint8array,
-    int_to_uint_byte,
     is_hex,
     uint8array_to_hex,
 )
+from .codec import BytesLike
 from ...utils.packetversion import PacketVersionMap
 from ...utils.crypto import byte_unstuffing
 from core.config.radix import v1 as radix
 
-
 START_OF_FRAME = "01"
 END_OF_TRANSMISSION = "04"
 CHUNK_SIZE = 256
 
+_START_OF_FRAME = int(START_OF_FRAME, 16)
+_END_OF_TRANSMISSION = int(END_OF_TRANSMISSION, 16)
+# Start of frame, packet number and its complement
+PACKET_HEADER_SIZE = 3
+PACKET_DATA_SIZE = CHUNK_SIZE // 2
+PACKET_CRC_OFFSET = PACKET_HEADER_SIZE + PACKET_DATA_SIZE
+PACKET_SIZE = PACKET_CRC_OFFSET + 2
+_PADDING = b"\xff" * PACKET_DATA_SIZE
+
 
 class StmPacket(TypedDict):
     startOfFrame: str
@@ -28,35 +36,79 @@ class StmPacket(TypedDict):
     errorList: str
 
 
-def stm_xmodem_encode(data: str) -> list[str]:
+def stm_xmodem_packet_count(size: int) -> int:
+    """Number of data packets, without the end of transmission, for `size` bytes."""
+    return (size + PACKET_DATA_SIZE - 1) // PACKET_DATA_SIZE
+
+
+def stm_xmodem_frames(data: BytesLike) -> Iterator[bytes]:
+    """
+    Lazily encode firmware into XMODEM packets.
+
+    `data` can be any buffer, including an `mmap` of the firmware file: each
+    packet is read through a memoryview slice, so only the packet being sent
+    is held in memory besides the firmware itself.
+
+    Args:
+        data: Firmware bytes
+
+    Yields:
+        bytes: 133 byte data packets followed by the end of transmission byte
+    """
+    with memoryview(data) as view:
+        assert_condition(len(view) > 0, "Data cannot be empty")
+
+        for i in range(1, stm_xmodem_packet_count(len(view)) + 1):
+            packet_number = i % 255
+            packet = bytearray(PACKET_SIZE)
+            packet[0] = _START_OF_FRAME
+            packet[1] = packet_number
+            packet[2] = packet_number ^ 255
+
+            data_chunk = view[(i - 1) * PACKET_DATA_SIZE : i * PACKET_DATA_SIZE]
+            data_end = PACKET_HEADER_SIZE + len(data_chunk)
+            packet[PACKET_HEADER_SIZE:data_end] = data_chunk
+            packet[data_end:PACKET_CRC_OFFSET] = _PADDING[
+                : PACKET_CRC_OFFSET - data_end
+            ]
+
+            crc = crc16(memoryview(packet)[PACKET_HEADER_SIZE:PACKET_CRC_OFFSET])
+            packet[PACKET_CRC_OFFSET:] = crc.to_bytes(2, "big")
+            yield bytes(packet)
+
+    yield bytes([_END_OF_TRANSMISSION])
+
+
+def to_firmware_buffer(data: Union[str, BytesLike]) -> BytesLike:
+    """
+    Validate firmware given as a hex string or as bytes.
+
+    Args:
+        data: Firmware as hex, optionally prefixed with 0x, or as a buffer
+
+    Returns:
+        BytesLike: Firmware bytes, buffers are returned as-is
+    """
     assert_condition(data, "Invalid data")
+    if not isinstance(data, str):
+        assert_condition(len(data) > 0, "Data cannot be empty")
+        return data
+
     hex_data = data
     if hex_data.startswith("0x"):
         hex_data = hex_data[2:]
     assert_condition(bool(hex_data), "Data cannot be empty")
     assert_condition(is_hex(hex_data), f"Invalid hex: {data}")
 
-    rounds = (len(hex_data) + CHUNK_SIZE - 1) // CHUNK_SIZE
-    packet_list: list[str] = []
+    # An odd trailing nibble is padded like the rest of the last chunk
+    if len(hex_data) % 2 == 1:
+        hex_data += "f"
 
-    for i in range(1, rounds + 1):
-        current_packet_number = int_to_uint_byte(i % 255, 8)
-        packet_number_xor = int_to_uint_byte(i % 255 ^ 255, 8)
-        data_chunk_slice = hex_data[(i - 1) * CHUNK_SIZE : i * CHUNK_SIZE]
-        data_chunk = data_chunk_slice
-        if len(data_chunk_slice) < CHUNK_SIZE:
-            for _ in range(CHUNK_SIZE - len(data_chunk_slice)):
-                data_chunk += "f"
+    return bytes.fromhex(hex_data)
 
-        comm_data = (
-            START_OF_FRAME + current_packet_number + packet_number_xor + data_chunk
-        )
-        crc = int_to_uint_byte(crc16(hex_to_uint8array(data_chunk)), 16)
-        packet = comm_data + crc
-        packet_list.append(packet)
 
-    packet_list.append(END_OF_TRANSMISSION)
-    return packet_list
+def stm_xmodem_encode(data: str) -> list[str]:
+    return [packet.hex() for packet in stm_xmodem_frames(to_firmware_buffer(data))]
 
 
 def stm_xmodem_decode(param: bytes) -> list[StmPacket]:
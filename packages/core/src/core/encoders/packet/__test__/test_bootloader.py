@@ -0,0 +1,74 @@
+import mmap
+import random
+import tempfile
+
+import pytest
+
+from core.encoders.packet.Bootloader import (
+    PACKET_SIZE,
+    stm_xmodem_encode,
+    stm_xmodem_frames,
+    stm_xmodem_packet_count,
+)
+from util.utils import crc16
+
+firmware_sizes = [1, 127, 128, 129, 255 * 128, 255 * 128 + 1, 300 * 128 + 5]
+
+
+class TestBootloaderEncoder:
+    class TestStmXmodemFrames:
+        def test_should_return_valid_packets(self):
+            for size in firmware_sizes:
+                firmware = random.Random(size).randbytes(size)
+                packets = list(stm_xmodem_frames(firmware))
+
+                assert len(packets) == stm_xmodem_packet_count(size) + 1
+                assert packets[-1] == b"\x04"
+                assert b"".join(p[3:-2] for p in packets[:-1]).rstrip(
+                    b"\xff"
+                ) == firmware.rstrip(b"\xff")
+
+                for i, packet in enumerate(packets[:-1], start=1):
+                    assert len(packet) == PACKET_SIZE
+                    assert packet[0] == 0x01
+                    assert packet[1] == i % 255
+                    assert packet[2] == (i % 255) ^ 255
+                    assert int.from_bytes(packet[-2:], "big") == crc16(packet[3:-2])
+
+        def test_should_match_hex_encoder(self):
+            for size in firmware_sizes:
+                firmware = random.Random(size).randbytes(size)
+                assert [p.hex() for p in stm_xmodem_frames(firmware)] == (
+                    stm_xmodem_encode(firmware.hex())
+                )
+
+        def test_should_read_from_mmap(self):
+            firmware = random.Random(0).randbytes(300 * 128 + 5)
+            with tempfile.TemporaryFile() as file:
+                file.write(firmware)
+                file.flush()
+                with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    assert list(stm_xmodem_frames(mapped)) == list(
+                        stm_xmodem_frames(firmware)
+                    )
+
+        def test_should_encode_lazily(self):
+            packets = stm_xmodem_frames(bytes(10 * 1024 * 1024))
+            assert len(next(packets)) == PACKET_SIZE
+
+    class TestStmXmodemEncode:
+        def test_should_pad_odd_length_hex(self):
+            packets = stm_xmodem_encode("0x123")
+            assert packets[0][6:12] == "123fff"
+
+        def test_should_throw_error_with_invalid_data(self):
+            for data in [None, "", "0x", "127s", "akjq"]:
+                with pytest.raises(Exception):
+                    stm_xmodem_encode(data)
+
+            with pytest.raises(Exception):
+                list(stm_xmodem_frames(b""))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,119 @@
+import time
+from datetime import timezone
+
+import pytest
+
+from core.encoders.packet.codec import decode_frames, encode_frames
+from core.encoders.packet.packet import (
+    decode_packet,
+    encode_packet,
+    frame_to_packet_data,
+)
+from core.utils.packetversion import PacketVersionMap
+from core.encoders.packet.__fixtures__.packet import (
+    decode_packet_test_cases,
+    encode_packet_test_cases,
+    packet_data_test_cases,
+)
+
+
+@pytest.fixture
+def constant_time(monkeypatch):
+    constant_date = packet_data_test_cases["constant_date"]
+    timestamp = constant_date.replace(tzinfo=timezone.utc).timestamp()
+    monkeypatch.setattr(time, "time", lambda: timestamp)
+
+
+class TestCodec:
+    class TestEncodeFrames:
+        def test_should_return_valid_packets(self, constant_time):
+            for test_case in packet_data_test_cases["valid_encodings"]:
+                result = encode_frames(
+                    raw_data=bytes.fromhex(test_case.get("raw_data", "")),
+                    proto_data=bytes.fromhex(test_case.get("proto_data", "")),
+                    sequence_number=test_case["sequence_number"],
+                    packet_type=test_case["packet_type"],
+                )
+                assert result == test_case["encoded"]
+
+        def test_should_match_encode_packet(self, constant_time):
+            for test_case in packet_data_test_cases["valid_encodings"]:
+                result = encode_packet(
+                    raw_data=test_case.get("raw_data", ""),
+                    proto_data=test_case.get("proto_data", ""),
+                    version=PacketVersionMap.v3,
+                    sequence_number=test_case["sequence_number"],
+                    packet_type=test_case["packet_type"],
+                )
+                assert result == test_case["encoded"]
+
+        def test_should_encode_negative_sequence_number(self, constant_time):
+            result = encode_frames(sequence_number=-1, packet_type=1)
+            assert len(result) == 1
+            assert result[0][8:10] == bytes([0xFF, 0xFF])
+
+        def test_should_throw_error_with_invalid_data(self):
+            for test_case in encode_packet_test_cases["invalid"]:
+                if test_case["version"] != PacketVersionMap.v3:
+                    continue
+                if test_case["sequence_number"] is None:
+                    continue
+                if test_case["packet_type"] is None:
+                    continue
+                if test_case["raw_data"] in (None, ""):
+                    continue
+
+                with pytest.raises(Exception):
+                    encode_frames(
+                        raw_data=bytes.fromhex(test_case["raw_data"]),
+                        sequence_number=test_case["sequence_number"],
+                        packet_type=test_case["packet_type"],
+                    )
+
+        def test_should_throw_error_with_out_of_range_fields(self):
+            for sequence_number, packet_type in [(99999, 1), (10, 99999)]:
+                with pytest.raises(ValueError):
+                    encode_frames(
+                        raw_data=b"\x01",
+                        sequence_number=sequence_number,
+                        packet_type=packet_type,
+                    )
+
+    class TestDecodeFrames:
+        def test_should_decode_valid_packets(self):
+            for test_case in packet_data_test_cases["valid_encodings"]:
+                packet_list = []
+                for packet in test_case["encoded"]:
+                    packet_list.extend(
+                        frame_to_packet_data(frame) for frame in decode_frames(packet)
+                    )
+                assert packet_list == test_case["packet_list"]
+
+        def test_should_decode_coalesced_packets(self):
+            for test_case in packet_data_test_cases["valid_encodings"]:
+                data = memoryview(b"".join(test_case["encoded"]))
+                packet_list = [frame_to_packet_data(f) for f in decode_frames(data)]
+                assert packet_list == test_case["packet_list"]
+
+        def test_should_match_decode_packet(self):
+            for test_case in packet_data_test_cases["valid_encodings"]:
+                for packet in test_case["encoded"]:
+                    expected = decode_packet(packet, PacketVersionMap.v3)
+                    result = [frame_to_packet_data(f) for f in decode_frames(packet)]
+                    assert result == expected
+
+        def test_should_return_errors_with_invalid_packets(self):
+            for packet in decode_packet_test_cases["error_packets"]:
+                frame_list = decode_frames(packet)
+                assert len(frame_list) > 0
+                for frame in frame_list:
+                    assert len(frame["error_list"]) > 0
+
+        def test_should_ignore_truncated_header(self):
+            for test_case in packet_data_test_cases["valid_encodings"]:
+                packet = test_case["encoded"][0]
+                assert decode_frames(packet[:10]) == []
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,98 @@
+import time
+from datetime import timezone
+
+import pytest
+
+from core.config import v3
+from core.encoders.packet.codec import encode_frames
+from core.encoders.packet.control_frame import ControlFrameCache
+from core.encoders.packet.__fixtures__.packet import packet_data_test_cases
+
+PACKET_TYPE = v3.commands.PACKET_TYPE
+
+control_frame_test_cases = [
+    {"packet_type": PACKET_TYPE.STATUS_REQ, "sequence_number": -1},
+    {"packet_type": PACKET_TYPE.STATUS_REQ, "sequence_number": 0},
+    {"packet_type": PACKET_TYPE.ABORT, "sequence_number": 1},
+    {"packet_type": PACKET_TYPE.ABORT, "sequence_number": 65535},
+    {
+        "packet_type": PACKET_TYPE.CMD_OUTPUT,
+        "sequence_number": 2,
+        "raw_data": b"\x00\x01",
+    },
+    {
+        "packet_type": PACKET_TYPE.CMD_OUTPUT,
+        "sequence_number": 2,
+        "raw_data": b"\x00\x02",
+    },
+    {
+        "packet_type": PACKET_TYPE.CMD_OUTPUT,
+        "sequence_number": 300,
+        "raw_data": b"\x01\x00",
+    },
+]
+
+
+@pytest.fixture
+def constant_time(monkeypatch):
+    constant_date = packet_data_test_cases["constant_date"]
+    timestamp = constant_date.replace(tzinfo=timezone.utc).timestamp()
+    monkeypatch.setattr(time, "time", lambda: timestamp)
+
+
+class TestControlFrameCache:
+    def test_should_match_encode_frames(self, constant_time):
+        cache = ControlFrameCache()
+        for _ in range(2):
+            for test_case in control_frame_test_cases:
+                expected = encode_frames(
+                    raw_data=test_case.get("raw_data", b""),
+                    sequence_number=test_case["sequence_number"],
+                    packet_type=test_case["packet_type"],
+                )
+                result = cache.encode(
+                    packet_type=test_case["packet_type"],
+                    sequence_number=test_case["sequence_number"],
+                    raw_data=test_case.get("raw_data", b""),
+                )
+                assert [result] == expected
+
+        assert len(cache) == 3
+
+    def test_should_update_timestamp(self, monkeypatch):
+        cache = ControlFrameCache()
+        for timestamp in [1678182228.755, 1700000000.0, 1678182228.755]:
+            monkeypatch.setattr(time, "time", lambda: timestamp)
+            result = cache.encode(
+                packet_type=PACKET_TYPE.STATUS_REQ, sequence_number=-1
+            )
+            assert [result] == encode_frames(
+                sequence_number=-1, packet_type=PACKET_TYPE.STATUS_REQ
+            )
+
+    def test_should_not_change_returned_packets(self):
+        cache = ControlFrameCache()
+        first = cache.encode(packet_type=PACKET_TYPE.ABORT, sequence_number=1)
+        first_copy = bytes(first)
+        cache.encode(packet_type=PACKET_TYPE.ABORT, sequence_number=2)
+        assert first == first_copy
+
+    def test_should_throw_error_with_invalid_data(self):
+        cache = ControlFrameCache()
+        with pytest.raises(ValueError):
+            cache.encode(
+                packet_type=PACKET_TYPE.CMD_OUTPUT,
+                sequence_number=1,
+                raw_data=bytes(100),
+            )
+
+        cache.encode(packet_type=PACKET_TYPE.ABORT, sequence_number=1)
+        for sequence_number in [65536, -65537]:
+            with pytest.raises(ValueError):
+                cache.encode(
+                    packet_type=PACKET_TYPE.ABORT, sequence_number=sequence_number
+                )
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
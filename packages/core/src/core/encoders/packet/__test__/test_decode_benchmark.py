@@ -0,0 +1,91 @@
+import random
+import time
+
+import pytest
+
+from core.encoders.packet.codec import (
+    COMM_HEADER_OFFSET,
+    COMM_HEADER_STRUCT,
+    CRC_OFFSET,
+    CRC_STRUCT,
+    FRAME_HEADER_SIZE,
+    START_OF_FRAME,
+)
+from core.encoders.packet.packet import decode_packet
+from core.utils.packetversion import PacketVersionMap
+from util.utils import crc16
+
+SMALL_SIZE = 16 * 1024
+LARGE_SIZE = 16 * SMALL_SIZE
+
+# Time per byte on the large input may be at most this many times the time per
+# byte on the small input. A quadratic decoder scales by ~16x here.
+MAX_PER_BYTE_GROWTH = 4
+
+
+def random_noise(size: int) -> bytes:
+    return random.Random(size).randbytes(size)
+
+
+def repeated_start_of_frame(size: int) -> bytes:
+    return START_OF_FRAME * (size // len(START_OF_FRAME))
+
+
+def truncated_headers(size: int) -> bytes:
+    truncated = START_OF_FRAME + bytes(FRAME_HEADER_SIZE // 2)
+    return truncated * (size // len(truncated))
+
+
+def max_length_payloads(size: int) -> bytes:
+    payload_length = 0xFF
+    frame = bytearray(FRAME_HEADER_SIZE + payload_length)
+    frame[:CRC_OFFSET] = START_OF_FRAME
+    COMM_HEADER_STRUCT.pack_into(
+        frame, COMM_HEADER_OFFSET, 1, 1, 1, 2, 12345678, payload_length
+    )
+    frame[FRAME_HEADER_SIZE:] = random.Random(size).randbytes(payload_length)
+    CRC_STRUCT.pack_into(frame, CRC_OFFSET, crc16(frame[COMM_HEADER_OFFSET:]))
+    return bytes(frame) * (size // len(frame))
+
+
+pathological_inputs = {
+    "random_noise": random_noise,
+    "repeated_start_of_frame": repeated_start_of_frame,
+    "truncated_headers": truncated_headers,
+    "max_length_payloads": max_length_payloads,
+}
+
+
+def time_per_byte(data: bytes, rounds: int = 5) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        decode_packet(data, PacketVersionMap.v3)
+        best = min(best, time.perf_counter() - start)
+    return best / len(data)
+
+
+class TestDecodeBenchmark:
+    @pytest.mark.parametrize("name", list(pathological_inputs.keys()))
+    def test_should_decode_in_linear_time(self, name):
+        create_input = pathological_inputs[name]
+        small = time_per_byte(create_input(SMALL_SIZE))
+        large = time_per_byte(create_input(LARGE_SIZE))
+
+        assert large <= small * MAX_PER_BYTE_GROWTH, (
+            f"{name}: {large * 1e9:.1f}ns/byte on {LARGE_SIZE} bytes, "
+            f"{small * 1e9:.1f}ns/byte on {SMALL_SIZE} bytes"
+        )
+
+    def test_should_decode_max_length_payloads(self):
+        packet_list = decode_packet(
+            max_length_payloads(SMALL_SIZE), PacketVersionMap.v3
+        )
+        assert len(packet_list) == SMALL_SIZE // (FRAME_HEADER_SIZE + 0xFF)
+        for packet in packet_list:
+            assert packet["error_list"] == []
+            assert len(packet["payload_data"]) == 0xFF * 2
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
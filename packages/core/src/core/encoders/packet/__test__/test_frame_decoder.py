@@ -0,0 +1,127 @@
+import pytest
+
+from core.encoders.packet.codec import FRAME_HEADER_SIZE, START_OF_FRAME
+from core.encoders.packet.frame_decoder import (
+    FrameDecoder,
+    LegacyFrameDecoder,
+    StreamDecoder,
+)
+from core.encoders.packet.legacy import xmodem_decode
+from core.encoders.packet.packet import frame_to_packet_data
+from core.utils.packetversion import PacketVersionMap
+from core.encoders.packet.__fixtures__.legacy import xmodem_encode_test_cases
+from core.encoders.packet.__fixtures__.packet import (
+    decode_packet_test_cases,
+    packet_data_test_cases,
+)
+
+
+def feed_in_pieces(decoder, data: bytes, piece_size: int):
+    frame_list = []
+    for i in range(0, len(data), piece_size):
+        frame_list.extend(decoder.feed(data[i : i + piece_size]))
+    return frame_list
+
+
+class TestFrameDecoder:
+    def test_should_decode_split_and_coalesced_reads(self):
+        for test_case in packet_data_test_cases["valid_encodings"]:
+            data = b"".join(test_case["encoded"])
+            for piece_size in [1, 3, 17, 64, len(data)]:
+                decoder = FrameDecoder()
+                frame_list = feed_in_pieces(decoder, data, piece_size)
+                packet_list = [frame_to_packet_data(f) for f in frame_list]
+                assert packet_list == test_case["packet_list"]
+                assert len(decoder) == 0
+
+    def test_should_keep_partial_frames_across_calls(self):
+        packet = packet_data_test_cases["valid_encodings"][1]["encoded"][0]
+        decoder = FrameDecoder()
+
+        assert decoder.feed(packet[:1]) == []
+        assert decoder.feed(packet[1:10]) == []
+        assert len(decoder) == 10
+        assert len(decoder.feed(packet[10:])) == 1
+
+    def test_should_resync_after_noise_and_invalid_frames(self):
+        valid_packets = packet_data_test_cases["valid_encodings"][1]["encoded"]
+        error_packets = decode_packet_test_cases["error_packets"]
+        data = (
+            bytes([0x55, 0x01, 0x55, 0x55, 0x00])
+            + error_packets[0]
+            + bytes(range(200))
+            + error_packets[1]
+            + b"".join(valid_packets)
+        )
+
+        for piece_size in [1, 5, 64, len(data)]:
+            decoder = FrameDecoder()
+            frame_list = feed_in_pieces(decoder, data, piece_size)
+            assert len(frame_list) == len(valid_packets)
+            assert all(len(frame["error_list"]) == 0 for frame in frame_list)
+            assert decoder.invalid_frames > 0
+            assert decoder.dropped_bytes > 0
+
+    def test_should_not_wait_on_a_corrupted_payload_length(self):
+        packet = packet_data_test_cases["valid_encodings"][1]["encoded"][0]
+        corrupted = bytearray(packet)
+        corrupted[FRAME_HEADER_SIZE - 1] = 0xFF
+        decoder = FrameDecoder()
+
+        assert decoder.feed(corrupted) == []
+        assert len(decoder.feed(packet)) == 1
+        assert decoder.invalid_frames > 0
+
+    def test_should_not_wait_on_a_corrupted_or_truncated_header(self):
+        packet_list = packet_data_test_cases["valid_encodings"][1]["encoded"]
+        truncated = packet_list[0][: FRAME_HEADER_SIZE + 4]
+        corrupted = START_OF_FRAME + bytes(13) + bytes([0x30])
+
+        for prefix in [corrupted, truncated]:
+            for packet in packet_list:
+                decoder = FrameDecoder()
+                assert decoder.feed(prefix) == []
+                assert len(decoder.feed(packet)) == 1
+                assert len(decoder) == 0
+
+    def test_should_resume_at_the_frame_after_a_truncated_one(self):
+        packet = packet_data_test_cases["valid_encodings"][1]["encoded"][0]
+        truncated = packet[: FRAME_HEADER_SIZE + 4]
+        decoder = FrameDecoder()
+
+        assert len(decoder.feed(truncated + packet)) == 1
+        assert decoder.invalid_frames == 1
+        assert decoder.dropped_bytes == len(truncated) - 1
+
+    def test_should_require_a_frame_parser(self):
+        with pytest.raises(TypeError):
+            StreamDecoder(START_OF_FRAME)
+
+    def test_should_not_grow_on_garbage(self):
+        decoder = FrameDecoder()
+        for _ in range(100):
+            assert decoder.feed(bytes(range(256))) == []
+        assert len(decoder) < 1024
+
+
+class TestLegacyFrameDecoder:
+    def test_should_decode_split_and_coalesced_reads(self):
+        for version in [PacketVersionMap.v1, PacketVersionMap.v2]:
+            for test_case in xmodem_encode_test_cases[f"valid_{version}"]:
+                expected = []
+                for packet in test_case["packets"]:
+                    expected.extend(xmodem_decode(packet, version))
+
+                data = b"".join(test_case["packets"])
+                for piece_size in [1, 7, 64, len(data)]:
+                    decoder = LegacyFrameDecoder(version)
+                    assert feed_in_pieces(decoder, data, piece_size) == expected
+
+    def test_should_throw_error_with_invalid_version(self):
+        for version in [PacketVersionMap.v3, "invalid", None]:
+            with pytest.raises(Exception):
+                LegacyFrameDecoder(version)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
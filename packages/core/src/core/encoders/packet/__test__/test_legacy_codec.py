@@ -0,0 +1,121 @@
+import pytest
+
+from core.encoders.packet.legacy import (
+    create_ack_packet,
+    xmodem_decode,
+    xmodem_encode,
+)
+from core.encoders.packet.legacy_codec import (
+    decode_legacy_frames,
+    encode_legacy_frames,
+)
+from core.utils.crypto import byte_stuffing, byte_unstuffing
+from core.utils.packetversion import PacketVersionMap
+from core.encoders.packet.__fixtures__.legacy import (
+    create_ack_packet_test_cases,
+    xmodem_encode_test_cases,
+)
+
+legacy_versions = [PacketVersionMap.v1, PacketVersionMap.v2]
+
+stuffing_test_cases = {
+    PacketVersionMap.v1: [
+        ("01aa02", "01a33a02"),
+        ("a3", "a333"),
+        ("aaa3aa", "a33aa333a33a"),
+        ("5a5a", "5a5a"),
+    ],
+    PacketVersionMap.v2: [
+        ("015a02", "01a33a02"),
+        ("a3", "a333"),
+        ("5aa35a", "a33aa333a33a"),
+        ("aaaa", "aaaa"),
+    ],
+}
+
+
+class TestLegacyCodec:
+    class TestByteStuffing:
+        def test_should_stuff_and_unstuff(self):
+            for version in legacy_versions:
+                for data, stuffed in stuffing_test_cases[version]:
+                    assert byte_stuffing(bytes.fromhex(data), version) == stuffed
+                    assert byte_unstuffing(bytes.fromhex(stuffed), version) == data
+
+        def test_should_keep_unknown_escapes(self):
+            for version in legacy_versions:
+                assert byte_unstuffing(bytes.fromhex("a301a3"), version) == "a301a3"
+                assert byte_unstuffing(bytes.fromhex("a3a33a"), version) == (
+                    "a3aa" if version == PacketVersionMap.v1 else "a35a"
+                )
+
+    class TestEncodeLegacyFrames:
+        def test_should_match_xmodem_encode(self):
+            for version in legacy_versions:
+                for test_case in xmodem_encode_test_cases[f"valid_{version}"]:
+                    params = test_case["params"]
+                    assert encode_legacy_frames(
+                        bytes.fromhex(params["data"]), params["command_type"], version
+                    ) == xmodem_encode(params["data"], params["command_type"], version)
+
+        def test_should_return_valid_ack_packets(self):
+            for version in legacy_versions:
+                for test_case in create_ack_packet_test_cases[f"valid_{version}"]:
+                    params = test_case["params"]
+                    result = create_ack_packet(
+                        params["command_type"], params["packet_number"], version
+                    )
+                    assert result == test_case["result"]
+
+        def test_should_throw_error_with_invalid_data(self):
+            for test_case in xmodem_encode_test_cases["invalid"]:
+                with pytest.raises(Exception):
+                    xmodem_encode(
+                        test_case["data"],
+                        test_case["command_type"],
+                        test_case["version"],
+                    )
+
+    class TestDecodeLegacyFrames:
+        def test_should_decode_encoded_packets(self):
+            for version in legacy_versions:
+                for test_case in xmodem_encode_test_cases[f"valid_{version}"]:
+                    params = test_case["params"]
+                    packets = xmodem_encode(
+                        params["data"], params["command_type"], version
+                    )
+                    packet_list = xmodem_decode(b"".join(packets), version)
+
+                    assert len(packet_list) == len(packets)
+                    assert "".join(p["dataChunk"] for p in packet_list) == (
+                        params["data"].lower()
+                    )
+                    for i, packet in enumerate(packet_list):
+                        assert packet["errorList"] == []
+                        assert packet["commandType"] == params["command_type"]
+                        assert packet["currentPacketNumber"] == i + 1
+                        assert packet["totalPacket"] == len(packets)
+
+        def test_should_flag_corrupted_packets(self):
+            for version in legacy_versions:
+                packet = bytearray(
+                    encode_legacy_frames(b"\x01\x02\x03", 10, version)[0]
+                )
+                packet[-3] ^= 0xFF
+                frame_list = decode_legacy_frames(packet, version)
+                assert len(frame_list) == 1
+                assert "invalid crc" in frame_list[0]["error_list"]
+
+        def test_should_ignore_truncated_header(self):
+            for version in legacy_versions:
+                packet = encode_legacy_frames(b"\x01\x02\x03", 10, version)[0]
+                assert decode_legacy_frames(packet[:2], version) == []
+
+        def test_should_throw_error_with_invalid_version(self):
+            for version in [PacketVersionMap.v3, "invalid"]:
+                with pytest.raises(Exception):
+                    decode_legacy_frames(b"\xaa", version)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
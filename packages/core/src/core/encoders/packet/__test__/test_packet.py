@@ -0,0 +1,32 @@
+import pytest
+
+from core.encoders.packet.packet import decode_payload_data
+from core.utils.packetversion import PacketVersionMap
+from core.encoders.packet.__fixtures__.packet import (
+    decode_payload_data_test_cases,
+    payload_data_test_cases,
+)
+
+
+class TestPacketEncoder:
+    class TestDecodePayloadData:
+        def test_should_return_valid_payload_data(self):
+            for test_case in payload_data_test_cases["valid_encodings"]:
+                for payload in [
+                    test_case["encoded"],
+                    bytes.fromhex(test_case["encoded"]),
+                ]:
+                    result = decode_payload_data(payload, PacketVersionMap.v3)
+                    assert result == {
+                        "protobuf_data": test_case["protobuf_data"],
+                        "raw_data": test_case["raw_data"],
+                    }
+
+        def test_should_throw_error_with_invalid_data(self):
+            for test_case in decode_payload_data_test_cases["invalid"]:
+                with pytest.raises(Exception):
+                    decode_payload_data(test_case["payload"], test_case["version"])
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
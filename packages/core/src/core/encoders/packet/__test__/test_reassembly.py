@@ -0,0 +1,61 @@
+import random
+
+import pytest
+
+from core.encoders.packet.codec import decode_frames
+from core.encoders.packet.reassembly import PayloadReassembler, decode_payload
+from core.encoders.packet.__fixtures__.packet import packet_data_test_cases
+
+
+class TestPayloadReassembler:
+    def test_should_reassemble_chunks_in_any_order(self):
+        for test_case in packet_data_test_cases["valid_encodings"]:
+            frame_list = decode_frames(b"".join(test_case["encoded"]))
+            expected = b"".join(frame["payload_data"] for frame in frame_list)
+
+            for seed in range(3):
+                random.Random(seed).shuffle(frame_list)
+                reassembler = PayloadReassembler()
+                for frame in frame_list:
+                    assert not reassembler.is_complete()
+                    reassembler.add_chunk(
+                        frame["current_packet_number"],
+                        frame["total_packet_number"],
+                        frame["payload_data"],
+                    )
+
+                assert reassembler.is_complete()
+                assert reassembler.get_payload() == expected
+
+                protobuf_data, raw_data = reassembler.get_sections()
+                assert protobuf_data.hex() == test_case.get("proto_data", "")
+                assert raw_data.hex() == test_case.get("raw_data", "")
+
+    def test_should_reset_when_total_packets_change(self):
+        reassembler = PayloadReassembler()
+        reassembler.add_chunk(1, 3, bytes(48))
+        reassembler.add_chunk(1, 1, bytes.fromhex("0000000201ff"))
+
+        assert reassembler.is_complete()
+        assert reassembler.get_sections()[1] == bytes.fromhex("01ff")
+
+    def test_should_throw_error_with_invalid_chunks(self):
+        reassembler = PayloadReassembler()
+        for current, total, chunk in [(0, 1, b""), (2, 1, b""), (1, 1, bytes(49))]:
+            with pytest.raises(ValueError):
+                reassembler.add_chunk(current, total, chunk)
+
+
+class TestDecodePayload:
+    def test_should_truncate_short_payloads(self):
+        protobuf_data, raw_data = decode_payload(bytes.fromhex("000200030aff01"))
+        assert protobuf_data == bytes.fromhex("0aff")
+        assert raw_data == bytes.fromhex("01")
+
+    def test_should_return_empty_sections_without_header(self):
+        for payload in [b"", b"\x00"]:
+            assert decode_payload(payload) == (b"", b"")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
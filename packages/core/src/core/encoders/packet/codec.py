@@ -0,0 +1,221 @@
+import struct
+import time
+from typing import List, Optional, TypedDict, Union
+from core.config import v3
+from util.utils import crc16, crc16_batch
+
+BytesLike = Union[bytes, bytearray, memoryview]
+
+_STRUCT_CODES = {8: "B", 16: "H", 32: "I"}
+
+
+def struct_layout(*widths: int) -> struct.Struct:
+    """Big-endian struct for consecutive fields of the given bit widths."""
+    return struct.Struct(">" + "".join(_STRUCT_CODES[width] for width in widths))
+
+
+START_OF_FRAME = bytes.fromhex(v3.constants.START_OF_FRAME)
+CHUNK_SIZE = v3.constants.CHUNK_SIZE // 2
+
+CRC_STRUCT = struct_layout(v3.radix.crc)
+COMM_HEADER_STRUCT = struct_layout(
+    v3.radix.current_packet_number,
+    v3.radix.total_packet,
+    v3.radix.sequence_number,
+    v3.radix.packet_type,
+    v3.radix.timestamp_length,
+    v3.radix.payload_length,
+)
+PAYLOAD_HEADER_STRUCT = struct_layout(v3.radix.data_size, v3.radix.data_size)
+
+CRC_OFFSET = len(START_OF_FRAME)
+COMM_HEADER_OFFSET = CRC_OFFSET + CRC_STRUCT.size
+FRAME_HEADER_SIZE = COMM_HEADER_OFFSET + COMM_HEADER_STRUCT.size
+MAX_FRAME_SIZE = FRAME_HEADER_SIZE + CHUNK_SIZE
+
+
+class DecodedFrame(TypedDict):
+    current_packet_number: int
+    total_packet_number: int
+    sequence_number: int
+    packet_type: int
+    timestamp: int
+    payload_data: bytes
+    crc: int
+    error_list: List[str]
+
+
+def to_unsigned(value: int, bits: int) -> int:
+    """Mirror the range semantics of ``int_to_uint_byte`` for header fields."""
+    unsigned = value + (1 << bits) if value < 0 else value
+    if unsigned < 0 or unsigned >= 1 << bits:
+        raise ValueError(f"Invalid serialization of data: {value} with radix {bits}")
+    return unsigned
+
+
+def to_buffer(data: Union[str, BytesLike]) -> Optional[BytesLike]:
+    """
+    Get the bytes behind a hex string, byte inputs are returned as-is.
+
+    Args:
+        data: Hex string or bytes
+
+    Returns:
+        Optional[BytesLike]: Bytes, or None if `data` is not valid hex
+    """
+    if not isinstance(data, str):
+        return data
+
+    try:
+        buffer = bytes.fromhex(data)
+    except ValueError:
+        return None
+
+    # bytes.fromhex skips whitespace, which is not valid hex here
+    if len(buffer) * 2 != len(data):
+        return None
+    return buffer
+
+
+def get_timestamp() -> int:
+    # Same truncation as encode_packet: Date.now().toString().slice(0, 8)
+    timestamp_ms = str(int(time.time() * 1000))
+    return int(timestamp_ms[: v3.radix.timestamp_length // 4])
+
+
+def encode_payload(raw_data: BytesLike = b"", proto_data: BytesLike = b"") -> bytes:
+    """
+    Serialize protobuf and raw data into a v3 payload.
+
+    Args:
+        raw_data: Raw data bytes
+        proto_data: Protobuf data bytes
+
+    Returns:
+        bytes: Length-prefixed payload, empty if both inputs are empty
+    """
+    if len(raw_data) == 0 and len(proto_data) == 0:
+        return b""
+
+    return (
+        PAYLOAD_HEADER_STRUCT.pack(len(proto_data), len(raw_data))
+        + bytes(proto_data)
+        + bytes(raw_data)
+    )
+
+
+def encode_frames(
+    raw_data: BytesLike = b"",
+    proto_data: BytesLike = b"",
+    sequence_number: int = 0,
+    packet_type: int = 0,
+) -> List[bytes]:
+    """
+    Encode data into v3 packets without going through hex strings.
+
+    Produces frames byte-identical to ``packet.encode_packet``.
+
+    Args:
+        raw_data: Raw data bytes
+        proto_data: Protobuf data bytes
+        sequence_number: Sequence number of the command
+        packet_type: Packet type from ``config.v3.commands.PACKET_TYPE``
+
+    Returns:
+        List[bytes]: Encoded packets
+    """
+    serialized_sequence_number = to_unsigned(sequence_number, v3.radix.sequence_number)
+    serialized_packet_type = to_unsigned(packet_type, v3.radix.packet_type)
+    serialized_data = memoryview(encode_payload(raw_data, proto_data))
+    timestamp = get_timestamp()
+
+    rounds = max((len(serialized_data) + CHUNK_SIZE - 1) // CHUNK_SIZE, 1)
+    packets: List[bytearray] = []
+
+    for i in range(rounds):
+        data_chunk = serialized_data[i * CHUNK_SIZE : (i + 1) * CHUNK_SIZE]
+        packet = bytearray(FRAME_HEADER_SIZE + len(data_chunk))
+        packet[:CRC_OFFSET] = START_OF_FRAME
+        COMM_HEADER_STRUCT.pack_into(
+            packet,
+            COMM_HEADER_OFFSET,
+            i + 1,
+            rounds,
+            serialized_sequence_number,
+            serialized_packet_type,
+            timestamp,
+            len(data_chunk),
+        )
+        packet[FRAME_HEADER_SIZE:] = data_chunk
+        packets.append(packet)
+
+    crc_list = crc16_batch(
+        memoryview(packet)[COMM_HEADER_OFFSET:] for packet in packets
+    )
+    for packet, crc in zip(packets, crc_list):
+        CRC_STRUCT.pack_into(packet, CRC_OFFSET, crc)
+
+    return [bytes(packet) for packet in packets]
+
+
+def decode_frames(data: BytesLike) -> List[DecodedFrame]:
+    """
+    Decode v3 packets from a buffer without going through hex strings.
+
+    A frame whose header is cut short ends decoding, a short payload is
+    returned as-is and flagged with an invalid crc.
+
+    The worst case is linear in ``len(data)``: the start of frame search
+    resumes after the previous frame and never rescans, and each frame costs
+    one header unpack plus a crc over at most ``FRAME_HEADER_SIZE + 255``
+    bytes.
+
+    Args:
+        data: Received bytes
+
+    Returns:
+        List[DecodedFrame]: Decoded packets
+    """
+    buffer = data if isinstance(data, bytes) else bytes(data)
+    view = memoryview(buffer)
+    size = len(buffer)
+    packet_list: List[DecodedFrame] = []
+    offset = buffer.find(START_OF_FRAME)
+
+    while 0 <= offset and offset + FRAME_HEADER_SIZE <= size:
+        (crc,) = CRC_STRUCT.unpack_from(buffer, offset + CRC_OFFSET)
+        (
+            current_packet_number,
+            total_packet_number,
+            sequence_number,
+            packet_type,
+            timestamp,
+            payload_length,
+        ) = COMM_HEADER_STRUCT.unpack_from(buffer, offset + COMM_HEADER_OFFSET)
+
+        payload_start = offset + FRAME_HEADER_SIZE
+        payload_end = min(payload_start + payload_length, size)
+
+        error_list: List[str] = []
+        if current_packet_number > total_packet_number:
+            error_list.append(
+                "current_packet_number is greater than total_packet_number"
+            )
+        if crc16(view[offset + COMM_HEADER_OFFSET : payload_end]) != crc:
+            error_list.append("invalid crc")
+
+        packet_list.append(
+            DecodedFrame(
+                current_packet_number=current_packet_number,
+                total_packet_number=total_packet_number,
+                sequence_number=sequence_number,
+                packet_type=packet_type,
+                timestamp=timestamp,
+                payload_data=buffer[payload_start:payload_end],
+                crc=crc,
+                error_list=error_list,
+            )
+        )
+        offset = buffer.find(START_OF_FRAME, payload_end)
+
+    return packet_list
@@ -0,0 +1,88 @@
+from typing import Dict, Tuple
+from core.config import v3
+from util.utils import crc16
+from .codec import (
+    BytesLike,
+    COMM_HEADER_OFFSET,
+    COMM_HEADER_STRUCT,
+    CRC_OFFSET,
+    CRC_STRUCT,
+    FRAME_HEADER_SIZE,
+    PAYLOAD_HEADER_STRUCT,
+    encode_frames,
+    get_timestamp,
+    to_unsigned,
+)
+
+RAW_DATA_OFFSET = FRAME_HEADER_SIZE + PAYLOAD_HEADER_STRUCT.size
+
+
+class ControlFrameCache:
+    """
+    Pre-encoded single packet v3 frames such as STATUS_REQ, CMD_OUTPUT and ABORT.
+
+    A template is encoded once per packet type and raw data length. Later
+    calls only patch the sequence number, timestamp, raw data and crc of the
+    template in place, which gives the same bytes as `encode_packet`.
+    """
+
+    def __init__(self):
+        self._templates: Dict[Tuple[int, int], bytearray] = {}
+
+    def __len__(self) -> int:
+        return len(self._templates)
+
+    def encode(
+        self,
+        packet_type: int,
+        sequence_number: int,
+        raw_data: BytesLike = b"",
+    ) -> bytes:
+        """
+        Encode a control frame from its cached template.
+
+        Args:
+            packet_type: Packet type from ``config.v3.commands.PACKET_TYPE``
+            sequence_number: Sequence number of the command
+            raw_data: Raw data bytes, must fit in a single packet
+
+        Returns:
+            bytes: Encoded packet
+        """
+        serialized_sequence_number = to_unsigned(
+            sequence_number, v3.radix.sequence_number
+        )
+        key = (packet_type, len(raw_data))
+        template = self._templates.get(key)
+
+        if template is None:
+            packets = encode_frames(
+                raw_data=raw_data,
+                sequence_number=sequence_number,
+                packet_type=packet_type,
+            )
+            if len(packets) > 1:
+                raise ValueError("Control frame exceeded 1 packet limit")
+            template = bytearray(packets[0])
+            self._templates[key] = template
+            return packets[0]
+
+        COMM_HEADER_STRUCT.pack_into(
+            template,
+            COMM_HEADER_OFFSET,
+            1,
+            1,
+            serialized_sequence_number,
+            packet_type,
+            get_timestamp(),
+            len(template) - FRAME_HEADER_SIZE,
+        )
+        if len(raw_data) > 0:
+            template[RAW_DATA_OFFSET:] = raw_data
+
+        with memoryview(template) as view:
+            crc = crc16(view[COMM_HEADER_OFFSET:])
+        CRC_STRUCT.pack_into(template, CRC_OFFSET, crc)
+
+        # The transport may hold on to the packet, so hand out a copy
+        return bytes(template)
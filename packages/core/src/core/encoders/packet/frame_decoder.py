@@ -0,0 +1,245 @@
+from abc import ABC, abstractmethod
+from typing import Generic, List, Optional, Tuple, TypeVar
+from core.config import v1, v2, v3
+from util.utils import crc16
+from ...utils.packetversion import PacketVersion, PacketVersionMap
+from .codec import (
+    BytesLike,
+    CHUNK_SIZE,
+    COMM_HEADER_OFFSET,
+    COMM_HEADER_STRUCT,
+    CRC_OFFSET,
+    CRC_STRUCT,
+    DecodedFrame,
+    FRAME_HEADER_SIZE,
+    START_OF_FRAME,
+)
+from .legacy import LegacyDecodedPacketData, xmodem_decode
+from interfaces.errors import DeviceCompatibilityError, DeviceCompatibilityErrorType
+
+T = TypeVar("T")
+
+# Consumed bytes are only discarded from the buffer once they make up at least
+# this many bytes, so compaction cost stays amortised over the bytes fed.
+COMPACT_THRESHOLD = 4096
+
+PACKET_TYPES = frozenset(vars(v3.commands.PACKET_TYPE).values())
+
+
+class StreamDecoder(ABC, Generic[T]):
+    """
+    Base class for incremental frame decoders.
+
+    Bytes are appended to an internal buffer with a moving read offset. Each
+    `feed` scans forward from that offset only, so every received byte is
+    inspected a bounded number of times no matter how the stream is split
+    into reads. A frame whose header or payload is still incomplete stays
+    buffered until the next `feed`.
+    """
+
+    def __init__(self, start_of_frame: bytes):
+        self.start_of_frame = start_of_frame
+        self._buffer = bytearray()
+        self._offset = 0
+        self.dropped_bytes = 0
+        self.invalid_frames = 0
+
+    def __len__(self) -> int:
+        return len(self._buffer) - self._offset
+
+    def reset(self) -> None:
+        self._buffer = bytearray()
+        self._offset = 0
+
+    def feed(self, data: BytesLike) -> List[T]:
+        """
+        Add received bytes and return every complete, valid frame.
+
+        Args:
+            data: Bytes as they arrived from the transport
+
+        Returns:
+            List[T]: Decoded frames, in stream order
+        """
+        if data:
+            self._buffer += data
+
+        frame_list: List[T] = []
+        buffer = self._buffer
+        offset = self._offset
+
+        while True:
+            start = buffer.find(self.start_of_frame, offset)
+            if start < 0:
+                # Keep a possible start of frame split across two reads
+                keep_from = max(len(buffer) - len(self.start_of_frame) + 1, offset)
+                self.dropped_bytes += keep_from - offset
+                offset = keep_from
+                break
+
+            self.dropped_bytes += start - offset
+            offset = start
+
+            result = self._parse_frame(buffer, start)
+            if result is None:
+                break
+
+            frame, end = result
+            if frame is None:
+                # Not a real frame, resync where the parser found it safe to
+                self.invalid_frames += 1
+                self.dropped_bytes += end - start - 1
+                offset = end
+                continue
+
+            frame_list.append(frame)
+            offset = end
+
+        self._offset = offset
+        if offset >= COMPACT_THRESHOLD or offset == len(buffer):
+            del buffer[:offset]
+            self._offset = 0
+
+        return frame_list
+
+    @abstractmethod
+    def _parse_frame(
+        self, buffer: bytearray, start: int
+    ) -> Optional[Tuple[Optional[T], int]]:
+        """
+        Parse the frame starting at `start`.
+
+        Returns None when more bytes are needed, `(frame, end)` for a valid
+        frame, or `(None, resume)` when the bytes at `start` do not form one,
+        `resume` being where to look for the next start of frame. Without a
+        more precise position it is `start + 1`, since a corrupted length
+        field may hide a valid frame inside the bytes it claims.
+        """
+
+
+class FrameDecoder(StreamDecoder[DecodedFrame]):
+    """
+    Incremental decoder for v3 packets.
+
+    Only frames with a valid crc, a known packet type, packet numbering and
+    a payload of at most one chunk are returned.
+    """
+
+    def __init__(self):
+        super().__init__(START_OF_FRAME)
+
+    def _parse_frame(
+        self, buffer: bytearray, start: int
+    ) -> Optional[Tuple[Optional[DecodedFrame], int]]:
+        result = self._decode_frame(buffer, start)
+        if result is not None:
+            return result
+
+        # The header looks valid but the payload is incomplete. If a complete
+        # frame starts inside the pending bytes, the header was corrupted or
+        # the frame cut short, and waiting would hold that frame back.
+        resync = buffer.find(self.start_of_frame, start + 1)
+        while resync >= 0:
+            later = self._decode_frame(buffer, resync)
+            if later is not None and later[0] is not None:
+                return None, resync
+            resync = buffer.find(self.start_of_frame, resync + 1)
+
+        return None
+
+    def _decode_frame(
+        self, buffer: bytearray, start: int
+    ) -> Optional[Tuple[Optional[DecodedFrame], int]]:
+        if len(buffer) - start < FRAME_HEADER_SIZE:
+            return None
+
+        (
+            current_packet_number,
+            total_packet_number,
+            sequence_number,
+            packet_type,
+            timestamp,
+            payload_length,
+        ) = COMM_HEADER_STRUCT.unpack_from(buffer, start + COMM_HEADER_OFFSET)
+
+        # Reject a corrupted header before waiting for its payload, which
+        # would hold back the frames after it until that many bytes arrived
+        if (
+            payload_length > CHUNK_SIZE
+            or packet_type not in PACKET_TYPES
+            or not 1 <= current_packet_number <= total_packet_number
+        ):
+            return None, start + 1
+
+        end = start + FRAME_HEADER_SIZE + payload_length
+        if end > len(buffer):
+            return None
+
+        (crc,) = CRC_STRUCT.unpack_from(buffer, start + CRC_OFFSET)
+        with memoryview(buffer) as view:
+            actual_crc = crc16(view[start + COMM_HEADER_OFFSET : end])
+
+        if actual_crc != crc:
+            return None, start + 1
+
+        return (
+            DecodedFrame(
+                current_packet_number=current_packet_number,
+                total_packet_number=total_packet_number,
+                sequence_number=sequence_number,
+                packet_type=packet_type,
+                timestamp=timestamp,
+                payload_data=bytes(buffer[start + FRAME_HEADER_SIZE : end]),
+                crc=crc,
+                error_list=[],
+            ),
+            end,
+        )
+
+
+class LegacyFrameDecoder(StreamDecoder[LegacyDecodedPacketData]):
+    """
+    Incremental decoder for v1/v2 xmodem packets.
+
+    Complete frames are cut from the stream using the header data size and
+    decoded with `xmodem_decode`. As with `xmodem_decode`, packets are returned
+    together with their `errorList` and left to the caller to check.
+    """
+
+    def __init__(self, version: PacketVersion):
+        if version not in [PacketVersionMap.v1, PacketVersionMap.v2]:
+            raise DeviceCompatibilityError(
+                DeviceCompatibilityErrorType.INVALID_SDK_OPERATION,
+            )
+
+        usable_config = v1
+        if version == PacketVersionMap.v2:
+            usable_config = v2
+
+        super().__init__(bytes.fromhex(usable_config.constants.START_OF_FRAME))
+        self.version = version
+        self._data_size_offset = (
+            len(self.start_of_frame) + usable_config.radix.command_type // 8
+        )
+        self._header_size = self._data_size_offset + usable_config.radix.data_size // 8
+
+    def _parse_frame(
+        self, buffer: bytearray, start: int
+    ) -> Optional[Tuple[Optional[LegacyDecodedPacketData], int]]:
+        if len(buffer) - start < self._header_size:
+            return None
+
+        data_size = buffer[start + self._data_size_offset]
+        end = start + self._header_size + data_size
+        if end > len(buffer):
+            return None
+
+        try:
+            packet_list = xmodem_decode(bytes(buffer[start:end]), self.version)
+        except Exception:
+            return None, start + 1
+
+        if len(packet_list) != 1:
+            return None, start + 1
+
+        return packet_list[0], end
@@ -0,0 +1,217 @@
+from typing import Dict, List, TypedDict
+from types import SimpleNamespace
+from core.config import v1, v2
+from util.utils import crc16, crc16_batch
+from ...utils.crypto import stuff_bytes, unstuff_bytes
+from ...utils.packetversion import PacketVersion, PacketVersionMap
+from .codec import BytesLike, struct_layout, to_unsigned
+from interfaces.errors import DeviceCompatibilityError, DeviceCompatibilityErrorType
+
+
+class LegacyFrameLayout:
+    """Byte layout of v1/v2 xmodem frames, derived from the config."""
+
+    __slots__ = (
+        "config",
+        "start_of_frame",
+        "stuffing_byte",
+        "chunk_size",
+        "header_struct",
+        "numbers_struct",
+        "crc_struct",
+        "header_size",
+    )
+
+    def __init__(self, usable_config: SimpleNamespace):
+        self.config = usable_config
+        self.start_of_frame = bytes.fromhex(usable_config.constants.START_OF_FRAME)
+        self.stuffing_byte = usable_config.constants.STUFFING_BYTE
+        self.chunk_size = usable_config.constants.CHUNK_SIZE // 2
+        self.header_struct = struct_layout(
+            usable_config.radix.command_type,
+            usable_config.radix.data_size,
+        )
+        self.numbers_struct = struct_layout(
+            usable_config.radix.current_packet_number,
+            usable_config.radix.total_packet,
+        )
+        self.crc_struct = struct_layout(usable_config.radix.crc)
+        self.header_size = len(self.start_of_frame) + self.header_struct.size
+
+
+_LAYOUTS: Dict[PacketVersion, LegacyFrameLayout] = {
+    PacketVersionMap.v1: LegacyFrameLayout(v1),
+    PacketVersionMap.v2: LegacyFrameLayout(v2),
+}
+
+
+def get_legacy_layout(version: PacketVersion) -> LegacyFrameLayout:
+    layout = _LAYOUTS.get(version)
+    if layout is None:
+        raise DeviceCompatibilityError(
+            DeviceCompatibilityErrorType.INVALID_SDK_OPERATION,
+        )
+    return layout
+
+
+class DecodedLegacyFrame(TypedDict):
+    start_of_frame: bytes
+    command_type: int
+    current_packet_number: int
+    total_packet: int
+    data_size: int
+    data_chunk: bytes
+    crc: int
+    error_list: List[str]
+
+
+def _frame(layout: LegacyFrameLayout, command_type: int, stuffed_data: bytes) -> bytes:
+    return (
+        layout.start_of_frame
+        + layout.header_struct.pack(command_type, len(stuffed_data))
+        + stuffed_data
+    )
+
+
+def encode_legacy_frames(
+    data: BytesLike,
+    command_type: int,
+    version: PacketVersion,
+) -> List[bytes]:
+    """
+    Encode data into v1/v2 xmodem packets without going through hex strings.
+
+    Produces packets byte-identical to ``legacy.xmodem_encode``.
+
+    Args:
+        data: Data bytes
+        command_type: Command type of the packets
+        version: Packet version, v1 or v2
+
+    Returns:
+        List[bytes]: Encoded packets
+    """
+    layout = get_legacy_layout(version)
+    command_type = to_unsigned(command_type, layout.config.radix.command_type)
+
+    chunk_size = layout.chunk_size
+    view = memoryview(data)
+    rounds = (len(view) + chunk_size - 1) // chunk_size
+
+    comm_data_list = [
+        layout.numbers_struct.pack(i + 1, rounds)
+        + view[i * chunk_size : (i + 1) * chunk_size]
+        for i in range(rounds)
+    ]
+    crc_list = crc16_batch(comm_data_list)
+
+    return [
+        _frame(
+            layout,
+            command_type,
+            stuff_bytes(comm_data + layout.crc_struct.pack(crc), layout.stuffing_byte),
+        )
+        for comm_data, crc in zip(comm_data_list, crc_list)
+    ]
+
+
+def encode_legacy_ack(
+    command_type: int,
+    packet_number: int,
+    version: PacketVersion,
+) -> bytes:
+    """
+    Encode a v1/v2 ack packet, byte-identical to ``legacy.create_ack_packet``.
+
+    Args:
+        command_type: Command type being acknowledged
+        packet_number: Packet number being acknowledged
+        version: Packet version, v1 or v2
+
+    Returns:
+        bytes: Encoded packet
+    """
+    layout = get_legacy_layout(version)
+    command_type = to_unsigned(command_type, layout.config.radix.command_type)
+
+    comm_data = layout.numbers_struct.pack(packet_number, 0) + bytes(4)
+    crc = layout.crc_struct.pack(crc16(comm_data))
+    return _frame(
+        layout, command_type, stuff_bytes(comm_data + crc, layout.stuffing_byte)
+    )
+
+
+def decode_legacy_frames(
+    data: BytesLike,
+    version: PacketVersion,
+) -> List[DecodedLegacyFrame]:
+    """
+    Decode v1/v2 xmodem packets from a buffer without going through hex strings.
+
+    A frame whose header is cut short ends decoding. Runs in linear time: the
+    start of frame search resumes after the previous frame.
+
+    Args:
+        data: Received bytes
+        version: Packet version, v1 or v2
+
+    Returns:
+        List[DecodedLegacyFrame]: Decoded packets
+    """
+    layout = get_legacy_layout(version)
+    buffer = data if isinstance(data, bytes) else bytes(data)
+    size = len(buffer)
+    numbers_size = layout.numbers_struct.size
+    crc_size = layout.crc_struct.size
+    packet_list: List[DecodedLegacyFrame] = []
+    offset = buffer.find(layout.start_of_frame)
+
+    while 0 <= offset and offset + layout.header_size <= size:
+        command_type, data_size = layout.header_struct.unpack_from(
+            buffer, offset + len(layout.start_of_frame)
+        )
+        data_start = offset + layout.header_size
+        data_end = min(data_start + data_size, size)
+
+        un_stuffed_data = unstuff_bytes(
+            buffer[data_start:data_end], layout.stuffing_byte
+        )
+        crc_start = max(len(un_stuffed_data) - crc_size, 0)
+
+        error_list: List[str] = []
+        if len(un_stuffed_data) >= numbers_size + crc_size:
+            current_packet_number, total_packet = layout.numbers_struct.unpack_from(
+                un_stuffed_data
+            )
+            (crc,) = layout.crc_struct.unpack_from(un_stuffed_data, crc_start)
+            data_chunk = un_stuffed_data[numbers_size:crc_start]
+            if current_packet_number > total_packet:
+                error_list.append(
+                    "currentPacketNumber is greater than totalPacketNumber"
+                )
+        else:
+            current_packet_number = total_packet = crc = 0
+            data_chunk = b""
+        if data_size > layout.config.constants.CHUNK_SIZE:
+            error_list.append("invalid data size")
+        if (
+            len(un_stuffed_data) < numbers_size + crc_size
+            or crc16(un_stuffed_data[:crc_start]) != crc
+        ):
+            error_list.append("invalid crc")
+
+        packet_list.append(
+            DecodedLegacyFrame(
+                start_of_frame=layout.start_of_frame,
+                command_type=command_type,
+                current_packet_number=current_packet_number,
+                total_packet=total_packet,
+                data_size=data_size,
+                data_chunk=data_chunk,
+                crc=crc,
+                error_list=error_list,
+            )
+        )
+        offset = buffer.find(layout.start_of_frame, data_end)
+
+    return packet_list
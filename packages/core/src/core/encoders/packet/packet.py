@@ -1,16 +1,14 @@
-import time
-from typing import TypedDict, List, Dict
+from typing import TypedDict, List, Dict, Union
 from enum import Enum
 from core.config import v1, v2, v3
 from util.utils.assert_utils import assert_condition
 from util.utils import (
     is_hex,
-    uint8array_to_hex,
-    hex_to_uint8array,
     int_to_uint_byte,
-    crc16,
 )
 from ...utils.packetversion import PacketVersion, PacketVersionMap
+from .codec import BytesLike, DecodedFrame, decode_frames, encode_frames, to_buffer
+from .reassembly import decode_payload
 from interfaces.errors import DeviceCompatibilityError, DeviceCompatibilityErrorType
 
 
@@ -119,238 +117,63 @@ def encode_packet(
             DeviceCompatibilityErrorType.INVALID_SDK_OPERATION,
         )
 
-    usable_config = v3
-
-    serialized_sequence_number = int_to_uint_byte(
-        sequence_number,
-        usable_config.radix.sequence_number,
-    )
-    serialized_packet_type = int_to_uint_byte(
-        packet_type,
-        usable_config.radix.packet_type,
+    return encode_frames(
+        raw_data=bytes.fromhex(raw_data),
+        proto_data=bytes.fromhex(proto_data),
+        sequence_number=sequence_number,
+        packet_type=packet_type,
     )
 
-    chunk_size = usable_config.constants.CHUNK_SIZE
-    start_of_frame = usable_config.constants.START_OF_FRAME
 
-    serialized_data = encode_payload_data(
-        raw_data,
-        proto_data,
-        version,
+def frame_to_packet_data(frame: DecodedFrame) -> DecodedPacketData:
+    return DecodedPacketData(
+        start_of_frame=v3.constants.START_OF_FRAME,
+        current_packet_number=frame["current_packet_number"],
+        total_packet_number=frame["total_packet_number"],
+        crc=int_to_uint_byte(frame["crc"], v3.radix.crc),
+        payload_data=frame["payload_data"].hex(),
+        error_list=frame["error_list"],
+        sequence_number=frame["sequence_number"],
+        packet_type=frame["packet_type"],
+        timestamp=frame["timestamp"],
     )
 
-    rounds = (len(serialized_data) + chunk_size - 1) // chunk_size
-    has_no_data = len(serialized_data) == 0
-    if has_no_data:
-        rounds = 1
-
-    packet_list: List[bytes] = []
-
-    for i in range(1, rounds + 1):
-        current_packet_number = int_to_uint_byte(
-            i,
-            usable_config.radix.current_packet_number,
-        )
-        total_packet_number = int_to_uint_byte(
-            rounds,
-            usable_config.radix.total_packet,
-        )
-        data_chunk = serialized_data[
-            (i - 1) * chunk_size : (i - 1) * chunk_size + chunk_size
-        ]
-        payload = data_chunk
-        payload_length = int_to_uint_byte(
-            len(data_chunk) // 2,
-            usable_config.radix.payload_length,
-        )
-        # Match TypeScript behavior: Date.now().toString().slice(0, timestampLength / 4)
-        timestamp_ms = int(time.time() * 1000)  # JavaScript Date.now() equivalent
-        timestamp_str = str(timestamp_ms)[: usable_config.radix.timestamp_length // 4]
-        serialized_timestamp = int_to_uint_byte(
-            int(timestamp_str),
-            usable_config.radix.timestamp_length,
-        )
-
-        comm_data = (
-            current_packet_number
-            + total_packet_number
-            + serialized_sequence_number
-            + serialized_packet_type
-            + serialized_timestamp
-            + payload_length
-            + payload
-        )
-        crc = int_to_uint_byte(
-            crc16(hex_to_uint8array(comm_data)),
-            usable_config.radix.crc,
-        )
-        packet = start_of_frame + crc + comm_data
-        packet_list.append(hex_to_uint8array(packet))
-
-    return packet_list
-
 
 def decode_packet(
     param: bytes,
     version: PacketVersion,
 ) -> List[DecodedPacketData]:
+    """
+    Decode v3 packets from received bytes.
+
+    Runs in O(n) time for n input bytes, whatever the input: the start of
+    frame search only moves forward, every header is read once and the crc of
+    a frame covers at most one header and one payload.
+    """
     if version != PacketVersionMap.v3:
         raise DeviceCompatibilityError(
             DeviceCompatibilityErrorType.INVALID_SDK_OPERATION,
         )
 
-    usable_config = v3
-    start_of_frame = usable_config.constants.START_OF_FRAME
-
-    data = uint8array_to_hex(param).lower()
-    packet_list: List[DecodedPacketData] = []
-    offset = data.find(start_of_frame)
-
-    while len(data) > 0:
-        offset = data.find(start_of_frame)
-        if offset == -1:
-            return packet_list
-
-        # Add bounds checking for all field reads
-        if offset + len(start_of_frame) > len(data):
-            break
-        start_of_frame = data[offset : offset + len(start_of_frame)]
-        offset += len(start_of_frame)
-
-        if offset + usable_config.radix.crc // 4 > len(data):
-            break
-        crc = data[offset : offset + usable_config.radix.crc // 4]
-        offset += usable_config.radix.crc // 4
-
-        if offset + usable_config.radix.current_packet_number // 4 > len(data):
-            break
-        current_packet_number = int(
-            data[offset : offset + usable_config.radix.current_packet_number // 4],
-            16,
-        )
-        offset += usable_config.radix.current_packet_number // 4
-
-        if offset + usable_config.radix.total_packet // 4 > len(data):
-            break
-        total_packet_number = int(
-            data[offset : offset + usable_config.radix.total_packet // 4],
-            16,
-        )
-        offset += usable_config.radix.total_packet // 4
-
-        if offset + usable_config.radix.sequence_number // 4 > len(data):
-            break
-        sequence_number = int(
-            data[offset : offset + usable_config.radix.sequence_number // 4],
-            16,
-        )
-        offset += usable_config.radix.sequence_number // 4
-
-        if offset + usable_config.radix.packet_type // 4 > len(data):
-            break
-        packet_type = int(
-            data[offset : offset + usable_config.radix.packet_type // 4],
-            16,
-        )
-        offset += usable_config.radix.packet_type // 4
-
-        if offset + usable_config.radix.timestamp_length // 4 > len(data):
-            break
-        timestamp = int(
-            data[offset : offset + usable_config.radix.timestamp_length // 4],
-            16,
-        )
-        offset += usable_config.radix.timestamp_length // 4
-
-        if offset + usable_config.radix.payload_length // 4 > len(data):
-            break
-        payload_length = int(
-            data[offset : offset + usable_config.radix.payload_length // 4],
-            16,
-        )
-        offset += usable_config.radix.payload_length // 4
+    return [frame_to_packet_data(frame) for frame in decode_frames(param)]
 
-        payload_data = ""
-        if payload_length != 0:
-            available_length = len(data) - offset
-            read_length = min(payload_length * 2, available_length)
-            if read_length > 0:
-                payload_data = data[offset : offset + read_length]
-                offset += read_length
-        data = data[offset:]
-
-        comm_data = (
-            int_to_uint_byte(
-                current_packet_number, usable_config.radix.current_packet_number
-            )
-            + int_to_uint_byte(total_packet_number, usable_config.radix.total_packet)
-            + int_to_uint_byte(sequence_number, usable_config.radix.sequence_number)
-            + int_to_uint_byte(packet_type, usable_config.radix.packet_type)
-            + int_to_uint_byte(timestamp, usable_config.radix.timestamp_length)
-            + int_to_uint_byte(payload_length, usable_config.radix.payload_length)
-            + payload_data
-        )
-        actual_crc = int_to_uint_byte(
-            crc16(hex_to_uint8array(comm_data)),
-            usable_config.radix.crc,
-        )
 
-        error_list = []
-        if start_of_frame.upper() != start_of_frame.upper():
-            error_list.append("Invalid Start of frame")
-        if current_packet_number > total_packet_number:
-            error_list.append(
-                "current_packet_number is greater than total_packet_number"
-            )
-        if actual_crc.upper() != crc.upper():
-            error_list.append("invalid crc")
-
-        packet_list.append(
-            DecodedPacketData(
-                start_of_frame=start_of_frame,
-                current_packet_number=current_packet_number,
-                total_packet_number=total_packet_number,
-                crc=crc,
-                payload_data=payload_data,
-                error_list=error_list,
-                sequence_number=sequence_number,
-                packet_type=packet_type,
-                timestamp=timestamp,
-            )
-        )
-    return packet_list
-
-
-def decode_payload_data(payload: str, version: PacketVersion) -> Dict[str, str]:
+def decode_payload_data(
+    payload: Union[str, BytesLike], version: PacketVersion
+) -> Dict[str, str]:
     assert_condition(payload, "Invalid payload")
     assert_condition(version, "Invalid version")
-    assert_condition(is_hex(payload), "Invalid hex in payload")
+    buffer = to_buffer(payload)
+    assert_condition(buffer, "Invalid hex in payload")
 
     if version != PacketVersionMap.v3:
         raise DeviceCompatibilityError(
             DeviceCompatibilityErrorType.INVALID_SDK_OPERATION,
         )
 
-    usable_config = v3
-    payload_offset = 0
-
-    data_size_half = usable_config.radix.data_size // 4
-
-    protobuf_data_size = int(
-        payload[payload_offset : payload_offset + data_size_half], 16
-    )
-    payload_offset += data_size_half
-
-    raw_data_size = int(payload[payload_offset : payload_offset + data_size_half], 16)
-    payload_offset += data_size_half
-
-    protobuf_data = payload[payload_offset : payload_offset + protobuf_data_size * 2]
-    payload_offset += protobuf_data_size * 2
-
-    raw_data = payload[payload_offset : payload_offset + raw_data_size * 2]
-    payload_offset += raw_data_size * 2
+    protobuf_data, raw_data = decode_payload(buffer)
 
     return {
-        "protobuf_data": protobuf_data,
-        "raw_data": raw_data,
+        "protobuf_data": protobuf_data.hex(),
+        "raw_data": raw_data.hex(),
     }
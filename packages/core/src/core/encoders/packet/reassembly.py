@@ -0,0 +1,94 @@
+from typing import Set, Tuple
+from .codec import BytesLike, CHUNK_SIZE, PAYLOAD_HEADER_STRUCT
+
+
+def decode_payload(payload: BytesLike) -> Tuple[memoryview, memoryview]:
+    """
+    Split a v3 payload into its protobuf and raw sections without copying.
+
+    Args:
+        payload: Serialized payload bytes
+
+    Returns:
+        Tuple[memoryview, memoryview]: Protobuf data and raw data, truncated
+        if the payload is shorter than its header says
+    """
+    view = memoryview(payload)
+    if len(view) < PAYLOAD_HEADER_STRUCT.size:
+        return view[0:0], view[0:0]
+
+    protobuf_data_size, raw_data_size = PAYLOAD_HEADER_STRUCT.unpack_from(view)
+    offset = PAYLOAD_HEADER_STRUCT.size
+    protobuf_data = view[offset : offset + protobuf_data_size]
+    offset += protobuf_data_size
+    raw_data = view[offset : offset + raw_data_size]
+
+    return protobuf_data, raw_data
+
+
+class PayloadReassembler:
+    """
+    Reassembles a multi packet payload in a single preallocated buffer.
+
+    Every packet except the last carries exactly `CHUNK_SIZE` bytes, so chunk
+    `n` is written at offset `(n - 1) * CHUNK_SIZE` whatever order the chunks
+    arrive in.
+    """
+
+    def __init__(self):
+        self.total_packet_number = 0
+        self._buffer = bytearray()
+        self._received: Set[int] = set()
+        self._size = 0
+
+    def add_chunk(
+        self,
+        current_packet_number: int,
+        total_packet_number: int,
+        data_chunk: BytesLike,
+    ) -> None:
+        """
+        Store a received chunk at its offset.
+
+        A change in `total_packet_number` means a different response is being
+        received, so the chunks collected so far are dropped.
+
+        Args:
+            current_packet_number: 1-based number of the packet
+            total_packet_number: Total packets of the response
+            data_chunk: Payload bytes of the packet
+        """
+        if not 1 <= current_packet_number <= total_packet_number:
+            raise ValueError(
+                f"Invalid packet number {current_packet_number} "
+                f"of {total_packet_number}"
+            )
+        if len(data_chunk) > CHUNK_SIZE:
+            raise ValueError("Data chunk is larger than a packet")
+
+        if total_packet_number != self.total_packet_number:
+            self.total_packet_number = total_packet_number
+            self._buffer = bytearray(total_packet_number * CHUNK_SIZE)
+            self._received = set()
+            self._size = 0
+
+        offset = (current_packet_number - 1) * CHUNK_SIZE
+        self._buffer[offset : offset + len(data_chunk)] = data_chunk
+        self._received.add(current_packet_number)
+
+        if current_packet_number == total_packet_number:
+            self._size = offset + len(data_chunk)
+
+    def is_complete(self) -> bool:
+        return (
+            self.total_packet_number > 0
+            and len(self._received) == self.total_packet_number
+        )
+
+    def get_payload(self) -> memoryview:
+        """Get a view over the reassembled payload."""
+        return memoryview(self._buffer)[: self._size]
+
+    def get_sections(self) -> Tuple[memoryview, memoryview]:
+        """Get views over the protobuf and raw sections of the payload."""
+        return decode_payload(self.get_payload())
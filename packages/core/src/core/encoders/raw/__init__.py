@@ -1,24 +1,68 @@
+import struct
+from enum import IntEnum
+from typing import Dict, Tuple, Type, TypeVar, Union
 from interfaces.errors import (
     DeviceCompatibilityError,
     DeviceCompatibilityErrorType,
 )
-from util.utils.crypto import int_to_uint_byte, is_hex
+from util.utils.crypto import int_to_uint_byte
 from util.utils.assert_utils import assert_condition
 
 from core.config import v3 as config
 from ...utils.packetversion import PacketVersion, PacketVersionMap
+from ..packet.codec import BytesLike, struct_layout, to_buffer
 from .types import RawData, StatusData, DeviceIdleState, DeviceWaitOn, CmdState
 
 # Export types
 from .types import *
 
+E = TypeVar("E", bound=IntEnum)
 
-def decode_status(data: str, version: PacketVersion) -> StatusData:
+STATUS_WIDTHS = (
+    config.radix.status.device_state,
+    config.radix.status.abort_disabled,
+    config.radix.status.current_cmd_seq,
+    config.radix.status.cmd_state,
+    config.radix.status.flow_status,
+)
+STATUS_STRUCT = struct_layout(*STATUS_WIDTHS)
+COMMAND_TYPE_STRUCT = struct_layout(config.radix.command_type)
+
+# Calling an IntEnum costs more than the rest of decode_status, look members up
+_ENUM_MEMBERS: Dict[Type[IntEnum], Dict[int, IntEnum]] = {
+    enum: {member.value: member for member in enum}
+    for enum in (DeviceIdleState, DeviceWaitOn, CmdState)
+}
+
+
+def _to_enum(enum: Type[E], value: int) -> E:
+    member = _ENUM_MEMBERS[enum].get(value)
+    # Unknown values raise the usual ValueError
+    return enum(value) if member is None else member
+
+
+def _unpack_fields(
+    layout: struct.Struct, widths: Tuple[int, ...], data: BytesLike
+) -> Tuple[int, ...]:
+    if len(data) >= layout.size:
+        return layout.unpack_from(data)
+
+    # Fields missing from a short status are read as 0
+    fields = []
+    offset = 0
+    for width in widths:
+        size = width // 8
+        fields.append(int.from_bytes(data[offset : offset + size], "big"))
+        offset += size
+    return tuple(fields)
+
+
+def decode_status(data: Union[str, BytesLike], version: PacketVersion) -> StatusData:
     """
-    Decode status data from hex string.
+    Decode status data from hex string or bytes.
 
     Args:
-        data: Hex string containing status data
+        data: Hex string or bytes containing status data
         version: Packet version to use for decoding
 
     Returns:
@@ -30,84 +74,36 @@ def decode_status(data: str, version: PacketVersion) -> StatusData:
     """
     assert_condition(data, "Invalid data")
     assert_condition(version, "Invalid version")
-    assert_condition(is_hex(data), "Invalid hex in data")
+    buffer = to_buffer(data)
+    assert_condition(buffer, "Invalid hex in data")
 
     if version != PacketVersionMap.v3:
         raise DeviceCompatibilityError(
             DeviceCompatibilityErrorType.INVALID_SDK_OPERATION,
         )
 
-    usable_config = config
-    offset = 0
-
-    # Parse device state
-    device_state_size = usable_config.radix.status.device_state // 4
-    device_state_hex = (
-        data[offset : offset + device_state_size]
-        if data[offset : offset + device_state_size]
-        else "0"
-    )
-    device_state = int(f"0x{device_state_hex}", 16) or 0
-    offset += device_state_size
+    (
+        device_state,
+        abort_disabled,
+        current_cmd_seq,
+        cmd_state,
+        flow_status,
+    ) = _unpack_fields(STATUS_STRUCT, STATUS_WIDTHS, buffer)
 
     # Extract device idle state and device waiting on from device state
     num = device_state & 0xFF
-    device_idle_state = DeviceIdleState(num & 0xF)
-    device_waiting_on = DeviceWaitOn(num >> 4)
-
-    # Parse abort disabled
-    abort_disabled_size = usable_config.radix.status.abort_disabled // 4
-    abort_disabled_hex = (
-        data[offset : offset + abort_disabled_size]
-        if data[offset : offset + abort_disabled_size]
-        else "0"
-    )
-    abort_disabled = int(f"0x{abort_disabled_hex}", 16) == 1
-    offset += abort_disabled_size
-
-    # Parse current command sequence
-    current_cmd_seq_size = usable_config.radix.status.current_cmd_seq // 4
-    current_cmd_seq_hex = (
-        data[offset : offset + current_cmd_seq_size]
-        if data[offset : offset + current_cmd_seq_size]
-        else "0"
-    )
-    current_cmd_seq = int(f"0x{current_cmd_seq_hex}", 16) or 0
-    offset += current_cmd_seq_size
-
-    # Parse command state
-    cmd_state_size = usable_config.radix.status.cmd_state // 4
-    cmd_state_hex = (
-        data[offset : offset + cmd_state_size]
-        if data[offset : offset + cmd_state_size]
-        else "0"
-    )
-    cmd_state = CmdState(int(f"0x{cmd_state_hex}", 16) or 0)
-    offset += cmd_state_size
-
-    # Parse flow status
-    flow_status_size = usable_config.radix.status.flow_status // 4
-    flow_status_hex = (
-        data[offset : offset + flow_status_size]
-        if data[offset : offset + flow_status_size]
-        else "0"
-    )
-    flow_status = int(f"0x{flow_status_hex}", 16) or 0
-    offset += flow_status_size
 
-    status: StatusData = {
+    return {
         "deviceState": format(device_state, "x"),
-        "deviceIdleState": device_idle_state,
-        "deviceWaitingOn": device_waiting_on,
-        "abortDisabled": abort_disabled,
+        "deviceIdleState": _to_enum(DeviceIdleState, num & 0xF),
+        "deviceWaitingOn": _to_enum(DeviceWaitOn, num >> 4),
+        "abortDisabled": abort_disabled == 1,
         "currentCmdSeq": current_cmd_seq,
-        "cmdState": cmd_state,
+        "cmdState": _to_enum(CmdState, cmd_state),
         "flowStatus": flow_status,
         "isStatus": True,
     }
 
-    return status
-
 
 def encode_raw_data(params: RawData, version: PacketVersion) -> str:
     """
@@ -145,12 +141,12 @@ def encode_raw_data(params: RawData, version: PacketVersion) -> str:
     return data
 
 
-def decode_raw_data(payload: str, version: PacketVersion) -> RawData:
+def decode_raw_data(payload: Union[str, BytesLike], version: PacketVersion) -> RawData:
     """
-    Decode raw data from hex string payload.
+    Decode raw data from hex string or bytes payload.
 
     Args:
-        payload: Hex string payload to decode
+        payload: Hex string or bytes payload to decode
         version: Packet version to use for decoding
 
     Returns:
@@ -162,29 +158,20 @@ def decode_raw_data(payload: str, version: PacketVersion) -> RawData:
     """
     assert_condition(payload, "Invalid payload")
     assert_condition(version, "Invalid version")
-    assert_condition(is_hex(payload), "Invalid hex in payload")
+    buffer = to_buffer(payload)
+    assert_condition(buffer, "Invalid hex in payload")
 
     if version != PacketVersionMap.v3:
         raise DeviceCompatibilityError(
             DeviceCompatibilityErrorType.INVALID_SDK_OPERATION,
         )
 
-    usable_config = config
-    offset = 0
-
-    # Parse command type
-    command_type_size = usable_config.radix.command_type // 4
-    received_command_type = (
-        int(
-            payload[offset : offset + command_type_size],
-            16,
-        )
-        or 0
+    (received_command_type,) = _unpack_fields(
+        COMMAND_TYPE_STRUCT, (config.radix.command_type,), buffer
     )
-    offset += command_type_size
 
-    # Parse remaining data
-    received_data = payload[offset:]
+    with memoryview(buffer) as view:
+        received_data = view[COMMAND_TYPE_STRUCT.size :].hex()
 
     return {
         "commandType": received_command_type,
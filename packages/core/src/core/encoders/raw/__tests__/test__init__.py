@@ -29,6 +29,13 @@ class TestRawEncoder:
                 assert result is not None
                 assert result == test_case["raw_data"]
 
+        def test_should_decode_bytes(self):
+            for test_case in raw_data_test_cases["valid_encodings"]:
+                result = decode_raw_data(
+                    bytes.fromhex(test_case["encoded"]), PacketVersionMap.v3
+                )
+                assert result == test_case["raw_data"]
+
         def test_should_throw_error_with_invalid_data(self):
             for test_case in decode_raw_data_test_cases["invalid"]:
                 with pytest.raises(Exception):
@@ -41,6 +48,19 @@ class TestRawEncoder:
                 assert result is not None
                 assert result == test_case["status"]
 
+        def test_should_decode_bytes(self):
+            for test_case in decode_status_test_cases["valid_encodings"]:
+                result = decode_status(
+                    bytes.fromhex(test_case["encoded"]), PacketVersionMap.v3
+                )
+                assert result == test_case["status"]
+
+        def test_should_read_missing_fields_as_zero(self):
+            result = decode_status("0101000201", PacketVersionMap.v3)
+            assert result["currentCmdSeq"] == 2
+            assert result["cmdState"] == 1
+            assert result["flowStatus"] == 0
+
         def test_should_throw_error_with_invalid_data(self):
             for test_case in decode_status_test_cases["invalid"]:
                 with pytest.raises(Exception):
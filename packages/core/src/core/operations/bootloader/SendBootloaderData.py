@@ -1,5 +1,5 @@
 import asyncio
-from typing import Optional, Dict, Any, Callable
+from typing import Optional, Dict, Any, Callable, Union
 
 from interfaces.errors import (
     DeviceBootloaderError,
@@ -10,9 +10,14 @@ from interfaces.errors import (
     DeviceConnectionErrorType,
 )
 from interfaces import IDeviceConnection
-from util.utils import hex_to_uint8array, uint8array_to_hex, assert_condition
+from util.utils import uint8array_to_hex, assert_condition
 from ...utils.logger import logger
-from ...encoders.packet.Bootloader import stm_xmodem_encode
+from ...encoders.packet.codec import BytesLike
+from ...encoders.packet.Bootloader import (
+    stm_xmodem_frames,
+    stm_xmodem_packet_count,
+    to_firmware_buffer,
+)
 
 RECHECK_TIME = 1
 ACK_PACKET = "06"
@@ -250,7 +255,7 @@ async def check_if_in_receiving_mode(
 
 async def send_bootloader_data(
     connection: IDeviceConnection,
-    data: str,
+    data: Union[str, BytesLike],
     on_progress: Optional[Callable[[int], None]] = None,
     options: Optional[Dict[str, Any]] = None,
 ) -> None:
@@ -259,11 +264,13 @@ async def send_bootloader_data(
 
     assert_condition(connection, "Invalid connection")
 
-    packets_list = stm_xmodem_encode(data)
+    firmware = to_firmware_buffer(data)
+    # Data packets and the end of transmission
+    total_packets = stm_xmodem_packet_count(len(firmware)) + 1
 
     await check_if_in_receiving_mode(connection, options)
 
-    async def process_packet(packet_data: str, index: int) -> None:
+    async def process_packet(packet: bytes, index: int) -> None:
         tries = 1
         inner_max_tries = options.get("max_tries", 5)
         first_error = None
@@ -271,18 +278,16 @@ async def send_bootloader_data(
         while tries <= inner_max_tries:
             try:
                 timeout_option = {}
-                if index == 0 or index == len(packets_list) - 1:
+                if index == 0 or index == total_packets - 1:
                     timeout_option["timeout"] = options.get("first_timeout", 10000)
                 else:
                     timeout_option["timeout"] = options.get("timeout")
 
-                error_msg = await write_packet(
-                    connection, hex_to_uint8array(packet_data), timeout_option
-                )
+                error_msg = await write_packet(connection, packet, timeout_option)
 
                 if not error_msg:
                     if on_progress:
-                        on_progress((index * 100) // len(packets_list))
+                        on_progress((index * 100) // total_packets)
                     return
                 else:
                     raise error_msg
@@ -306,5 +311,5 @@ async def send_bootloader_data(
         else:
             raise DeviceCommunicationError(DeviceCommunicationErrorType.WRITE_ERROR)
 
-    for index, packet in enumerate(packets_list):
+    for index, packet in enumerate(stm_xmodem_frames(firmware)):
         await process_packet(packet, index)
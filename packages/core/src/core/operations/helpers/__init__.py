@@ -1,15 +1,32 @@
 from .can_retry import can_retry
 from .getcommandoutput import get_command_output
 from .getstatus import get_status
+from .pollingstrategy import (
+    BackoffPollingStrategy,
+    FixedPollingStrategy,
+    PollingStrategy,
+    get_polling_strategy,
+)
+from .receivedispatcher import get_receive_dispatcher
+from .rttestimator import RttEstimator, get_rtt_estimator
 from .sendcommand import send_command
+from .sendmany import send_many
 from .waitforpacket import wait_for_packet
 from .writecommand import write_command
 
 __all__ = [
+    "BackoffPollingStrategy",
+    "FixedPollingStrategy",
+    "PollingStrategy",
     "can_retry",
     "get_command_output",
+    "get_polling_strategy",
     "get_status",
+    "get_receive_dispatcher",
+    "get_rtt_estimator",
+    "RttEstimator",
     "send_command",
+    "send_many",
     "wait_for_packet",
     "write_command",
 ]
@@ -0,0 +1,65 @@
+import asyncio
+
+import pytest
+from interfaces.errors import DeviceCommunicationError, DeviceCommunicationErrorType
+from core.operations.helpers.getcommandoutput import get_command_output
+from core.operations.raw import send_command
+from core.simulator import SimulatedDevice, SimulatedDeviceConnection
+from core.utils.packetversion import PacketVersionMap
+
+ECHO_COMMAND = 12
+# Spans three output chunks
+ECHO_DATA = bytes(range(120)).hex()
+
+
+def echo(command):
+    return {"raw_data": command["raw_data"]}
+
+
+class SkippingDevice(SimulatedDevice):
+    """Answers the request for the first output chunk with the second."""
+
+    def _on_output_request(self, frame):
+        packets = super()._on_output_request(frame)
+        if self._output_packets and packets == [self._output_packets[0]]:
+            return [self._output_packets[1]]
+        return packets
+
+
+async def run_echo(device: SimulatedDevice):
+    connection = SimulatedDeviceConnection(device)
+    sequence_number = await connection.get_new_sequence_number()
+    await send_command(
+        connection=connection,
+        command_type=ECHO_COMMAND,
+        data=ECHO_DATA,
+        version=PacketVersionMap.v3,
+        sequence_number=sequence_number,
+    )
+    return await get_command_output(
+        connection=connection,
+        version=PacketVersionMap.v3,
+        sequence_number=sequence_number,
+    )
+
+
+class TestGetCommandOutput:
+    def test_should_reassemble_a_multi_packet_output(self):
+        async def run_test():
+            result = await run_echo(SimulatedDevice({ECHO_COMMAND: echo}))
+            assert result["raw_data"].endswith(ECHO_DATA)
+            assert not result["is_status"]
+
+        asyncio.run(run_test())
+
+    def test_should_not_decode_an_output_with_a_skipped_chunk(self):
+        async def run_test():
+            with pytest.raises(DeviceCommunicationError) as error:
+                await run_echo(SkippingDevice({ECHO_COMMAND: echo}))
+            assert error.value.code == DeviceCommunicationErrorType.READ_TIMEOUT.value
+
+        asyncio.run(run_test())
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
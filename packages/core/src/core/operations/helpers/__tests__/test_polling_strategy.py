@@ -0,0 +1,90 @@
+import asyncio
+
+import pytest
+from core.config import v3 as config_v3
+from core.operations.helpers.pollingstrategy import (
+    BackoffPollingStrategy,
+    FixedPollingStrategy,
+    PollingStrategy,
+    get_polling_strategy,
+)
+from core.operations.raw import send_command, wait_for_command_output
+from core.simulator import SimulatedDevice, SimulatedDeviceConnection
+from core.utils.packetversion import PacketVersionMap
+
+ECHO_COMMAND = 12
+
+
+def echo(command):
+    return {"raw_data": command["raw_data"]}
+
+
+class TestPollingStrategy:
+    def test_should_back_off_up_to_the_cap(self):
+        polling_strategy = BackoffPollingStrategy(5, 40)
+        intervals = [polling_strategy.next_interval("executing") for _ in range(6)]
+        assert intervals == [5, 10, 20, 40, 40, 40]
+
+    def test_should_poll_long_waits_less_often_by_default(self):
+        polling_strategy = BackoffPollingStrategy()
+        intervals = [polling_strategy.next_interval("executing") for _ in range(10)]
+        assert intervals[0] == config_v3.constants.MIN_POLL_TIME
+        assert intervals[-1] == config_v3.constants.MAX_POLL_TIME
+        assert intervals[-1] > config_v3.constants.IDLE_RECHECK_TIME
+
+    def test_should_restart_when_the_state_changes(self):
+        polling_strategy = BackoffPollingStrategy(5, 40)
+        for _ in range(4):
+            polling_strategy.next_interval((3, 0))
+
+        assert polling_strategy.next_interval((3, 1)) == 5
+        assert polling_strategy.next_interval((3, 1)) == 10
+
+        polling_strategy.reset()
+        assert polling_strategy.next_interval((3, 1)) == 5
+
+    def test_should_pick_the_strategy_from_options(self):
+        assert isinstance(get_polling_strategy(), BackoffPollingStrategy)
+        assert isinstance(get_polling_strategy({"interval": 200}), FixedPollingStrategy)
+        assert get_polling_strategy({"interval": 200}).next_interval() == 200
+
+        polling_strategy = BackoffPollingStrategy()
+        polling_strategy.next_interval()
+        assert get_polling_strategy({"pollingStrategy": polling_strategy}) is (
+            polling_strategy
+        )
+        assert polling_strategy.next_interval() == config_v3.constants.MIN_POLL_TIME
+        assert isinstance(polling_strategy, PollingStrategy)
+
+    def test_should_pick_up_quick_operations_early(self):
+        async def run_operation(options):
+            device = SimulatedDevice({ECHO_COMMAND: echo}, execution_time=0.03)
+            connection = SimulatedDeviceConnection(device)
+            sequence_number = await connection.get_new_sequence_number()
+            await send_command(
+                connection=connection,
+                command_type=ECHO_COMMAND,
+                data="00",
+                version=PacketVersionMap.v3,
+                sequence_number=sequence_number,
+            )
+
+            loop = asyncio.get_running_loop()
+            start_time = loop.time()
+            await wait_for_command_output(
+                connection=connection,
+                sequence_number=sequence_number,
+                expected_command_types=[ECHO_COMMAND],
+                options=options,
+                version=PacketVersionMap.v3,
+            )
+            return loop.time() - start_time
+
+        fixed_duration = asyncio.run(run_operation({"interval": 200}))
+        backoff_duration = asyncio.run(run_operation(None))
+        assert fixed_duration >= 0.2
+        assert backoff_duration < 0.1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
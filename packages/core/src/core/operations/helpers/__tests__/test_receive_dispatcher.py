@@ -0,0 +1,163 @@
+import asyncio
+import gc
+import weakref
+
+import pytest
+from interfaces import DeviceConnectionError
+from interfaces.__mocks__.connection import MockDeviceConnection
+from core.config import v3 as config_v3
+from core.encoders.packet.packet import encode_packet
+from core.utils.packetversion import PacketVersionMap
+from core.operations.helpers.getstatus import get_status
+from core.operations.helpers.receivedispatcher import (
+    RETAINED_PACKET_LIMIT,
+    ReceiveDispatcher,
+)
+from core.simulator import SimulatedDeviceConnection
+
+PACKET_TYPE = config_v3.commands.PACKET_TYPE
+
+
+def create_packet(
+    sequence_number: int, packet_type: int, raw_data: str = "01"
+) -> bytes:
+    return b"".join(
+        encode_packet(
+            raw_data=raw_data,
+            version=PacketVersionMap.v3,
+            sequence_number=sequence_number,
+            packet_type=packet_type,
+        )
+    )
+
+
+class TestReceiveDispatcher:
+    def test_should_route_packets_by_sequence_and_type(self):
+        async def run_test():
+            connection = await MockDeviceConnection.create()
+            dispatcher = ReceiveDispatcher(connection)
+
+            first = dispatcher.subscribe(1, [PACKET_TYPE.CMD_ACK])
+            second = dispatcher.subscribe(2, [PACKET_TYPE.CMD_ACK])
+
+            await connection.mock_device_send(create_packet(2, PACKET_TYPE.CMD_ACK))
+            await connection.mock_device_send(create_packet(1, PACKET_TYPE.CMD_ACK))
+
+            first_packet, second_packet = await asyncio.wait_for(
+                asyncio.gather(first, second), 1
+            )
+            assert first_packet["sequence_number"] == 1
+            assert second_packet["sequence_number"] == 2
+            assert dispatcher.get_stats()["routed"] == 2
+
+        asyncio.run(run_test())
+
+    def test_should_retain_status_packets_for_late_subscribers(self):
+        async def run_test():
+            connection = await MockDeviceConnection.create()
+            dispatcher = ReceiveDispatcher(connection)
+
+            # Keeps the dispatcher reading while the status packet arrives
+            pending = dispatcher.subscribe(9, [PACKET_TYPE.CMD_OUTPUT])
+            await connection.mock_device_send(create_packet(5, PACKET_TYPE.STATUS))
+            await connection.mock_device_send(create_packet(5, PACKET_TYPE.CMD_ACK))
+            await asyncio.sleep(0.05)
+
+            stats = dispatcher.get_stats()
+            assert stats["retained"] == 1
+            assert stats["dropped_unmatched"] == 1
+
+            status = dispatcher.subscribe(1, [PACKET_TYPE.STATUS])
+            assert status.done()
+            assert status.result()["packet_type"] == PACKET_TYPE.STATUS
+
+            dispatcher.unsubscribe(pending)
+
+        asyncio.run(run_test())
+
+    def test_should_evict_oldest_retained_packets(self):
+        async def run_test():
+            connection = await MockDeviceConnection.create()
+            dispatcher = ReceiveDispatcher(connection)
+
+            pending = dispatcher.subscribe(9, [PACKET_TYPE.CMD_OUTPUT])
+            for i in range(RETAINED_PACKET_LIMIT + 2):
+                await connection.mock_device_send(
+                    create_packet(i + 1, PACKET_TYPE.STATUS)
+                )
+            await asyncio.sleep(0.1)
+
+            assert dispatcher.get_stats()["dropped_evicted"] == 2
+            status = dispatcher.subscribe(1, [PACKET_TYPE.STATUS])
+            assert status.result()["sequence_number"] == 3
+
+            dispatcher.unsubscribe(pending)
+
+        asyncio.run(run_test())
+
+    def test_should_send_error_packets_to_every_waiter(self):
+        async def run_test():
+            connection = await MockDeviceConnection.create()
+            dispatcher = ReceiveDispatcher(connection)
+
+            first = dispatcher.subscribe(1, [PACKET_TYPE.CMD_ACK])
+            second = dispatcher.subscribe(2, [PACKET_TYPE.STATUS])
+            await connection.mock_device_send(create_packet(1, PACKET_TYPE.ERROR))
+
+            packets = await asyncio.wait_for(asyncio.gather(first, second), 1)
+            assert all(p["packet_type"] == PACKET_TYPE.ERROR for p in packets)
+
+        asyncio.run(run_test())
+
+    def test_should_count_invalid_packets(self):
+        async def run_test():
+            connection = await MockDeviceConnection.create()
+            dispatcher = ReceiveDispatcher(connection)
+
+            waiter = dispatcher.subscribe(1, [PACKET_TYPE.CMD_ACK])
+            corrupted = bytearray(create_packet(1, PACKET_TYPE.CMD_ACK))
+            corrupted[-1] ^= 0xFF
+            await connection.mock_device_send(bytes(corrupted))
+            await asyncio.sleep(0.05)
+
+            assert not waiter.done()
+            assert dispatcher.get_stats()["dropped_invalid"] == 1
+            dispatcher.unsubscribe(waiter)
+
+        asyncio.run(run_test())
+
+    def test_should_reject_waiters_when_connection_closes(self):
+        async def run_test():
+            connection = await MockDeviceConnection.create()
+            dispatcher = ReceiveDispatcher(connection)
+
+            waiter = dispatcher.subscribe(1, [PACKET_TYPE.CMD_ACK])
+            await connection.destroy()
+
+            with pytest.raises(DeviceConnectionError):
+                await asyncio.wait_for(waiter, 1)
+
+        asyncio.run(run_test())
+
+    def test_should_not_keep_destroyed_connections_alive(self):
+        async def run_test():
+            references = []
+            for _ in range(5):
+                connection = SimulatedDeviceConnection()
+                await get_status(connection=connection, version=PacketVersionMap.v3)
+                await connection.destroy()
+                references.append(weakref.ref(connection))
+                del connection
+
+            gc.collect()
+            assert [reference() for reference in references] == [None] * 5
+
+            # Parked dispatcher tasks end once their connection is gone
+            await asyncio.sleep(config_v3.constants.IDLE_RECHECK_TIME / 1000 * 2)
+            assert asyncio.all_tasks() == {asyncio.current_task()}
+
+        asyncio.run(run_test())
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
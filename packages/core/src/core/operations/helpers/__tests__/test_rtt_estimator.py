@@ -0,0 +1,115 @@
+import asyncio
+
+import pytest
+from core.config import v3 as config_v3
+from core.operations.helpers.getstatus import get_status
+from core.operations.helpers.rttestimator import RttEstimator, get_rtt_estimator
+from core.simulator import SimulatedDeviceConnection
+from core.utils.packetversion import PacketVersionMap
+
+ACK_TIME = config_v3.constants.ACK_TIME
+MIN_ACK_TIME = config_v3.constants.MIN_ACK_TIME
+
+
+class TestRttEstimator:
+    def test_should_use_the_initial_timeout_without_samples(self):
+        assert RttEstimator().get_timeout() == ACK_TIME
+
+    def test_should_follow_the_measured_round_trips(self):
+        rtt_estimator = RttEstimator(min_timeout=1)
+        for _ in range(50):
+            rtt_estimator.add_sample(20)
+
+        assert rtt_estimator.srtt == pytest.approx(20)
+        assert 20 <= rtt_estimator.get_timeout() < 30
+
+        rtt_estimator.add_sample(200)
+        assert rtt_estimator.get_timeout() > 200
+
+    def test_should_stay_within_bounds(self):
+        rtt_estimator = RttEstimator()
+        rtt_estimator.add_sample(1)
+        assert rtt_estimator.get_timeout() == MIN_ACK_TIME
+
+        rtt_estimator.add_sample(10000)
+        assert rtt_estimator.get_timeout() == ACK_TIME
+
+    def test_should_back_off_on_timeouts(self):
+        rtt_estimator = RttEstimator(min_timeout=100)
+        rtt_estimator.add_sample(1)
+
+        timeouts = []
+        for _ in range(6):
+            rtt_estimator.add_timeout()
+            timeouts.append(rtt_estimator.get_timeout())
+        assert timeouts == [200, 400, 800, 1600, ACK_TIME, ACK_TIME]
+
+        # Ambiguous, only ends the backoff
+        rtt_estimator.add_sample(1000)
+        assert rtt_estimator.get_timeout() == 100
+
+    def test_should_keep_the_retry_budget_of_the_fixed_timeout(self):
+        rtt_estimator = RttEstimator()
+        rtt_estimator.add_sample(1)
+
+        timeouts = []
+        for _ in range(5):
+            timeouts.append(rtt_estimator.get_timeout())
+            rtt_estimator.add_timeout()
+        assert timeouts == [MIN_ACK_TIME] + [ACK_TIME] * 4
+        assert sum(timeouts) >= 4 * ACK_TIME
+
+    def test_should_keep_the_fixed_timeout_when_not_adaptive(self):
+        rtt_estimator = RttEstimator(adaptive=False)
+        rtt_estimator.add_sample(1)
+        assert rtt_estimator.get_timeout() == ACK_TIME
+
+    def test_should_learn_from_write_command(self):
+        async def run_test():
+            connection = SimulatedDeviceConnection(latency=0.001)
+            for _ in range(5):
+                await get_status(connection, PacketVersionMap.v3)
+
+            rtt_estimator = get_rtt_estimator(connection)
+            assert rtt_estimator.srtt is not None
+            assert rtt_estimator.get_timeout() == MIN_ACK_TIME
+
+        asyncio.run(run_test())
+
+    def test_should_retry_a_lost_packet_before_the_fixed_timeout(self):
+        async def run_test():
+            connection = SimulatedDeviceConnection(latency=0.001)
+            for _ in range(5):
+                await get_status(connection, PacketVersionMap.v3)
+
+            connection.loss_rate = 1.0
+            loop = asyncio.get_running_loop()
+            loop.call_later(0.02, setattr, connection, "loss_rate", 0.0)
+
+            start_time = loop.time()
+            await get_status(connection, PacketVersionMap.v3)
+            assert loop.time() - start_time < ACK_TIME / 1000
+            assert connection.stats["lost"] == 1
+
+        asyncio.run(run_test())
+
+    def test_should_recover_on_a_lossy_link(self):
+        async def run_test():
+            connection = SimulatedDeviceConnection(
+                latency=0.001, loss_rate=0.1, corruption_rate=0.05, seed=3
+            )
+            loop = asyncio.get_running_loop()
+            start_time = loop.time()
+            for _ in range(10):
+                await get_status(connection, PacketVersionMap.v3)
+
+            assert connection.stats["lost"] > 1
+            # A fixed timeout would stall ACK_TIME on every lost packet
+            lost_time = connection.stats["lost"] * ACK_TIME / 1000
+            assert loop.time() - start_time < lost_time
+
+        asyncio.run(run_test())
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,48 @@
+import asyncio
+
+import pytest
+from interfaces import IBatchDeviceConnection
+from interfaces.__mocks__.connection import MockDeviceConnection
+from core.operations.helpers.sendmany import send_many
+
+
+class BatchMockDeviceConnection(MockDeviceConnection):
+    def __init__(self):
+        super().__init__()
+        self.batches = []
+
+    async def send_many(self, packets):
+        self.batches.append(list(packets))
+
+
+class TestSendMany:
+    def test_should_send_one_batch_on_batch_connections(self):
+        async def run_test():
+            connection = await BatchMockDeviceConnection.create()
+            assert isinstance(connection, IBatchDeviceConnection)
+
+            await send_many(connection, [b"\x01", b"\x02", b"\x03"])
+
+            assert connection.batches == [[b"\x01", b"\x02", b"\x03"]]
+
+        asyncio.run(run_test())
+
+    def test_should_send_packets_in_order_on_plain_connections(self):
+        async def run_test():
+            connection = await MockDeviceConnection.create()
+            assert not isinstance(connection, IBatchDeviceConnection)
+            sent = []
+
+            async def on_data(data):
+                sent.append(data)
+
+            connection.configure_listeners(on_data)
+            await send_many(connection, [b"\x01", b"\x02", b"\x03"])
+
+            assert sent == [b"\x01", b"\x02", b"\x03"]
+
+        asyncio.run(run_test())
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,87 @@
+import asyncio
+import threading
+
+import pytest
+from interfaces import IReadableDeviceConnection
+from interfaces.__mocks__.connection import MockDeviceConnection
+from util.utils import ReadableSignal
+from core.utils.packetversion import PacketVersionMap
+from core.operations.helpers.waitforpacket import wait_for_packet
+from core.operations.helpers.__fixtures__.write_command import (
+    write_command_helper_test_cases,
+)
+
+
+class ReadableMockDeviceConnection(MockDeviceConnection):
+    def __init__(self):
+        super().__init__()
+        self.readable = ReadableSignal()
+        self.receive_count = 0
+
+    async def receive(self):
+        self.receive_count += 1
+        return await super().receive()
+
+    async def wait_readable(self, timeout=None) -> bool:
+        return await self.readable.wait(lambda: len(self.pool) > 0, timeout)
+
+    def deliver_from_thread(self, data: bytes) -> None:
+        self.pool.append({"id": next(self.packet_ids), "data": data})
+        self.readable.notify()
+
+
+class TestWaitForPacket:
+    def test_should_wake_when_readable_connection_signals(self):
+        async def run_test():
+            test_case = write_command_helper_test_cases["valid"][0]
+            connection = await ReadableMockDeviceConnection.create()
+            assert isinstance(connection, IReadableDeviceConnection)
+
+            task = wait_for_packet(
+                connection=connection,
+                sequence_number=test_case["sequence_number"],
+                packet_types=test_case["ack_packet_types"],
+                version=PacketVersionMap.v3,
+                ack_timeout=2000,
+            )
+
+            await asyncio.sleep(0.1)
+            thread = threading.Thread(
+                target=connection.deliver_from_thread,
+                args=(test_case["ack_packets"][0],),
+            )
+            thread.start()
+
+            result = await task.result()
+            thread.join()
+
+            assert result == test_case["decoded_ack_packet"]
+            # A 2 ms polling loop would have called receive about 50 times
+            assert connection.receive_count <= 3
+
+        asyncio.run(run_test())
+
+    def test_should_still_poll_plain_connections(self):
+        async def run_test():
+            test_case = write_command_helper_test_cases["valid"][0]
+            connection = await MockDeviceConnection.create()
+            assert not isinstance(connection, IReadableDeviceConnection)
+
+            task = wait_for_packet(
+                connection=connection,
+                sequence_number=test_case["sequence_number"],
+                packet_types=test_case["ack_packet_types"],
+                version=PacketVersionMap.v3,
+                ack_timeout=2000,
+            )
+
+            await asyncio.sleep(0.02)
+            await connection.mock_device_send(test_case["ack_packets"][0])
+
+            assert await task.result() == test_case["decoded_ack_packet"]
+
+        asyncio.run(run_test())
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
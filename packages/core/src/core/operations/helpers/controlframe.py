@@ -0,0 +1,24 @@
+import weakref
+from interfaces import IDeviceConnection
+from ...encoders.packet.control_frame import ControlFrameCache
+
+_control_frame_caches: (
+    "weakref.WeakKeyDictionary[IDeviceConnection, ControlFrameCache]"
+) = weakref.WeakKeyDictionary()
+
+
+def get_control_frame_cache(connection: IDeviceConnection) -> ControlFrameCache:
+    """
+    Get the control frame cache bound to a connection.
+
+    Status polls, command output requests and aborts are re-sent many times
+    per operation, so their templates are kept for the life of the connection.
+    """
+    try:
+        control_frame_cache = _control_frame_caches.get(connection)
+        if control_frame_cache is None:
+            control_frame_cache = ControlFrameCache()
+            _control_frame_caches[connection] = control_frame_cache
+        return control_frame_cache
+    except TypeError:
+        return ControlFrameCache()
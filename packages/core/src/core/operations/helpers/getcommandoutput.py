@@ -1,10 +1,16 @@
-from typing import Dict, Any, Optional, List
-from interfaces.errors import DeviceCompatibilityError, DeviceCompatibilityErrorType
+from typing import Dict, Any, Optional
+from interfaces.errors import (
+    DeviceCommunicationError,
+    DeviceCommunicationErrorType,
+    DeviceCompatibilityError,
+    DeviceCompatibilityErrorType,
+)
 from interfaces import IDeviceConnection
-from util.utils.crypto import int_to_uint_byte, assert_condition
+from util.utils.crypto import assert_condition
 from ...utils.packetversion import PacketVersion, PacketVersionMap
 from core.config import v3 as config_v3
-from ...encoders.packet.packet import decode_payload_data, encode_packet
+from ...encoders.packet.reassembly import PayloadReassembler
+from .controlframe import get_control_frame_cache
 from .writecommand import write_command
 from .can_retry import can_retry
 
@@ -27,8 +33,9 @@ async def get_command_output(
 
     usable_config = config_v3
 
+    control_frame_cache = get_control_frame_cache(connection)
     first_error: Optional[Exception] = None
-    data_list: List[str] = []
+    reassembler = PayloadReassembler()
 
     total_packets = 1
     current_packet = 1
@@ -40,18 +47,12 @@ async def get_command_output(
         first_error = None
         is_success = False
 
-        packets_list = encode_packet(
-            raw_data=int_to_uint_byte(current_packet, 16),
-            version=version,
-            sequence_number=sequence_number,
+        packet = control_frame_cache.encode(
             packet_type=usable_config.commands.PACKET_TYPE.CMD_OUTPUT,
+            sequence_number=sequence_number,
+            raw_data=current_packet.to_bytes(2, "big"),
         )
 
-        if len(packets_list) > 1:
-            raise Exception("Get Command Output exceeded 1 packet limit")
-
-        packet = packets_list[0]
-
         while tries <= inner_max_tries and not is_success:
             try:
                 received_packet = await write_command(
@@ -66,9 +67,10 @@ async def get_command_output(
                     timeout=timeout,
                 )
 
-                data_list.insert(
-                    received_packet["current_packet_number"] - 1,
-                    received_packet["payload_data"],
+                reassembler.add_chunk(
+                    received_packet["current_packet_number"],
+                    received_packet["total_packet_number"],
+                    bytes.fromhex(received_packet["payload_data"]),
                 )
                 total_packets = received_packet["total_packet_number"]
                 current_packet = received_packet["current_packet_number"] + 1
@@ -90,9 +92,15 @@ async def get_command_output(
         if not is_success and first_error:
             raise first_error
 
-    final_data = "".join(data_list)
+    # A response that restarted or skipped ahead left zero filled chunks,
+    # fail as if the missing chunks never arrived rather than decode them
+    if not reassembler.is_complete():
+        raise DeviceCommunicationError(DeviceCommunicationErrorType.READ_TIMEOUT)
 
-    result = decode_payload_data(final_data, version)
-    result["is_status"] = is_status_response
+    protobuf_data, raw_data = reassembler.get_sections()
 
-    return result
+    return {
+        "protobuf_data": protobuf_data.hex(),
+        "raw_data": raw_data.hex(),
+        "is_status": is_status_response,
+    }
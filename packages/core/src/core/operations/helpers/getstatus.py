@@ -4,7 +4,8 @@ from interfaces import IDeviceConnection
 from util.utils.assert_utils import assert_condition
 from core.config import v3 as config_v3
 from ...utils.packetversion import PacketVersion, PacketVersionMap
-from ...encoders.packet.packet import decode_payload_data, encode_packet
+from ...encoders.packet.packet import decode_payload_data
+from .controlframe import get_control_frame_cache
 from .writecommand import write_command
 from .can_retry import can_retry
 
@@ -25,19 +26,11 @@ async def get_status(
 
     usable_config = config_v3
 
-    packets_list = encode_packet(
-        raw_data="",
-        version=version,
-        sequence_number=-1,
+    packet = get_control_frame_cache(connection).encode(
         packet_type=usable_config.commands.PACKET_TYPE.STATUS_REQ,
+        sequence_number=-1,
     )
 
-    if len(packets_list) == 0:
-        raise Exception("Could not create packets")
-
-    if len(packets_list) > 1:
-        raise Exception("Status command has multiple packets")
-
     first_error: Optional[Exception] = None
 
     tries = 1
@@ -46,8 +39,6 @@ async def get_status(
     is_success = False
     final_data = ""
 
-    packet = packets_list[0]
-
     while tries <= inner_max_tries and not is_success:
         try:
             received_packet = await write_command(
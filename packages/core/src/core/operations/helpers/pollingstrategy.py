@@ -0,0 +1,98 @@
+from typing import Hashable, Optional, Protocol, runtime_checkable
+from core.config import v3 as config_v3
+
+_UNSET = object()
+
+
+@runtime_checkable
+class PollingStrategy(Protocol):
+    """Decides how long to wait before polling the device again."""
+
+    def reset(self) -> None: ...
+
+    def next_interval(self, state: Optional[Hashable] = None) -> float:
+        """
+        Get the wait before the next poll.
+
+        Args:
+            state: What the last poll reported, such as the command state and
+                flow status; strategies may react when it changes
+
+        Returns:
+            float: Wait in milliseconds
+        """
+        ...
+
+
+class FixedPollingStrategy:
+    """Polls every `interval` milliseconds."""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+
+    def reset(self) -> None:
+        pass
+
+    def next_interval(self, state: Optional[Hashable] = None) -> float:
+        return self.interval
+
+
+class BackoffPollingStrategy:
+    """
+    Polls quickly at first and backs off exponentially up to a cap.
+
+    Short operations are picked up within a few milliseconds, while long
+    waits such as a user confirmation settle at one poll per
+    `max_interval`. A change of the reported state restarts from
+    `initial_interval`, since the device is making progress.
+
+    The default cap of `MAX_POLL_TIME` polls a long wait less often than the
+    previous fixed `IDLE_RECHECK_TIME` interval, at the cost of picking up a
+    result that ends it up to that much later.
+    """
+
+    def __init__(
+        self,
+        initial_interval: float = config_v3.constants.MIN_POLL_TIME,
+        max_interval: float = config_v3.constants.MAX_POLL_TIME,
+        factor: float = 2,
+    ):
+        self.initial_interval = initial_interval
+        self.max_interval = max_interval
+        self.factor = factor
+        self._interval = initial_interval
+        self._state: object = _UNSET
+
+    def reset(self) -> None:
+        self._interval = self.initial_interval
+        self._state = _UNSET
+
+    def next_interval(self, state: Optional[Hashable] = None) -> float:
+        if state != self._state:
+            self._state = state
+            self._interval = self.initial_interval
+
+        interval = self._interval
+        self._interval = min(self._interval * self.factor, self.max_interval)
+        return interval
+
+
+def get_polling_strategy(options: Optional[dict] = None) -> PollingStrategy:
+    """
+    Get the polling strategy asked for in operation options.
+
+    A `pollingStrategy` is used as given, after a reset. A fixed `interval`
+    in milliseconds keeps the previous behaviour. Otherwise the device is
+    polled with a `BackoffPollingStrategy`.
+    """
+    options = options or {}
+
+    polling_strategy = options.get("pollingStrategy")
+    if polling_strategy is not None:
+        polling_strategy.reset()
+        return polling_strategy
+
+    if options.get("interval") is not None:
+        return FixedPollingStrategy(options["interval"])
+
+    return BackoffPollingStrategy()
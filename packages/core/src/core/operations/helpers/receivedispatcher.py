@@ -0,0 +1,296 @@
+import asyncio
+import weakref
+from collections import deque
+from typing import Deque, Dict, List, Optional, Set, Tuple, TypedDict
+from interfaces.errors import DeviceConnectionError, DeviceConnectionErrorType
+from interfaces import IDeviceConnection, IReadableDeviceConnection
+from core.config import v3 as config_v3
+from ...utils.logger import logger
+from ...encoders.packet.packet import DecodedPacketData, frame_to_packet_data
+from ...encoders.packet.frame_decoder import FrameDecoder
+
+RETAINED_PACKET_LIMIT = 16
+
+
+class ReceiveDispatcherStats(TypedDict):
+    received: int
+    routed: int
+    retained: int
+    dropped_invalid: int
+    dropped_unmatched: int
+    dropped_evicted: int
+    dropped_bytes: int
+
+
+class _Waiter:
+    __slots__ = ("sequence_number", "packet_types", "future")
+
+    def __init__(
+        self,
+        sequence_number: int,
+        packet_types: Set[int],
+        future: "asyncio.Future[DecodedPacketData]",
+    ):
+        self.sequence_number = sequence_number
+        self.packet_types = packet_types
+        self.future = future
+
+    def accepts(self, packet: DecodedPacketData) -> bool:
+        packet_type = packet["packet_type"]
+        if packet_type == config_v3.commands.PACKET_TYPE.ERROR:
+            return True
+        if packet_type not in self.packet_types:
+            return False
+        return (
+            packet_type == config_v3.commands.PACKET_TYPE.STATUS
+            or packet["sequence_number"] == self.sequence_number
+        )
+
+
+class ReceiveDispatcher:
+    """
+    Decodes the frames of one connection once and routes them to waiters.
+
+    Waiters are keyed by `(sequence_number, packet_type)`. STATUS packets are
+    matched whatever their sequence number and ERROR packets reach every
+    waiter. STATUS and ERROR packets nobody waits for are retained, up to
+    `RETAINED_PACKET_LIMIT`, for the next subscriber; other unmatched packets
+    are dropped and counted.
+
+    A single task reads the connection while there are waiters and parks on
+    an event otherwise. A parked task ends once the connection is closed or
+    garbage collected, and is started again by the next `subscribe`. A
+    dispatcher that is not `persistent` ends its task once it has no waiters
+    left.
+
+    The connection is only weakly referenced where possible, so the
+    dispatcher kept for it by `get_receive_dispatcher` does not keep it alive.
+    """
+
+    def __init__(self, connection: IDeviceConnection, persistent: bool = True):
+        try:
+            self._connection_ref = weakref.ref(connection)
+        except TypeError:
+            self._connection_ref = lambda: connection
+        self.persistent = persistent
+        self.frame_decoder = FrameDecoder()
+        self._waiters: Dict[Tuple[Optional[int], int], List[_Waiter]] = {}
+        self._retained: Deque[DecodedPacketData] = deque()
+        self._has_waiters: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._is_readable = isinstance(connection, IReadableDeviceConnection)
+        self.stats = ReceiveDispatcherStats(
+            received=0,
+            routed=0,
+            retained=0,
+            dropped_invalid=0,
+            dropped_unmatched=0,
+            dropped_evicted=0,
+            dropped_bytes=0,
+        )
+
+    @property
+    def connection(self) -> Optional[IDeviceConnection]:
+        return self._connection_ref()
+
+    def get_stats(self) -> ReceiveDispatcherStats:
+        """Get the packet counters, including what the frame decoder skipped."""
+        stats = ReceiveDispatcherStats(**self.stats)
+        stats["dropped_invalid"] += self.frame_decoder.invalid_frames
+        stats["dropped_bytes"] += self.frame_decoder.dropped_bytes
+        return stats
+
+    def subscribe(
+        self, sequence_number: int, packet_types: List[int]
+    ) -> "asyncio.Future[DecodedPacketData]":
+        """
+        Register a waiter for the next packet matching any of `packet_types`.
+
+        Resolves immediately with a retained packet if one matches.
+
+        Args:
+            sequence_number: Sequence number of the sent command
+            packet_types: Packet types to wait for
+
+        Returns:
+            asyncio.Future[DecodedPacketData]: Resolves with the matching
+            packet, or an ERROR packet, and fails if the connection closes
+        """
+        self._ensure_running()
+        future: "asyncio.Future[DecodedPacketData]" = (
+            asyncio.get_running_loop().create_future()
+        )
+        waiter = _Waiter(sequence_number, set(packet_types), future)
+
+        for packet in self._retained:
+            if waiter.accepts(packet):
+                self._retained.remove(packet)
+                self.stats["routed"] += 1
+                future.set_result(packet)
+                return future
+
+        for packet_type in waiter.packet_types:
+            self._waiters.setdefault(
+                self._key(sequence_number, packet_type), []
+            ).append(waiter)
+        self._has_waiters.set()
+        return future
+
+    def unsubscribe(self, future: "asyncio.Future[DecodedPacketData]") -> None:
+        for key in list(self._waiters):
+            waiters = [w for w in self._waiters[key] if w.future is not future]
+            if waiters:
+                self._waiters[key] = waiters
+            else:
+                del self._waiters[key]
+
+    @staticmethod
+    def _key(sequence_number: int, packet_type: int) -> Tuple[Optional[int], int]:
+        if packet_type == config_v3.commands.PACKET_TYPE.STATUS:
+            return (None, packet_type)
+        return (sequence_number, packet_type)
+
+    def _ensure_running(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._task.get_loop() is not loop:
+            # Futures and events are bound to a loop, so waiters of a finished
+            # loop cannot be carried over
+            self._waiters = {}
+            self._has_waiters = asyncio.Event()
+            self._task = loop.create_task(self._run())
+
+    def _active_waiters(self) -> List[_Waiter]:
+        waiters: Dict[int, _Waiter] = {}
+        for key_waiters in self._waiters.values():
+            for waiter in key_waiters:
+                waiters[id(waiter)] = waiter
+        return list(waiters.values())
+
+    def _dispatch(self, packet: DecodedPacketData) -> None:
+        self.stats["received"] += 1
+
+        if len(packet["error_list"]) != 0:
+            self.stats["dropped_invalid"] += 1
+            return
+
+        packet_type = packet["packet_type"]
+        if packet_type == config_v3.commands.PACKET_TYPE.ERROR:
+            waiters = self._active_waiters()
+        else:
+            waiters = self._waiters.get(
+                self._key(packet["sequence_number"], packet_type), []
+            )
+        waiters = [w for w in waiters if not w.future.done()]
+
+        if waiters:
+            for waiter in waiters:
+                waiter.future.set_result(packet)
+                self.unsubscribe(waiter.future)
+            self.stats["routed"] += 1
+        elif packet_type in [
+            config_v3.commands.PACKET_TYPE.STATUS,
+            config_v3.commands.PACKET_TYPE.ERROR,
+        ]:
+            if len(self._retained) >= RETAINED_PACKET_LIMIT:
+                self._retained.popleft()
+                self.stats["dropped_evicted"] += 1
+            self._retained.append(packet)
+            self.stats["retained"] += 1
+        else:
+            self.stats["dropped_unmatched"] += 1
+
+    def _reject_all(self, error: Exception) -> None:
+        for waiter in self._active_waiters():
+            if not waiter.future.done():
+                waiter.future.set_exception(error)
+        self._waiters = {}
+
+    async def _wait_for_data(self, connection: IDeviceConnection) -> None:
+        # Transports that signal arrival wake the dispatcher as soon as data
+        # lands; the bounded wait still lets it notice a closed connection.
+        if self._is_readable:
+            await connection.wait_readable(config_v3.constants.IDLE_RECHECK_TIME / 1000)
+        else:
+            await asyncio.sleep(config_v3.constants.RECHECK_TIME / 1000)
+
+    async def _park(self) -> bool:
+        """Wait for a waiter, False once the connection is gone."""
+        self._has_waiters.clear()
+        while not self._waiters:
+            try:
+                await asyncio.wait_for(
+                    self._has_waiters.wait(),
+                    config_v3.constants.IDLE_RECHECK_TIME / 1000,
+                )
+            except asyncio.TimeoutError:
+                connection = self.connection
+                if connection is None or not await connection.is_connected():
+                    # A waiter that came in meanwhile still gets rejected
+                    return bool(self._waiters)
+        return True
+
+    async def _run(self) -> None:
+        # The connection is only held while reading, never while parked
+        while True:
+            if not self._waiters:
+                if not self.persistent or not await self._park():
+                    return
+
+            connection = self.connection
+            if connection is None:
+                self._reject_all(
+                    DeviceConnectionError(DeviceConnectionErrorType.CONNECTION_CLOSED)
+                )
+                return
+
+            await self._read(connection)
+            del connection
+
+    async def _read(self, connection: IDeviceConnection) -> None:
+        try:
+            if not await connection.is_connected():
+                self._reject_all(
+                    DeviceConnectionError(DeviceConnectionErrorType.CONNECTION_CLOSED)
+                )
+                return
+
+            raw_packet = await connection.receive()
+            if not raw_packet:
+                await self._wait_for_data(connection)
+                return
+
+            for frame in self.frame_decoder.feed(raw_packet):
+                self._dispatch(frame_to_packet_data(frame))
+
+        except Exception as error:
+            if hasattr(error, "code") and error.code in [
+                e.value for e in DeviceConnectionErrorType
+            ]:
+                self._reject_all(error)
+                return
+
+            logger.error("Error while receiving packets on `ReceiveDispatcher`")
+            logger.error(str(error))
+            await asyncio.sleep(config_v3.constants.RECHECK_TIME / 1000)
+
+
+_receive_dispatchers: (
+    "weakref.WeakKeyDictionary[IDeviceConnection, ReceiveDispatcher]"
+) = weakref.WeakKeyDictionary()
+
+
+def get_receive_dispatcher(connection: IDeviceConnection) -> ReceiveDispatcher:
+    """
+    Get the receive dispatcher bound to a connection.
+
+    The dispatcher and its frame decoder outlive a single `wait_for_packet`
+    call, so a frame split across two reads is completed whoever is waiting.
+    """
+    try:
+        receive_dispatcher = _receive_dispatchers.get(connection)
+        if receive_dispatcher is None:
+            receive_dispatcher = ReceiveDispatcher(connection)
+            _receive_dispatchers[connection] = receive_dispatcher
+        return receive_dispatcher
+    except TypeError:
+        return ReceiveDispatcher(connection, persistent=False)
@@ -0,0 +1,113 @@
+import weakref
+from typing import Optional
+from interfaces import IDeviceConnection
+from core.config import v3 as config_v3
+
+# Gains and variance factor of RFC 6298
+SRTT_GAIN = 1 / 8
+RTTVAR_GAIN = 1 / 4
+RTTVAR_FACTOR = 4
+# Resolution of the event loop timers, in milliseconds
+CLOCK_GRANULARITY = 1
+MAX_BACKOFF = 6
+
+
+class RttEstimator:
+    """
+    Ack timeout of a connection derived from the measured round trip times.
+
+    Follows the retransmission timer of TCP (RFC 6298): the timeout is the
+    smoothed round trip time plus four times its variation, kept between
+    `min_timeout` and `max_timeout`. Until the first sample it is
+    `initial_timeout`. Every timed out write doubles it until an ack arrives
+    again, and the round trip of the write that follows a timeout is not
+    sampled, since its ack may answer the earlier write.
+
+    The default `min_timeout` is the 1 second floor of RFC 6298, so a write
+    retried `max_tries` times still waits for its acks about as long as with
+    the fixed `ACK_TIME`.
+
+    With `adaptive` set to False the timeout is always `max_timeout`, the
+    fixed `ACK_TIME` by default.
+    """
+
+    def __init__(
+        self,
+        initial_timeout: int = config_v3.constants.ACK_TIME,
+        min_timeout: int = config_v3.constants.MIN_ACK_TIME,
+        max_timeout: int = config_v3.constants.ACK_TIME,
+        adaptive: bool = True,
+    ):
+        self.initial_timeout = initial_timeout
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.adaptive = adaptive
+        self.srtt: Optional[float] = None
+        self.rttvar = 0.0
+        self.backoff = 0
+        self._is_ambiguous = False
+
+    def get_timeout(self) -> int:
+        """Get the ack timeout in milliseconds."""
+        if not self.adaptive:
+            return self.max_timeout
+
+        if self.srtt is None:
+            timeout = self.initial_timeout
+        else:
+            timeout = self.srtt + max(CLOCK_GRANULARITY, RTTVAR_FACTOR * self.rttvar)
+
+        timeout = max(timeout, self.min_timeout) * (1 << self.backoff)
+        return int(min(timeout, self.max_timeout))
+
+    def add_sample(self, rtt: float) -> None:
+        """
+        Record the round trip of an acked write.
+
+        Args:
+            rtt: Time from the write to its ack in milliseconds
+        """
+        self.backoff = 0
+        if self._is_ambiguous:
+            self._is_ambiguous = False
+            return
+
+        if self.srtt is None:
+            self.srtt = rtt
+            self.rttvar = rtt / 2
+            return
+
+        self.rttvar += RTTVAR_GAIN * (abs(self.srtt - rtt) - self.rttvar)
+        self.srtt += SRTT_GAIN * (rtt - self.srtt)
+
+    def add_timeout(self) -> None:
+        """Record a write whose ack did not arrive in time."""
+        self.backoff = min(self.backoff + 1, MAX_BACKOFF)
+        self._is_ambiguous = True
+
+    def reset(self) -> None:
+        self.srtt = None
+        self.rttvar = 0.0
+        self.backoff = 0
+        self._is_ambiguous = False
+
+
+_rtt_estimators: "weakref.WeakKeyDictionary[IDeviceConnection, RttEstimator]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_rtt_estimator(connection: IDeviceConnection) -> RttEstimator:
+    """
+    Get the round trip time estimator bound to a connection.
+
+    Set `adaptive` to False on it to go back to the fixed `ACK_TIME`.
+    """
+    try:
+        rtt_estimator = _rtt_estimators.get(connection)
+        if rtt_estimator is None:
+            rtt_estimator = RttEstimator()
+            _rtt_estimators[connection] = rtt_estimator
+        return rtt_estimator
+    except TypeError:
+        return RttEstimator()
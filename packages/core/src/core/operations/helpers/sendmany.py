@@ -0,0 +1,18 @@
+from typing import Sequence
+
+from interfaces import IBatchDeviceConnection, IDeviceConnection
+
+
+async def send_many(connection: IDeviceConnection, packets: Sequence[bytes]) -> None:
+    """
+    Send packets in order, in one batch where the transport supports it.
+
+    Only for packets the device accepts back to back; packets that each wait
+    for an acknowledgement must be sent one by one.
+    """
+    if isinstance(connection, IBatchDeviceConnection):
+        await connection.send_many(packets)
+        return
+
+    for packet in packets:
+        await connection.send(packet)
@@ -12,6 +12,7 @@ from interfaces import IDeviceConnection
 from util.utils.assert_utils import assert_condition
 from ...utils.packetversion import PacketVersion, PacketVersionMap
 from ...encoders.packet.packet import DecodedPacketData
+from .rttestimator import get_rtt_estimator
 from .waitforpacket import wait_for_packet
 
 
@@ -42,14 +43,30 @@ async def write_command(
     if not await connection.is_connected():
         raise DeviceConnectionError(DeviceConnectionErrorType.CONNECTION_CLOSED)
 
+    # A caller given timeout is used as is, the estimator still learns from it
+    rtt_estimator = get_rtt_estimator(connection)
+    loop = asyncio.get_running_loop()
+    start_time = loop.time()
+
     ack_promise = wait_for_packet(
         connection=connection,
         version=version,
         packet_types=ack_packet_types,
         sequence_number=sequence_number,
-        ack_timeout=timeout,
+        ack_timeout=timeout if timeout is not None else rtt_estimator.get_timeout(),
     )
 
+    async def wait_for_ack() -> DecodedPacketData:
+        try:
+            packet = await ack_promise.result()
+        except DeviceCommunicationError as error:
+            if error.code == DeviceCommunicationErrorType.READ_TIMEOUT.value:
+                rtt_estimator.add_timeout()
+            raise error
+
+        rtt_estimator.add_sample((loop.time() - start_time) * 1000)
+        return packet
+
     try:
         send_task = asyncio.create_task(connection.send(packet))
 
@@ -75,13 +92,13 @@ async def write_command(
             if ack_promise.is_cancelled():
                 raise Exception("Operation cancelled")
 
-            return await ack_promise.result()
+            return await wait_for_ack()
 
         for task in pending:
             if task != ack_promise.task:
                 task.cancel()
 
-        return await ack_promise.result()
+        return await wait_for_ack()
 
     except Exception as error:
         ack_promise.cancel()
@@ -0,0 +1,59 @@
+import asyncio
+import pytest
+
+from core.operations.legacy.sendData import PoolCursor, peek_new_pool_items
+
+
+class StringIdConnection:
+    """Connection following the older contract: string ids, no peek_since."""
+
+    def __init__(self):
+        self.pool = []
+        self.packet_count = 0
+
+    async def mock_device_send(self, data: bytes) -> None:
+        self.packet_count += 1
+        self.pool.append({"id": f"packet-{self.packet_count}", "data": data})
+
+    async def receive(self):
+        return self.pool.pop(0)["data"] if self.pool else None
+
+    async def peek(self):
+        return self.pool.copy()
+
+
+class TestPeekNewPoolItems:
+    def test_should_skip_seen_items_with_string_ids(self):
+        async def _test():
+            connection = StringIdConnection()
+            cursor = PoolCursor()
+            await connection.mock_device_send(b"\x01")
+            await connection.mock_device_send(b"\x02")
+
+            first = await peek_new_pool_items(connection, cursor)
+            assert [item["data"] for item in first] == [b"\x01", b"\x02"]
+            cursor.mark_seen(first[0])
+
+            await connection.mock_device_send(b"\x03")
+            second = await peek_new_pool_items(connection, cursor)
+            assert [item["data"] for item in second] == [b"\x02", b"\x03"]
+
+        asyncio.run(_test())
+
+    def test_should_forget_ids_no_longer_pooled(self):
+        async def _test():
+            connection = StringIdConnection()
+            cursor = PoolCursor()
+            await connection.mock_device_send(b"\x01")
+            for item in await peek_new_pool_items(connection, cursor):
+                cursor.mark_seen(item)
+
+            await connection.receive()
+            assert await peek_new_pool_items(connection, cursor) == []
+            assert cursor.seen_ids == set()
+
+        asyncio.run(_test())
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -11,7 +11,8 @@ from interfaces.errors import (
 )
 from util.utils.assert_utils import assert_condition
 from ...utils.packetversion import PacketVersion, PacketVersionMap
-from ...encoders.packet.legacy import xmodem_decode, LegacyDecodedPacketData
+from ...encoders.packet.legacy import LegacyDecodedPacketData
+from ...encoders.packet.frame_decoder import LegacyFrameDecoder
 from core.config import v1 as config_v1
 
 DEFAULT_RECEIVE_TIMEOUT = 15000
@@ -40,6 +41,7 @@ async def receive_data(
         raise DeviceConnectionError(DeviceConnectionErrorType.CONNECTION_CLOSED)
 
     res_data: Dict[int, str] = {}
+    frame_decoder = LegacyFrameDecoder(version)
     future = asyncio.get_event_loop().create_future()
     is_completed = False
 
@@ -82,7 +84,7 @@ async def receive_data(
                     await asyncio.sleep(config_v1.constants.RECHECK_TIME / 1000)
                     continue
 
-                packet_list = xmodem_decode(data, version)
+                packet_list = frame_decoder.feed(data)
                 for packet in packet_list:
                     if process_packet(packet):
                         return
@@ -1,6 +1,10 @@
 import asyncio
-from typing import List, Optional
-from interfaces.connection import IDeviceConnection
+from typing import Hashable, List, Optional, Set
+from interfaces.connection import (
+    IDeviceConnection,
+    IPeekableDeviceConnection,
+    PoolData,
+)
 from interfaces.errors import (
     DeviceConnectionError,
     DeviceConnectionErrorType,
@@ -16,11 +20,38 @@ from ...utils.packetversion import PacketVersion, PacketVersionMap
 from ...encoders.packet.legacy import xmodem_encode, xmodem_decode
 
 
+class PoolCursor:
+    """Pool entries already inspected, shared by all packets."""
+
+    def __init__(self) -> None:
+        self.last_id = -1
+        # Ids seen through `peek`, whose ids need not be ordered integers
+        self.seen_ids: Set[Hashable] = set()
+
+    def mark_seen(self, item: PoolData) -> None:
+        self.last_id = item["id"]
+        self.seen_ids.add(item["id"])
+
+
+async def peek_new_pool_items(
+    connection: IDeviceConnection, cursor: PoolCursor
+) -> List[PoolData]:
+    if isinstance(connection, IPeekableDeviceConnection):
+        return await connection.peek_since(cursor.last_id)
+
+    # Connections written against the older contract use string ids, so
+    # entries are told apart by id rather than ordered by it
+    pool = await connection.peek()
+    # Only ids still in the pool can come back, so the set stays bounded
+    cursor.seen_ids.intersection_update(item["id"] for item in pool)
+    return [item for item in pool if item["id"] not in cursor.seen_ids]
+
+
 async def write_packet(
     connection: IDeviceConnection,
     packet: bytes,
     version: PacketVersion,
-    skip_packet_ids: List[str],
+    cursor: PoolCursor,
     ack_timeout: Optional[int] = None,
 ) -> None:
     usable_config = v1
@@ -54,12 +85,10 @@ async def write_packet(
             if is_completed:
                 return
 
-            pool = await connection.peek()
+            pool = await peek_new_pool_items(connection, cursor)
             for pool_item in pool:
                 data = pool_item["data"]
-                if pool_item["id"] in skip_packet_ids:
-                    continue
-                skip_packet_ids.append(pool_item["id"])
+                cursor.mark_seen(pool_item)
 
                 packet_list = xmodem_decode(data, version)
                 for pkt in packet_list:
@@ -139,7 +168,7 @@ async def send_data(
         )
 
     inner_max_tries = max_tries if max_tries is not None else 5
-    skip_packet_ids: List[str] = []
+    cursor = PoolCursor()
     packets_list = xmodem_encode(data, command, version)
 
     for packet in packets_list:
@@ -156,9 +185,7 @@ async def send_data(
 
         while not is_done and tries <= local_max_tries:
             try:
-                await write_packet(
-                    connection, packet, version, skip_packet_ids, timeout
-                )
+                await write_packet(connection, packet, version, cursor, timeout)
                 is_done = True
             except Exception as e:
                 if isinstance(e, DeviceConnectionError):
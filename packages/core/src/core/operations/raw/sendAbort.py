@@ -8,10 +8,11 @@ from interfaces.errors.compatibility_error import (
 from util.utils.assert_utils import assert_condition
 from ...utils.packetversion import PacketVersion, PacketVersionMap
 from core.config import v3 as config
-from ...encoders.packet.packet import decode_payload_data, encode_packet
+from ...encoders.packet.packet import decode_payload_data
 from ...encoders.raw import decode_status, StatusData
 from ...operations.helpers.writecommand import write_command
 from ...operations.helpers.can_retry import can_retry
+from ...operations.helpers.controlframe import get_control_frame_cache
 
 
 async def send_abort(
@@ -32,26 +33,17 @@ async def send_abort(
 
     usable_config = config
 
-    packets_list = encode_packet(
-        raw_data="",
-        version=version,
-        sequence_number=sequence_number,
+    packet = get_control_frame_cache(connection).encode(
         packet_type=usable_config.commands.PACKET_TYPE.ABORT,
+        sequence_number=sequence_number,
     )
 
-    if len(packets_list) == 0:
-        raise Exception("Cound not create packets")
-
-    if len(packets_list) > 1:
-        raise Exception("Abort command has multiple packets")
-
     first_error: Optional[Exception] = None
     tries = 1
     inner_max_tries = max_tries
     is_success = False
     status: Optional[StatusData] = None
 
-    packet = packets_list[0]
     while tries <= inner_max_tries and not is_success:
         try:
             received_packet = await write_command(
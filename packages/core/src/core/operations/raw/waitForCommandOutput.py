@@ -10,6 +10,7 @@ from util.utils.sleep import sleep
 from ...utils.packetversion import PacketVersion, PacketVersionMap
 from ...encoders.raw import CmdState, DeviceIdleState, RawData, StatusData
 from ...operations.raw.get_command_output import get_command_output
+from ...operations.helpers.pollingstrategy import get_polling_strategy
 
 
 async def wait_for_command_output(
@@ -33,6 +34,8 @@ async def wait_for_command_output(
             DeviceCompatibilityErrorType.INVALID_SDK_OPERATION
         )
 
+    polling_strategy = get_polling_strategy(options)
+
     while True:
         response = await get_command_output(
             connection=connection,
@@ -65,4 +68,6 @@ async def wait_for_command_output(
         if status["deviceIdleState"] == DeviceIdleState.USB:
             if on_status:
                 on_status(status)
-        await sleep(options.get("interval", 200) if options else 200)
+        await sleep(
+            polling_strategy.next_interval((status["cmdState"], status["flowStatus"]))
+        )
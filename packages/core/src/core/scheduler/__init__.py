@@ -0,0 +1,7 @@
+from .scheduler import DeviceScheduler, OperationPriority, SchedulerStats
+
+__all__ = [
+    "DeviceScheduler",
+    "OperationPriority",
+    "SchedulerStats",
+]
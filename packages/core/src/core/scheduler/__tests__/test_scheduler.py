@@ -0,0 +1,165 @@
+import asyncio
+import pytest
+
+from interfaces import DeviceConnectionError
+from interfaces.errors.app_error import DeviceAppError, DeviceAppErrorType
+from core.scheduler import DeviceScheduler, OperationPriority
+from core.simulator import SimulatedDeviceConnection
+
+
+class FakeSDK:
+    def __init__(self):
+        self.connection = SimulatedDeviceConnection()
+        self.calls = []
+
+    def get_connection(self):
+        return self.connection
+
+    async def before_operation(self):
+        self.calls.append("before_operation")
+
+    async def after_operation(self):
+        self.calls.append("after_operation")
+
+    async def send_abort(self):
+        self.calls.append("send_abort")
+
+    async def destroy(self):
+        await self.connection.destroy()
+
+
+def record(order, name, delay=0.0):
+    async def operation():
+        order.append(f"{name} start")
+        await asyncio.sleep(delay)
+        order.append(f"{name} end")
+        return name
+
+    return operation
+
+
+class TestDeviceScheduler:
+    def test_should_not_interleave_operations(self):
+        async def _test():
+            scheduler = DeviceScheduler(FakeSDK())
+            order = []
+
+            results = await asyncio.gather(
+                *[scheduler.run(record(order, str(i), 0.001)) for i in range(3)]
+            )
+
+            assert results == ["0", "1", "2"]
+            assert order == ["0 start", "0 end", "1 start", "1 end", "2 start", "2 end"]
+            assert scheduler.stats["completed"] == 3
+
+        asyncio.run(_test())
+
+    def test_should_run_queued_operations_by_priority(self):
+        async def _test():
+            scheduler = DeviceScheduler(FakeSDK())
+            order = []
+
+            running = asyncio.ensure_future(scheduler.run(record(order, "first", 0.01)))
+            await asyncio.sleep(0)
+            queued = [
+                asyncio.ensure_future(scheduler.run(record(order, name), priority))
+                for name, priority in [
+                    ("low", OperationPriority.LOW),
+                    ("normal 1", OperationPriority.NORMAL),
+                    ("high", OperationPriority.HIGH),
+                    ("normal 2", OperationPriority.NORMAL),
+                ]
+            ]
+            await asyncio.sleep(0)
+            assert scheduler.get_queue_depth() == 4
+
+            await asyncio.gather(running, *queued)
+            assert [entry[:-6] for entry in order if entry.endswith(" start")] == [
+                "first",
+                "high",
+                "normal 1",
+                "normal 2",
+                "low",
+            ]
+            assert scheduler.stats["max_queue_depth"] == 4
+            assert scheduler.get_queue_depth() == 0
+
+        asyncio.run(_test())
+
+    def test_should_preempt_running_operation_on_abort(self):
+        async def _test():
+            sdk = FakeSDK()
+            scheduler = DeviceScheduler(sdk)
+            order = []
+
+            running = asyncio.ensure_future(scheduler.run(record(order, "long", 10)))
+            queued = asyncio.ensure_future(scheduler.run(record(order, "queued")))
+            await asyncio.sleep(0.001)
+            await scheduler.abort()
+
+            with pytest.raises(DeviceAppError) as error:
+                await running
+            assert error.value.code == DeviceAppErrorType.PROCESS_ABORTED.value
+            # The preempted operation is not kept alive once it ended
+            assert scheduler._preempted is None
+
+            assert await queued == "queued"
+            assert sdk.calls == ["before_operation", "send_abort", "after_operation"]
+            assert order == ["long start", "queued start", "queued end"]
+            assert scheduler.stats["aborted"] == 1
+
+        asyncio.run(_test())
+
+    def test_should_pass_the_device_on_when_a_waiter_is_cancelled(self):
+        async def _test():
+            scheduler = DeviceScheduler(FakeSDK())
+            order = []
+
+            running = asyncio.ensure_future(scheduler.run(record(order, "a", 0.01)))
+            cancelled = asyncio.ensure_future(scheduler.run(record(order, "b")))
+            queued = asyncio.ensure_future(scheduler.run(record(order, "c")))
+            await asyncio.sleep(0)
+            cancelled.cancel()
+
+            await asyncio.gather(running, queued)
+            assert order == ["a start", "a end", "c start", "c end"]
+            assert cancelled.cancelled()
+
+        asyncio.run(_test())
+
+    def test_should_measure_wait_time(self):
+        async def _test():
+            now = [0.0]
+            scheduler = DeviceScheduler(FakeSDK(), clock=lambda: now[0])
+
+            async def advance():
+                now[0] += 2.0
+
+            await asyncio.gather(scheduler.run(advance), scheduler.run(advance))
+
+            assert scheduler.stats["max_wait_time"] == 2.0
+            assert scheduler.get_mean_wait_time() == 1.0
+
+        asyncio.run(_test())
+
+    def test_should_fail_queued_operations_on_destroy(self):
+        async def _test():
+            scheduler = DeviceScheduler(FakeSDK())
+            order = []
+
+            running = asyncio.ensure_future(scheduler.run(record(order, "a", 0.01)))
+            queued = asyncio.ensure_future(scheduler.run(record(order, "b")))
+            await asyncio.sleep(0)
+            await scheduler.destroy()
+
+            with pytest.raises(DeviceConnectionError):
+                await queued
+            await running
+            with pytest.raises(DeviceConnectionError):
+                await scheduler.run(record(order, "c"))
+
+        asyncio.run(_test())
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,192 @@
+import asyncio
+import heapq
+import itertools
+import time
+from enum import IntEnum
+from typing import Awaitable, Callable, List, Optional, Tuple, TypedDict, TypeVar
+from interfaces import DeviceConnectionError, DeviceConnectionErrorType
+from interfaces.errors.app_error import DeviceAppError, DeviceAppErrorType
+from ..types import ISDK
+
+T = TypeVar("T")
+
+
+class OperationPriority(IntEnum):
+    # Lower values run first; equal priorities run in the order queued
+    ABORT = -1
+    HIGH = 0
+    NORMAL = 10
+    LOW = 20
+
+
+class SchedulerStats(TypedDict):
+    scheduled: int
+    started: int
+    completed: int
+    failed: int
+    aborted: int
+    max_queue_depth: int
+    # Seconds spent queued before running, over every started operation
+    total_wait_time: float
+    max_wait_time: float
+
+
+class DeviceScheduler:
+    """
+    Runs the operations of many callers on one device, one at a time.
+
+    Every operation of a device has to go through its scheduler: v3 requests
+    share the connection's sequence number, so two interleaved operations
+    would read each other's results. Waiting operations run by priority, and
+    in the order they were queued within one priority.
+
+    `abort` preempts the running operation, which fails with
+    `DeviceAppErrorType.PROCESS_ABORTED`, and sends the abort to the device
+    before any queued operation runs.
+    """
+
+    def __init__(self, sdk: ISDK, clock: Callable[[], float] = time.monotonic):
+        self.sdk = sdk
+        self.clock = clock
+        self.is_destroyed = False
+        self.stats = SchedulerStats(
+            scheduled=0,
+            started=0,
+            completed=0,
+            failed=0,
+            aborted=0,
+            max_queue_depth=0,
+            total_wait_time=0.0,
+            max_wait_time=0.0,
+        )
+        self._queue: List[Tuple[int, int, "asyncio.Future[None]"]] = []
+        self._order = itertools.count()
+        self._busy = False
+        self._running: Optional["asyncio.Task"] = None
+        self._preempted: Optional["asyncio.Task"] = None
+
+    def get_sdk(self) -> ISDK:
+        return self.sdk
+
+    def get_queue_depth(self) -> int:
+        """Get the number of operations waiting for the device."""
+        return sum(1 for _, _, waiter in self._queue if not waiter.done())
+
+    def get_mean_wait_time(self) -> float:
+        """Get the mean time operations waited before running, in seconds."""
+        started = self.stats["started"]
+        return self.stats["total_wait_time"] / started if started else 0.0
+
+    async def run(
+        self,
+        operation: Callable[[], Awaitable[T]],
+        priority: int = OperationPriority.NORMAL,
+    ) -> T:
+        """
+        Run an operation once the device is free.
+
+        Args:
+            operation: Starts the operation, such as
+                `lambda: app.sign_txn(params)`
+            priority: Lower values run first, see `OperationPriority`
+
+        Returns:
+            T: Result of the operation
+        """
+        if self.is_destroyed:
+            raise DeviceConnectionError(DeviceConnectionErrorType.CONNECTION_CLOSED)
+
+        self.stats["scheduled"] += 1
+        queued_at = self.clock()
+        await self._acquire(priority)
+
+        wait_time = self.clock() - queued_at
+        self.stats["started"] += 1
+        self.stats["total_wait_time"] += wait_time
+        self.stats["max_wait_time"] = max(self.stats["max_wait_time"], wait_time)
+
+        task = asyncio.ensure_future(operation())
+        self._running = task
+        try:
+            result = await task
+        except asyncio.CancelledError:
+            if self._preempted is not task:
+                raise
+            self.stats["aborted"] += 1
+            raise DeviceAppError(DeviceAppErrorType.PROCESS_ABORTED) from None
+        except Exception:
+            self.stats["failed"] += 1
+            raise
+        finally:
+            self._running = None
+            if self._preempted is task:
+                self._preempted = None
+            self._release()
+
+        self.stats["completed"] += 1
+        return result
+
+    async def abort(self) -> None:
+        """
+        Preempt the running operation and abort it on the device.
+
+        The abort runs ahead of every queued operation; these keep their
+        place and run afterwards.
+        """
+        task = self._running
+        if task is not None and not task.done():
+            self._preempted = task
+            task.cancel()
+
+        await self.run(self._send_abort, OperationPriority.ABORT)
+
+    async def destroy(self) -> None:
+        """Fail the queued operations and destroy the SDK."""
+        self.is_destroyed = True
+        for _, _, waiter in self._queue:
+            if not waiter.done():
+                waiter.set_exception(
+                    DeviceConnectionError(DeviceConnectionErrorType.CONNECTION_CLOSED)
+                )
+        self._queue = []
+        await self.sdk.destroy()
+
+    async def _send_abort(self) -> None:
+        await self.sdk.before_operation()
+        try:
+            await self.sdk.send_abort()
+        finally:
+            if await self.sdk.get_connection().is_connected():
+                await self.sdk.after_operation()
+
+    async def _acquire(self, priority: int) -> None:
+        # Waiters are handed the device as it is released, so a free device
+        # has no one waiting
+        if not self._busy:
+            self._busy = True
+            return
+
+        waiter: "asyncio.Future[None]" = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._queue, (priority, next(self._order), waiter))
+        self.stats["max_queue_depth"] = max(
+            self.stats["max_queue_depth"], self.get_queue_depth()
+        )
+
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            # Cancelled after being handed the device, so pass it on
+            if waiter.done() and not waiter.cancelled():
+                self._release()
+            raise
+
+    def _release(self) -> None:
+        # Hand the device to the first waiter still waiting, skipping the
+        # ones cancelled while queued
+        while self._queue:
+            _, _, waiter = heapq.heappop(self._queue)
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+
+        self._busy = False
@@ -1,4 +1,4 @@
-from typing import Optional, Dict, Any, Callable, Awaitable, List
+from typing import Optional, Dict, Any, Callable, Awaitable, List, Union
 from interfaces import (
     DeviceBootloaderError,
     DeviceBootloaderErrorType,
@@ -18,10 +18,17 @@ from . import commands
 from .utils.sdk_version import get_packet_version_from_sdk, format_sdk_version
 from .utils.packetversion import PacketVersion, PacketVersionMap
 from .utils.feature_map import FeatureName, is_feature_enabled
-from .types import IFeatureSupport, ISDK
+from .utils.capability_cache import (
+    DeviceCapabilities,
+    DeviceCapabilityCache,
+    get_device_capability_cache,
+    get_device_serial,
+)
+from .types import IFeatureSupport, ISDK, OperationContext
 from .deprecated import DeprecatedCommunication
 from .encoders.proto.types import DeviceIdleState
 from .encoders.raw.types import DeviceIdleState as RawDeviceIdleState
+from .encoders.packet.codec import BytesLike
 from .utils.logger import logger
 from .encoders.proto.generated.core import AppVersionResultResponse
 from interfaces.errors.app_error import DeviceAppError, DeviceAppErrorType
@@ -34,6 +41,8 @@ class SDK:
         applet_id: int,
         version: str,
         packet_version: Optional[PacketVersion] = None,
+        capability_cache: Optional[DeviceCapabilityCache] = None,
+        device_serial: Optional[str] = None,
     ):
         self.connection = connection
         self.version = version
@@ -41,6 +50,11 @@ class SDK:
         self.applet_id = applet_id
         self.deprecated = DeprecatedCommunication(self)
         self.app_versions_map: Optional[AppVersionResultResponse] = None
+        # Shares the capabilities read by this SDK with later ones
+        self.capability_cache = capability_cache
+        self.device_serial = device_serial
+        # Device state and support checked once in `before_operation`
+        self.operation_context: Optional[OperationContext] = None
 
     @classmethod
     async def create(
@@ -51,14 +65,46 @@ class SDK:
     ) -> ISDK:
         max_tries = options.get("max_tries") if options else None
         timeout = options.get("timeout") if options else None
+        capability_cache = options.get("capability_cache") if options else None
+        if capability_cache is None:
+            capability_cache = get_device_capability_cache()
+
+        device_serial = None
+        if (
+            capability_cache is not None
+            and await connection.get_device_state() != DeviceState.BOOTLOADER
+        ):
+            device_serial = await get_device_serial(connection)
+
+        capabilities = (
+            capability_cache.get(device_serial)
+            if capability_cache is not None and device_serial
+            else None
+        )
+        if capabilities is None:
+            sdk_data = await cls.get_sdk_version(connection, max_tries, timeout)
+            capabilities = DeviceCapabilities(
+                sdk_version=sdk_data["sdkVersion"],
+                packet_version=sdk_data.get("packetVersion"),
+                app_versions=None,
+            )
+            if capability_cache is not None and device_serial:
+                capability_cache.set(
+                    device_serial,
+                    capabilities,
+                    await connection.get_connection_type(),
+                )
 
-        sdk_data = await cls.get_sdk_version(connection, max_tries, timeout)
-        return cls(
+        sdk = cls(
             connection,
             applet_id,
-            sdk_data["sdkVersion"],
-            sdk_data.get("packetVersion"),
+            capabilities["sdk_version"],
+            capabilities["packet_version"],
+            capability_cache,
+            device_serial,
         )
+        sdk.app_versions_map = capabilities["app_versions"]
+        return sdk
 
     def get_connection(self) -> IDeviceConnection:
         return self.connection
@@ -70,6 +116,9 @@ class SDK:
         return self.packet_version
 
     async def is_supported(self) -> bool:
+        if self.operation_context is not None:
+            return self.operation_context["is_supported"]
+
         if await self.get_device_state() == DeviceState.BOOTLOADER:
             return False
 
@@ -82,17 +131,32 @@ class SDK:
         return await self.connection.get_new_sequence_number()
 
     async def before_operation(self) -> None:
-        return await self.connection.before_operation()
+        self.operation_context = None
+        await self.connection.before_operation()
+
+        device_state = await self.get_device_state()
+        self.operation_context = OperationContext(
+            device_state=device_state,
+            is_supported=device_state != DeviceState.BOOTLOADER
+            and is_feature_enabled(FeatureName.ProtoCommand, self.get_version()),
+        )
 
     async def after_operation(self) -> None:
+        self.operation_context = None
         return await self.connection.after_operation()
 
     def configure_applet_id(self, applet_id: int) -> None:
         self.applet_id = applet_id
 
     async def destroy(self) -> None:
+        self.operation_context = None
         return await self.connection.destroy()
 
+    async def invalidate_capabilities(self) -> None:
+        self.app_versions_map = None
+        if self.capability_cache is not None and self.device_serial:
+            self.capability_cache.invalidate(self.device_serial)
+
     async def is_in_bootloader(self) -> bool:
         return await self.get_device_state() == DeviceState.BOOTLOADER
 
@@ -105,18 +169,7 @@ class SDK:
         data: bytes,
         options: Optional[Dict[str, Any]] = None,
     ) -> None:
-        await self.validate_not_in_bootloader_mode()
-        assert_condition(
-            self.packet_version,
-            DeviceCompatibilityError(
-                DeviceCompatibilityErrorType.DEVICE_NOT_SUPPORTED,
-            ),
-        )
-
-        if not await self.is_supported():
-            raise DeviceCompatibilityError(
-                DeviceCompatibilityErrorType.INVALID_SDK_OPERATION,
-            )
+        await self._validate_proto_operation()
 
         sequence_number = options.get("sequence_number") if options else None
         if sequence_number is None:
@@ -140,18 +193,7 @@ class SDK:
         )
 
     async def get_result(self, options: Optional[Dict[str, Any]] = None):
-        await self.validate_not_in_bootloader_mode()
-        assert_condition(
-            self.packet_version,
-            DeviceCompatibilityError(
-                DeviceCompatibilityErrorType.DEVICE_NOT_SUPPORTED,
-            ),
-        )
-
-        if not await self.is_supported():
-            raise DeviceCompatibilityError(
-                DeviceCompatibilityErrorType.INVALID_SDK_OPERATION,
-            )
+        await self._validate_proto_operation()
 
         sequence_number = options.get("sequence_number") if options else None
         if sequence_number is None:
@@ -174,18 +216,7 @@ class SDK:
         )
 
     async def wait_for_result(self, params: Optional[Dict[str, Any]] = None):
-        await self.validate_not_in_bootloader_mode()
-        assert_condition(
-            self.packet_version,
-            DeviceCompatibilityError(
-                DeviceCompatibilityErrorType.DEVICE_NOT_SUPPORTED,
-            ),
-        )
-
-        if not await self.is_supported():
-            raise DeviceCompatibilityError(
-                DeviceCompatibilityErrorType.INVALID_SDK_OPERATION,
-            )
+        await self._validate_proto_operation()
 
         sequence_number = params.get("sequence_number") if params else None
         if sequence_number is None:
@@ -209,18 +240,7 @@ class SDK:
         timeout: Optional[int] = None,
         dont_log: Optional[bool] = None,
     ):
-        await self.validate_not_in_bootloader_mode()
-        assert_condition(
-            self.packet_version,
-            DeviceCompatibilityError(
-                DeviceCompatibilityErrorType.DEVICE_NOT_SUPPORTED,
-            ),
-        )
-
-        if not await self.is_supported():
-            raise DeviceCompatibilityError(
-                DeviceCompatibilityErrorType.INVALID_SDK_OPERATION,
-            )
+        await self._validate_proto_operation()
 
         # Set defaults for None values
         if max_tries is None:
@@ -237,18 +257,7 @@ class SDK:
         )
 
     async def send_abort(self, options: Optional[Dict[str, Any]] = None):
-        await self.validate_not_in_bootloader_mode()
-        assert_condition(
-            self.packet_version,
-            DeviceCompatibilityError(
-                DeviceCompatibilityErrorType.DEVICE_NOT_SUPPORTED,
-            ),
-        )
-
-        if not await self.is_supported():
-            raise DeviceCompatibilityError(
-                DeviceCompatibilityErrorType.INVALID_SDK_OPERATION,
-            )
+        await self._validate_proto_operation()
 
         sequence_number = options.get("sequence_number") if options else None
         if sequence_number is None:
@@ -274,18 +283,7 @@ class SDK:
         on_status: Optional[Callable[[Any], None]] = None,
         options: Optional[Dict[str, Any]] = None,
     ):
-        await self.validate_not_in_bootloader_mode()
-        assert_condition(
-            self.packet_version,
-            DeviceCompatibilityError(
-                DeviceCompatibilityErrorType.DEVICE_NOT_SUPPORTED,
-            ),
-        )
-
-        if not await self.is_supported():
-            raise DeviceCompatibilityError(
-                DeviceCompatibilityErrorType.INVALID_SDK_OPERATION,
-            )
+        await self._validate_proto_operation()
 
         if not self.app_versions_map:
             result = await commands.get_app_versions(
@@ -297,6 +295,8 @@ class SDK:
                 )
             )
             self.app_versions_map = result
+            if self.capability_cache is not None and self.device_serial:
+                self.capability_cache.set_app_versions(self.device_serial, result)
             return result
 
         return self.app_versions_map
@@ -377,7 +377,7 @@ class SDK:
 
     async def send_bootloader_data(
         self,
-        data: str,
+        data: Union[str, BytesLike],
         on_progress: Optional[Callable[[int], None]] = None,
         options: Optional[Dict[str, Any]] = None,
     ) -> None:
@@ -421,33 +421,45 @@ class SDK:
 
     async def run_operation(self, operation: Callable[[], Awaitable[Any]]) -> Any:
         try:
-            await self.connection.before_operation()
+            await self.before_operation()
             await self.make_device_ready()
 
             result = await operation()
 
             if await self.connection.is_connected():
-                await self.connection.after_operation()
+                await self.after_operation()
+            else:
+                self.operation_context = None
 
             return result
         except Exception as error:
             if await self.connection.is_connected():
-                await self.connection.after_operation()
+                await self.after_operation()
+            else:
+                self.operation_context = None
 
             raise error
 
-    async def validate_not_in_bootloader_mode(self) -> None:
-        if await self.is_in_bootloader():
+    async def _validate_proto_operation(self) -> None:
+        """
+        Checks run before every v3 protobuf request.
+
+        Inside an operation the device state and support found by
+        `before_operation` are reused, so only a disconnect is checked for.
+        Outside of one, or once the connection is lost, the device is asked
+        again.
+        """
+        context = self.operation_context
+        if context is not None and not await self.connection.is_connected():
+            self.operation_context = context = None
+
+        if context is None:
+            await self.validate_not_in_bootloader_mode()
+        elif context["device_state"] == DeviceState.BOOTLOADER:
             raise DeviceCommunicationError(
                 DeviceCommunicationErrorType.IN_BOOTLOADER,
             )
 
-    async def start_session(
-        self,
-        on_status: Optional[Callable[[Any], None]] = None,
-        options: Optional[Dict[str, Any]] = None,
-    ):
-        await self.validate_not_in_bootloader_mode()
         assert_condition(
             self.packet_version,
             DeviceCompatibilityError(
@@ -460,6 +472,19 @@ class SDK:
                 DeviceCompatibilityErrorType.INVALID_SDK_OPERATION,
             )
 
+    async def validate_not_in_bootloader_mode(self) -> None:
+        if await self.is_in_bootloader():
+            raise DeviceCommunicationError(
+                DeviceCommunicationErrorType.IN_BOOTLOADER,
+            )
+
+    async def start_session(
+        self,
+        on_status: Optional[Callable[[Any], None]] = None,
+        options: Optional[Dict[str, Any]] = None,
+    ):
+        await self._validate_proto_operation()
+
         return await commands.start_session(
             commands.StartSessionParams(
                 connection=self.connection,
@@ -475,18 +500,7 @@ class SDK:
         on_status: Optional[Callable[[Any], None]] = None,
         options: Optional[Dict[str, Any]] = None,
     ) -> None:
-        await self.validate_not_in_bootloader_mode()
-        assert_condition(
-            self.packet_version,
-            DeviceCompatibilityError(
-                DeviceCompatibilityErrorType.DEVICE_NOT_SUPPORTED,
-            ),
-        )
-
-        if not await self.is_supported():
-            raise DeviceCompatibilityError(
-                DeviceCompatibilityErrorType.INVALID_SDK_OPERATION,
-            )
+        await self._validate_proto_operation()
 
         return await commands.close_session(
             commands.CloseSessionParams(
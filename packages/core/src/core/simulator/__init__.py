@@ -0,0 +1,36 @@
+from .connection import LinkStats, SimulatedDeviceConnection
+from .device import (
+    AppletHandler,
+    AppletRouter,
+    SimulatedCommand,
+    SimulatedDevice,
+    SimulatedOutput,
+    canned_response,
+    route_by_command_type,
+)
+from .recording import (
+    RecordedEvent,
+    RecordedEventType,
+    Recording,
+    RecordingConnection,
+    ReplayConnection,
+    read_recording,
+)
+
+__all__ = [
+    "AppletHandler",
+    "AppletRouter",
+    "LinkStats",
+    "RecordedEvent",
+    "RecordedEventType",
+    "Recording",
+    "RecordingConnection",
+    "ReplayConnection",
+    "SimulatedCommand",
+    "SimulatedDevice",
+    "SimulatedDeviceConnection",
+    "SimulatedOutput",
+    "canned_response",
+    "read_recording",
+    "route_by_command_type",
+]
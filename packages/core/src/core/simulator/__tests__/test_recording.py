@@ -0,0 +1,144 @@
+import asyncio
+import time
+
+import pytest
+from interfaces import DeviceState
+from interfaces.__mocks__.connection import MockDeviceConnection
+from core.operations.raw import send_command, wait_for_command_output
+from core.simulator import (
+    RecordedEventType,
+    RecordingConnection,
+    ReplayConnection,
+    SimulatedDevice,
+    SimulatedDeviceConnection,
+    read_recording,
+)
+from core.utils.packetversion import PacketVersionMap
+
+ECHO_COMMAND = 12
+ECHO_DATA = bytes(range(150)).hex()
+
+
+def echo(command):
+    return {"raw_data": command["raw_data"]}
+
+
+async def run_echo(connection) -> str:
+    await connection.before_operation()
+    sequence_number = await connection.get_new_sequence_number()
+    await send_command(
+        connection=connection,
+        command_type=ECHO_COMMAND,
+        data=ECHO_DATA,
+        version=PacketVersionMap.v3,
+        sequence_number=sequence_number,
+    )
+    output = await wait_for_command_output(
+        connection=connection,
+        sequence_number=sequence_number,
+        expected_command_types=[ECHO_COMMAND],
+        options={"interval": 1},
+        version=PacketVersionMap.v3,
+    )
+    await connection.after_operation()
+    return output["data"]
+
+
+async def record_echo(path, latency: float = 0.0) -> None:
+    simulated_connection = SimulatedDeviceConnection(
+        SimulatedDevice({ECHO_COMMAND: echo}), latency=latency
+    )
+    connection = await RecordingConnection.create(simulated_connection, path)
+    assert await connection.get_device_state() == DeviceState.MAIN
+    for _ in range(2):
+        assert await run_echo(connection) == ECHO_DATA
+    await connection.destroy()
+
+
+class TestRecordingConnection:
+    def test_should_record_the_session(self, tmp_path):
+        path = tmp_path / "echo.x1rc"
+        asyncio.run(record_echo(path))
+
+        recording = read_recording(path)
+        assert recording["connection_type"] == "hid"
+
+        event_types = [event["type"] for event in recording["events"]]
+        assert event_types.count(RecordedEventType.SEQUENCE_NUMBER) == 2
+        assert event_types.count(RecordedEventType.DEVICE_STATE) == 1
+        assert event_types.count(RecordedEventType.SEND) > 0
+        assert event_types.count(RecordedEventType.RECEIVE) > 0
+
+        times = [event["time"] for event in recording["events"]]
+        assert times == sorted(times)
+
+    def test_should_record_peeked_data_once(self, tmp_path):
+        async def run_test():
+            path = tmp_path / "peek.x1rc"
+            mock_connection = await MockDeviceConnection.create()
+            connection = await RecordingConnection.create(mock_connection, path)
+
+            await mock_connection.mock_device_send(b"\x01")
+            await mock_connection.mock_device_send(b"\x02")
+            assert len(await connection.peek()) == 2
+            assert len(await connection.peek_since(0)) == 1
+            assert await connection.receive() == b"\x01"
+            assert await connection.receive() == b"\x02"
+            await connection.destroy()
+
+            events = read_recording(path)["events"]
+            assert [event["data"] for event in events] == [b"\x01", b"\x02"]
+
+        asyncio.run(run_test())
+
+    def test_should_reject_invalid_files(self, tmp_path):
+        path = tmp_path / "invalid.x1rc"
+        path.write_bytes(b"not a recording")
+        with pytest.raises(ValueError):
+            read_recording(path)
+
+
+class TestReplayConnection:
+    def test_should_replay_the_session(self, tmp_path):
+        path = tmp_path / "echo.x1rc"
+        asyncio.run(record_echo(path))
+
+        async def run_test():
+            connection = await ReplayConnection.create(path, realtime=False)
+            assert await connection.get_device_state() == DeviceState.MAIN
+            for _ in range(2):
+                assert await run_echo(connection) == ECHO_DATA
+            assert connection.mismatched_sends == 0
+            assert connection.unmatched_sends == 0
+
+        asyncio.run(run_test())
+
+    def test_should_replay_at_recorded_speed(self, tmp_path):
+        path = tmp_path / "echo.x1rc"
+        asyncio.run(record_echo(path, latency=0.002))
+
+        async def replay(realtime: bool) -> float:
+            connection = await ReplayConnection.create(path, realtime=realtime)
+            start = time.perf_counter()
+            for _ in range(2):
+                assert await run_echo(connection) == ECHO_DATA
+            return time.perf_counter() - start
+
+        realtime_duration = asyncio.run(replay(True))
+        fast_duration = asyncio.run(replay(False))
+        assert realtime_duration > fast_duration
+
+    def test_should_reject_different_writes_when_strict(self, tmp_path):
+        path = tmp_path / "echo.x1rc"
+        asyncio.run(record_echo(path))
+
+        async def run_test():
+            connection = await ReplayConnection.create(path, strict=True)
+            with pytest.raises(ValueError):
+                await connection.send(b"\x00")
+
+        asyncio.run(run_test())
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
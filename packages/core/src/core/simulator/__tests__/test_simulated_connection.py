@@ -0,0 +1,175 @@
+import asyncio
+
+import pytest
+from interfaces import (
+    IBatchDeviceConnection,
+    IDeviceConnection,
+    IPeekableDeviceConnection,
+    IReadableDeviceConnection,
+)
+from core.encoders.raw import CmdState, DeviceIdleState
+from core.operations.raw import (
+    get_status,
+    send_abort,
+    send_command,
+    wait_for_command_output,
+)
+from core.simulator import (
+    SimulatedDevice,
+    SimulatedDeviceConnection,
+    canned_response,
+)
+from core.utils.packetversion import PacketVersionMap
+
+ECHO_COMMAND = 12
+# Spans several 48 byte chunks in both directions
+ECHO_DATA = bytes(range(150)).hex()
+
+
+def echo(command):
+    return {"raw_data": command["raw_data"]}
+
+
+async def run_echo(connection: SimulatedDeviceConnection, timeout=None):
+    sequence_number = await connection.get_new_sequence_number()
+    await send_command(
+        connection=connection,
+        command_type=ECHO_COMMAND,
+        data=ECHO_DATA,
+        version=PacketVersionMap.v3,
+        sequence_number=sequence_number,
+        timeout=timeout,
+    )
+    return await wait_for_command_output(
+        connection=connection,
+        sequence_number=sequence_number,
+        expected_command_types=[ECHO_COMMAND],
+        options={"interval": 1, "timeout": timeout},
+        version=PacketVersionMap.v3,
+    )
+
+
+class TestSimulatedDeviceConnection:
+    def test_should_implement_the_connection_protocols(self):
+        connection = SimulatedDeviceConnection()
+        assert isinstance(connection, IDeviceConnection)
+        assert isinstance(connection, IReadableDeviceConnection)
+        assert isinstance(connection, IPeekableDeviceConnection)
+        assert isinstance(connection, IBatchDeviceConnection)
+
+    def test_should_run_a_multi_packet_command(self):
+        async def run_test():
+            connection = SimulatedDeviceConnection(
+                SimulatedDevice({ECHO_COMMAND: echo})
+            )
+
+            for _ in range(3):
+                output = await run_echo(connection)
+                assert output["commandType"] == ECHO_COMMAND
+                assert output["data"] == ECHO_DATA
+
+        asyncio.run(run_test())
+
+    def test_should_report_execution_in_the_status(self):
+        async def run_test():
+            device = SimulatedDevice(
+                {ECHO_COMMAND: canned_response(raw_data=b"\x00\x00\x00\x0c\x01")},
+                execution_time=0.05,
+            )
+            connection = SimulatedDeviceConnection(device, latency=0.001)
+            sequence_number = await connection.get_new_sequence_number()
+            await send_command(
+                connection=connection,
+                command_type=ECHO_COMMAND,
+                data="00",
+                version=PacketVersionMap.v3,
+                sequence_number=sequence_number,
+            )
+
+            status = await get_status(connection, PacketVersionMap.v3)
+            assert status["currentCmdSeq"] == sequence_number
+            assert status["cmdState"] == CmdState.CMD_STATE_EXECUTING
+            assert status["deviceIdleState"] == DeviceIdleState.USB
+
+            statuses = []
+            output = await wait_for_command_output(
+                connection=connection,
+                sequence_number=sequence_number,
+                expected_command_types=[ECHO_COMMAND],
+                on_status=statuses.append,
+                options={"interval": 5},
+                version=PacketVersionMap.v3,
+            )
+            assert output["data"] == "01"
+            assert len(statuses) > 0
+
+            status = await get_status(connection, PacketVersionMap.v3)
+            assert status["cmdState"] == CmdState.CMD_STATE_DONE
+            assert status["deviceIdleState"] == DeviceIdleState.IDLE
+
+        asyncio.run(run_test())
+
+    def test_should_abort_the_running_command(self):
+        async def run_test():
+            device = SimulatedDevice({ECHO_COMMAND: echo}, execution_time=10)
+            connection = SimulatedDeviceConnection(device)
+            await send_command(
+                connection=connection,
+                command_type=ECHO_COMMAND,
+                data="00",
+                version=PacketVersionMap.v3,
+                sequence_number=await connection.get_new_sequence_number(),
+            )
+
+            sequence_number = await connection.get_new_sequence_number()
+            status = await send_abort(
+                connection=connection,
+                version=PacketVersionMap.v3,
+                sequence_number=sequence_number,
+            )
+            assert status["currentCmdSeq"] == sequence_number
+            assert status["cmdState"] == CmdState.CMD_STATE_NONE
+
+        asyncio.run(run_test())
+
+    def test_should_fail_commands_without_a_handler(self):
+        async def run_test():
+            connection = SimulatedDeviceConnection()
+            with pytest.raises(Exception, match="no output"):
+                await run_echo(connection)
+
+        asyncio.run(run_test())
+
+    def test_should_recover_from_lost_and_corrupted_packets(self):
+        async def run_test():
+            connection = SimulatedDeviceConnection(
+                SimulatedDevice({ECHO_COMMAND: echo}),
+                latency=0.0005,
+                jitter=0.0005,
+                loss_rate=0.05,
+                corruption_rate=0.05,
+                seed=7,
+            )
+
+            for _ in range(5):
+                output = await run_echo(connection, timeout=50)
+                assert output["data"] == ECHO_DATA
+
+            assert connection.stats["lost"] > 0
+            assert connection.stats["corrupted"] > 0
+
+        asyncio.run(run_test())
+
+    def test_should_keep_packets_in_order_with_jitter(self):
+        async def run_test():
+            connection = SimulatedDeviceConnection(
+                SimulatedDevice({ECHO_COMMAND: echo}), latency=0.001, jitter=0.005
+            )
+            output = await run_echo(connection)
+            assert output["data"] == ECHO_DATA
+
+        asyncio.run(run_test())
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
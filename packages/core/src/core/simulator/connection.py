@@ -0,0 +1,177 @@
+import asyncio
+import random
+from typing import Callable, List, Optional, Sequence, Tuple, TypedDict
+from interfaces import ConnectionTypeMap, DeviceState, PoolData
+from interfaces.errors import DeviceConnectionError, DeviceConnectionErrorType
+from util.utils import FramePool, ReadableSignal
+from .device import SimulatedDevice
+
+
+class LinkStats(TypedDict):
+    sent: int
+    received: int
+    lost: int
+    corrupted: int
+
+
+class SimulatedDeviceConnection:
+    """
+    In-process connection to a `SimulatedDevice`.
+
+    Every packet crosses a simulated link in each direction: it is delayed
+    by `latency` plus up to `jitter` seconds, lost with probability
+    `loss_rate` and has one byte flipped with probability
+    `corruption_rate`. Packets keep their order in each direction, as on
+    USB. Pass a `seed` to get the same losses and corruptions on every run.
+
+    Delays are event loop timers, so they are rounded up to the timer
+    resolution of the loop, about a millisecond with epoll.
+    """
+
+    def __init__(
+        self,
+        device: Optional[SimulatedDevice] = None,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        loss_rate: float = 0.0,
+        corruption_rate: float = 0.0,
+        seed: Optional[int] = None,
+        device_state: DeviceState = DeviceState.MAIN,
+        connection_type: str = ConnectionTypeMap.HID.value,
+        serial: Optional[str] = None,
+    ):
+        self.device = device or SimulatedDevice()
+        self.latency = latency
+        self.jitter = jitter
+        self.loss_rate = loss_rate
+        self.corruption_rate = corruption_rate
+        self.device_state = device_state
+        self.connection_type = connection_type
+        self.serial = serial
+        self.sequence_number = 0
+        self.is_destroyed = False
+        self.pool = FramePool()
+        self.readable = ReadableSignal()
+        self.stats = LinkStats(sent=0, received=0, lost=0, corrupted=0)
+        self._random = random.Random(seed)
+        # Arrival time of the last packet scheduled on the host and device side
+        self._host_arrival = 0.0
+        self._device_arrival = 0.0
+
+    @classmethod
+    async def create(cls, *args, **kwargs) -> "SimulatedDeviceConnection":
+        return cls(*args, **kwargs)
+
+    async def get_connection_type(self) -> str:
+        return self.connection_type
+
+    async def is_connected(self) -> bool:
+        return not self.is_destroyed
+
+    async def before_operation(self) -> None:
+        pass
+
+    async def after_operation(self) -> None:
+        pass
+
+    async def get_sequence_number(self) -> int:
+        return self.sequence_number
+
+    async def get_new_sequence_number(self) -> int:
+        self.sequence_number += 1
+        return self.sequence_number
+
+    async def get_device_state(self) -> DeviceState:
+        return self.device_state
+
+    async def get_device_serial(self) -> Optional[str]:
+        return self.serial
+
+    async def destroy(self) -> None:
+        self.is_destroyed = True
+        self.pool.close()
+        self.readable.notify()
+
+    async def send(self, data: bytes) -> None:
+        if self.is_destroyed:
+            raise DeviceConnectionError(DeviceConnectionErrorType.CONNECTION_CLOSED)
+
+        self.stats["sent"] += 1
+        packet = self._impair(data)
+        if packet is None:
+            return
+
+        delay, self._device_arrival = self._schedule(self._device_arrival)
+        self._deliver(delay, self._on_device_receive, packet)
+
+    async def send_many(self, packets: Sequence[bytes]) -> None:
+        for packet in packets:
+            await self.send(packet)
+
+    async def receive(self) -> Optional[bytes]:
+        return self.pool.get()
+
+    async def wait_readable(self, timeout: Optional[float] = None) -> bool:
+        return await self.readable.wait(
+            lambda: len(self.pool) > 0 or self.is_destroyed, timeout
+        )
+
+    async def peek(self) -> List[PoolData]:
+        return self.pool.peek()
+
+    async def peek_since(self, last_id: int) -> List[PoolData]:
+        return self.pool.peek_since(last_id)
+
+    def _on_device_receive(self, packet: bytes) -> None:
+        if self.is_destroyed:
+            return
+
+        for reply in self.device.handle(packet):
+            reply = self._impair(reply)
+            if reply is None:
+                continue
+
+            delay, self._host_arrival = self._schedule(self._host_arrival)
+            self._deliver(delay, self._on_host_receive, reply)
+
+    def _on_host_receive(self, packet: bytes) -> None:
+        if self.is_destroyed:
+            return
+
+        self.stats["received"] += 1
+        self.pool.put(packet)
+        self.readable.notify()
+
+    def _impair(self, packet: bytes) -> Optional[bytes]:
+        """Apply loss and corruption, None if the packet is lost."""
+        if self.loss_rate and self._random.random() < self.loss_rate:
+            self.stats["lost"] += 1
+            return None
+
+        if self.corruption_rate and self._random.random() < self.corruption_rate:
+            self.stats["corrupted"] += 1
+            corrupted = bytearray(packet)
+            corrupted[self._random.randrange(len(corrupted))] ^= 0xFF
+            return bytes(corrupted)
+
+        return packet
+
+    def _schedule(self, last_arrival: float) -> Tuple[float, float]:
+        """Get the delay of the next packet and its arrival time."""
+        if not self.latency and not self.jitter:
+            return 0.0, last_arrival
+
+        now = asyncio.get_running_loop().time()
+        arrival = now + self.latency + self._random.uniform(0, self.jitter)
+        # A packet never overtakes the one sent before it
+        arrival = max(arrival, last_arrival)
+        return arrival - now, arrival
+
+    @staticmethod
+    def _deliver(
+        delay: float, callback: Callable[[bytes], None], packet: bytes
+    ) -> None:
+        if delay <= 0:
+            callback(packet)
+        else:
+            asyncio.get_running_loop().call_later(delay, callback, packet)
@@ -0,0 +1,272 @@
+import struct
+import time
+from typing import Callable, Dict, List, Optional, TypedDict
+from core.config import v3
+from ..encoders.packet.codec import (
+    BytesLike,
+    DecodedFrame,
+    decode_frames,
+    encode_frames,
+    struct_layout,
+)
+from ..encoders.packet.packet import ErrorPacketRejectReason
+from ..encoders.packet.reassembly import PayloadReassembler, decode_payload
+from ..encoders.raw import STATUS_STRUCT, CmdState, DeviceIdleState, DeviceWaitOn
+
+PACKET_TYPE = v3.commands.PACKET_TYPE
+COMMAND_TYPE_STRUCT = struct_layout(v3.radix.command_type)
+CHUNK_NUMBER_STRUCT = struct_layout(v3.radix.current_packet_number)
+REJECT_REASON_STRUCT = struct_layout(8)
+
+
+class SimulatedCommand(TypedDict):
+    sequence_number: int
+    protobuf_data: bytes
+    raw_data: bytes
+
+
+class SimulatedOutput(TypedDict, total=False):
+    protobuf_data: bytes
+    raw_data: bytes
+
+
+AppletHandler = Callable[[SimulatedCommand], Optional[SimulatedOutput]]
+AppletRouter = Callable[[SimulatedCommand], int]
+
+
+def route_by_command_type(command: SimulatedCommand) -> int:
+    """Route a command on the command type leading its raw data, 0 if absent."""
+    raw_data = command["raw_data"]
+    if len(raw_data) < COMMAND_TYPE_STRUCT.size:
+        return 0
+    return COMMAND_TYPE_STRUCT.unpack_from(raw_data)[0]
+
+
+def canned_response(
+    protobuf_data: BytesLike = b"", raw_data: BytesLike = b""
+) -> AppletHandler:
+    """Create a handler answering every command with the same output."""
+    output = SimulatedOutput(
+        protobuf_data=bytes(protobuf_data), raw_data=bytes(raw_data)
+    )
+    return lambda command: output
+
+
+class SimulatedDevice:
+    """
+    Device side of the v3 packet protocol.
+
+    Takes the packets written by the host and returns the packets the device
+    answers with: a CMD_ACK for every CMD chunk, a STATUS for STATUS_REQ and
+    ABORT, the requested CMD_OUTPUT chunk once the command has run, and an
+    ERROR for packets the firmware would reject.
+
+    A complete command is passed to the applet handler picked by `router`. A
+    command without a handler ends in `CMD_STATE_INVALID_CMD`. The output is
+    only served `execution_time` seconds after the last chunk arrived; until
+    then output requests are answered with a STATUS packet.
+    """
+
+    def __init__(
+        self,
+        handlers: Optional[Dict[int, AppletHandler]] = None,
+        router: AppletRouter = route_by_command_type,
+        execution_time: float = 0.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.handlers: Dict[int, AppletHandler] = dict(handlers or {})
+        self.router = router
+        self.execution_time = execution_time
+        self.clock = clock
+        self.abort_disabled = False
+        self.flow_status = 0
+        self.current_cmd_seq = 0
+        self.cmd_state = CmdState.CMD_STATE_NONE
+        self._reassembler = PayloadReassembler()
+        self._next_chunk = 1
+        self._output_packets: List[bytes] = []
+        self._ready_at = 0.0
+
+    def register_handler(self, applet_id: int, handler: AppletHandler) -> None:
+        self.handlers[applet_id] = handler
+
+    def handle(self, data: BytesLike) -> List[bytes]:
+        """
+        Process the bytes of a host write.
+
+        Args:
+            data: Bytes written by the host
+
+        Returns:
+            List[bytes]: Packets sent back to the host, in order
+        """
+        replies: List[bytes] = []
+        for frame in decode_frames(data):
+            replies.extend(self._handle_frame(frame))
+        return replies
+
+    def _handle_frame(self, frame: DecodedFrame) -> List[bytes]:
+        sequence_number = frame["sequence_number"]
+
+        if len(frame["error_list"]) != 0:
+            return self._error(sequence_number, ErrorPacketRejectReason.CHECKSUM_ERROR)
+
+        packet_type = frame["packet_type"]
+        if packet_type == PACKET_TYPE.STATUS_REQ:
+            return [self._status(sequence_number)]
+        if packet_type == PACKET_TYPE.CMD:
+            return self._on_command_chunk(frame)
+        # The helpers request output with the CMD_OUTPUT type
+        if packet_type in [PACKET_TYPE.CMD_OUTPUT_REQ, PACKET_TYPE.CMD_OUTPUT]:
+            return self._on_output_request(frame)
+        if packet_type == PACKET_TYPE.ABORT:
+            return self._on_abort(sequence_number)
+
+        return self._error(sequence_number, ErrorPacketRejectReason.INVALID_PACKET_TYPE)
+
+    def _on_command_chunk(self, frame: DecodedFrame) -> List[bytes]:
+        sequence_number = frame["sequence_number"]
+        current_packet_number = frame["current_packet_number"]
+        total_packet_number = frame["total_packet_number"]
+
+        if sequence_number != self.current_cmd_seq:
+            if self.cmd_state == CmdState.CMD_STATE_EXECUTING and not self._is_ready():
+                return self._error(
+                    sequence_number, ErrorPacketRejectReason.BUSY_PREVIOUS_CMD
+                )
+            if current_packet_number != 1:
+                return self._error(
+                    sequence_number, ErrorPacketRejectReason.OUT_OF_ORDER_CHUNK
+                )
+            self._start_command(sequence_number)
+        elif (
+            self.cmd_state != CmdState.CMD_STATE_RECEIVING
+            or current_packet_number < self._next_chunk
+        ):
+            # The ack of a received chunk was lost and the host sends it again
+            return [self._ack(sequence_number)]
+
+        if current_packet_number > self._next_chunk:
+            return self._error(
+                sequence_number, ErrorPacketRejectReason.OUT_OF_ORDER_CHUNK
+            )
+
+        self._reassembler.add_chunk(
+            current_packet_number, total_packet_number, frame["payload_data"]
+        )
+        self._next_chunk += 1
+        if self._reassembler.is_complete():
+            self._execute(sequence_number)
+
+        return [self._ack(sequence_number)]
+
+    def _start_command(self, sequence_number: int) -> None:
+        self.current_cmd_seq = sequence_number
+        self.cmd_state = CmdState.CMD_STATE_RECEIVING
+        self._reassembler = PayloadReassembler()
+        self._next_chunk = 1
+        self._output_packets = []
+
+    def _execute(self, sequence_number: int) -> None:
+        protobuf_data, raw_data = self._reassembler.get_sections()
+        command = SimulatedCommand(
+            sequence_number=sequence_number,
+            protobuf_data=bytes(protobuf_data),
+            raw_data=bytes(raw_data),
+        )
+
+        handler = self.handlers.get(self.router(command))
+        output = handler(command) if handler else None
+        if output is None:
+            self.cmd_state = CmdState.CMD_STATE_INVALID_CMD
+            return
+
+        self.cmd_state = CmdState.CMD_STATE_EXECUTING
+        self._ready_at = self.clock() + self.execution_time
+        self._output_packets = encode_frames(
+            raw_data=output.get("raw_data", b""),
+            proto_data=output.get("protobuf_data", b""),
+            sequence_number=sequence_number,
+            packet_type=PACKET_TYPE.CMD_OUTPUT,
+        )
+
+    def _is_ready(self) -> bool:
+        return self.clock() >= self._ready_at
+
+    def _on_output_request(self, frame: DecodedFrame) -> List[bytes]:
+        sequence_number = frame["sequence_number"]
+        if (
+            sequence_number != self.current_cmd_seq
+            or self.cmd_state != CmdState.CMD_STATE_EXECUTING
+            or not self._is_ready()
+        ):
+            return [self._status(sequence_number)]
+
+        _, raw_data = decode_payload(frame["payload_data"])
+        try:
+            (chunk_number,) = CHUNK_NUMBER_STRUCT.unpack_from(raw_data)
+        except struct.error:
+            chunk_number = 0
+
+        if not 1 <= chunk_number <= len(self._output_packets):
+            return self._error(
+                sequence_number, ErrorPacketRejectReason.INVALID_CHUNK_NO
+            )
+        return [self._output_packets[chunk_number - 1]]
+
+    def _on_abort(self, sequence_number: int) -> List[bytes]:
+        if not self.abort_disabled:
+            self.current_cmd_seq = sequence_number
+            self.cmd_state = CmdState.CMD_STATE_NONE
+            self._reassembler = PayloadReassembler()
+            self._next_chunk = 1
+            self._output_packets = []
+        return [self._status(sequence_number)]
+
+    def get_status_data(self) -> bytes:
+        """Serialize the status the way `decode_status` reads it."""
+        cmd_state = self.cmd_state
+        if cmd_state == CmdState.CMD_STATE_EXECUTING and self._is_ready():
+            cmd_state = CmdState.CMD_STATE_DONE
+
+        if cmd_state in [CmdState.CMD_STATE_RECEIVING, CmdState.CMD_STATE_EXECUTING]:
+            idle_state, waiting_on = DeviceIdleState.USB, DeviceWaitOn.NONE
+        else:
+            idle_state, waiting_on = DeviceIdleState.IDLE, DeviceWaitOn.IDLE
+
+        return STATUS_STRUCT.pack(
+            (waiting_on << 4) | idle_state,
+            1 if self.abort_disabled else 0,
+            self.current_cmd_seq,
+            cmd_state,
+            self.flow_status,
+        )
+
+    def _status(self, sequence_number: int) -> bytes:
+        return self._single_packet(
+            PACKET_TYPE.STATUS, sequence_number, self.get_status_data()
+        )
+
+    def _ack(self, sequence_number: int) -> bytes:
+        return self._single_packet(PACKET_TYPE.CMD_ACK, sequence_number)
+
+    def _error(
+        self, sequence_number: int, reason: ErrorPacketRejectReason
+    ) -> List[bytes]:
+        return [
+            self._single_packet(
+                PACKET_TYPE.ERROR,
+                sequence_number,
+                REJECT_REASON_STRUCT.pack(reason.value),
+            )
+        ]
+
+    @staticmethod
+    def _single_packet(
+        packet_type: int, sequence_number: int, raw_data: bytes = b""
+    ) -> bytes:
+        return encode_frames(
+            raw_data=raw_data,
+            sequence_number=sequence_number,
+            packet_type=packet_type,
+        )[0]
@@ -0,0 +1,395 @@
+import asyncio
+import os
+import struct
+import time
+from collections import deque
+from enum import IntEnum
+from typing import BinaryIO, Deque, List, Optional, Tuple, TypedDict, Union
+from interfaces import (
+    DeviceState,
+    IDeviceConnection,
+    IIdentifiableDeviceConnection,
+    IPeekableDeviceConnection,
+    IReadableDeviceConnection,
+    PoolData,
+)
+from interfaces.errors import DeviceConnectionError, DeviceConnectionErrorType
+from util.utils import FramePool, ReadableSignal
+from core.config import v3
+
+MAGIC = b"X1RC"
+FORMAT_VERSION = 1
+HEADER_STRUCT = struct.Struct(">4sBB")
+EVENT_STRUCT = struct.Struct(">BdI")
+SEQUENCE_NUMBER_STRUCT = struct.Struct(">i")
+
+PathLike = Union[str, "os.PathLike[str]"]
+
+
+class RecordedEventType(IntEnum):
+    SEND = 1
+    RECEIVE = 2
+    SEQUENCE_NUMBER = 3
+    DEVICE_STATE = 4
+
+
+class RecordedEvent(TypedDict):
+    type: RecordedEventType
+    # Seconds since the recording started, from a monotonic clock
+    time: float
+    data: bytes
+
+
+class Recording(TypedDict):
+    connection_type: str
+    events: List[RecordedEvent]
+
+
+def write_recording_header(file: BinaryIO, connection_type: str) -> None:
+    encoded_type = connection_type.encode()
+    file.write(HEADER_STRUCT.pack(MAGIC, FORMAT_VERSION, len(encoded_type)))
+    file.write(encoded_type)
+
+
+def write_recorded_event(file: BinaryIO, event: RecordedEvent) -> None:
+    file.write(EVENT_STRUCT.pack(event["type"], event["time"], len(event["data"])))
+    file.write(event["data"])
+
+
+def read_recording(path: PathLike) -> Recording:
+    """
+    Read a session written by `RecordingConnection`.
+
+    Args:
+        path: Recording file
+
+    Returns:
+        Recording: Connection type and events in recorded order
+    """
+    with open(path, "rb") as file:
+        data = file.read()
+
+    if len(data) < HEADER_STRUCT.size:
+        raise ValueError("Recording is too short")
+    magic, version, type_length = HEADER_STRUCT.unpack_from(data)
+    if magic != MAGIC or version != FORMAT_VERSION:
+        raise ValueError("Not a device connection recording")
+
+    offset = HEADER_STRUCT.size
+    connection_type = data[offset : offset + type_length].decode()
+    offset += type_length
+
+    events: List[RecordedEvent] = []
+    while offset < len(data):
+        if offset + EVENT_STRUCT.size > len(data):
+            raise ValueError("Recording ends in the middle of an event")
+        event_type, event_time, length = EVENT_STRUCT.unpack_from(data, offset)
+        offset += EVENT_STRUCT.size
+        if offset + length > len(data):
+            raise ValueError("Recording ends in the middle of an event")
+        events.append(
+            RecordedEvent(
+                type=RecordedEventType(event_type),
+                time=event_time,
+                data=data[offset : offset + length],
+            )
+        )
+        offset += length
+
+    return Recording(connection_type=connection_type, events=events)
+
+
+class RecordingConnection:
+    """
+    Wraps a connection and records its traffic into a binary file.
+
+    Every written packet and every non-empty read is stored with the
+    monotonic time since the recording started, together with the sequence
+    numbers handed out and the device states reported, so `ReplayConnection`
+    can play the session back to the same SDK calls. Data first seen through
+    `peek` is recorded once, not again when it is received.
+
+    Create it with `create`, which writes the file header, and `destroy` or
+    `close` it to flush the file.
+    """
+
+    def __init__(self, connection: IDeviceConnection, file: BinaryIO):
+        self.connection = connection
+        self.file = file
+        self.start_time = time.monotonic()
+        self._last_device_state: Optional[DeviceState] = None
+        self._peeked: Deque[bytes] = deque()
+        self._last_peeked_id = -1
+
+    @classmethod
+    async def create(
+        cls, connection: IDeviceConnection, path: PathLike
+    ) -> "RecordingConnection":
+        file = open(path, "wb")
+        write_recording_header(file, await connection.get_connection_type())
+        return cls(connection, file)
+
+    def close(self) -> None:
+        if not self.file.closed:
+            self.file.close()
+
+    def _record(self, event_type: RecordedEventType, data: bytes) -> None:
+        if self.file.closed:
+            return
+
+        write_recorded_event(
+            self.file,
+            RecordedEvent(
+                type=event_type,
+                time=time.monotonic() - self.start_time,
+                data=bytes(data),
+            ),
+        )
+
+    async def get_connection_type(self) -> str:
+        return await self.connection.get_connection_type()
+
+    async def is_connected(self) -> bool:
+        return await self.connection.is_connected()
+
+    async def before_operation(self) -> None:
+        await self.connection.before_operation()
+
+    async def after_operation(self) -> None:
+        await self.connection.after_operation()
+
+    async def get_sequence_number(self) -> int:
+        return await self.connection.get_sequence_number()
+
+    async def get_new_sequence_number(self) -> int:
+        sequence_number = await self.connection.get_new_sequence_number()
+        self._record(
+            RecordedEventType.SEQUENCE_NUMBER,
+            SEQUENCE_NUMBER_STRUCT.pack(sequence_number),
+        )
+        return sequence_number
+
+    async def get_device_state(self) -> DeviceState:
+        device_state = await self.connection.get_device_state()
+        if device_state != self._last_device_state:
+            self._last_device_state = device_state
+            self._record(RecordedEventType.DEVICE_STATE, bytes([device_state.value]))
+        return device_state
+
+    async def get_device_serial(self) -> Optional[str]:
+        if isinstance(self.connection, IIdentifiableDeviceConnection):
+            return await self.connection.get_device_serial()
+        return None
+
+    async def destroy(self) -> None:
+        try:
+            await self.connection.destroy()
+        finally:
+            self.close()
+
+    async def send(self, data: bytes) -> None:
+        self._record(RecordedEventType.SEND, data)
+        await self.connection.send(data)
+
+    async def receive(self) -> Optional[bytes]:
+        data = await self.connection.receive()
+        if not data:
+            return data
+
+        # The pool is FIFO, so a received packet that was peeked is the oldest
+        if self._peeked and self._peeked[0] == data:
+            self._peeked.popleft()
+        else:
+            self._record(RecordedEventType.RECEIVE, data)
+        return data
+
+    async def wait_readable(self, timeout: Optional[float] = None) -> bool:
+        if isinstance(self.connection, IReadableDeviceConnection):
+            return await self.connection.wait_readable(timeout)
+
+        recheck_time = v3.constants.RECHECK_TIME / 1000
+        await asyncio.sleep(
+            recheck_time if timeout is None else min(timeout, recheck_time)
+        )
+        return False
+
+    async def peek(self) -> List[PoolData]:
+        return self._record_peeked(await self.connection.peek())
+
+    async def peek_since(self, last_id: int) -> List[PoolData]:
+        if isinstance(self.connection, IPeekableDeviceConnection):
+            packets = await self.connection.peek_since(last_id)
+        else:
+            packets = [
+                packet
+                for packet in await self.connection.peek()
+                if packet["id"] > last_id
+            ]
+        return self._record_peeked(packets)
+
+    def _record_peeked(self, packets: List[PoolData]) -> List[PoolData]:
+        for packet in packets:
+            if packet["id"] > self._last_peeked_id:
+                self._last_peeked_id = packet["id"]
+                self._peeked.append(bytes(packet["data"]))
+                self._record(RecordedEventType.RECEIVE, packet["data"])
+        return packets
+
+
+class _Exchange:
+    __slots__ = ("data", "replies", "device_state")
+
+    def __init__(self, data: bytes):
+        self.data = data
+        # Delay since the write and data of every packet received after it
+        self.replies: List[Tuple[float, bytes]] = []
+        # Device state reported after the write, if it changed
+        self.device_state: Optional[DeviceState] = None
+
+
+class ReplayConnection:
+    """
+    Plays a recorded session back as a connection.
+
+    The packets received after a recorded write are the answer to it: each
+    one is delivered after the same delay from the matching replayed write as
+    in the recording, or at once with `realtime=False`. Replaying as fast as
+    possible leaves only the time spent in the SDK, and the difference to a
+    real time replay is the device and transport time.
+
+    Writes are matched to the recorded ones in order. Only their length is
+    compared, since v3 packets carry a timestamp; with `strict` the bytes
+    must be equal and a mismatch raises `ValueError`.
+    """
+
+    def __init__(
+        self,
+        recording: Recording,
+        realtime: bool = True,
+        strict: bool = False,
+    ):
+        self.connection_type = recording["connection_type"]
+        self.realtime = realtime
+        self.strict = strict
+        self.is_destroyed = False
+        self.pool = FramePool()
+        self.readable = ReadableSignal()
+        self.mismatched_sends = 0
+        self.unmatched_sends = 0
+
+        self._exchanges: Deque[_Exchange] = deque()
+        self._initial = _Exchange(b"")
+        self._sequence_numbers: Deque[int] = deque()
+        self.sequence_number = 0
+        self._load(recording["events"])
+        self.device_state = self._initial.device_state or DeviceState.MAIN
+        self._started = False
+
+    @classmethod
+    async def create(
+        cls, path: PathLike, realtime: bool = True, strict: bool = False
+    ) -> "ReplayConnection":
+        return cls(read_recording(path), realtime, strict)
+
+    def _load(self, events: List[RecordedEvent]) -> None:
+        exchange = self._initial
+        send_time = 0.0
+        for event in events:
+            if event["type"] == RecordedEventType.SEND:
+                exchange = _Exchange(event["data"])
+                send_time = event["time"]
+                self._exchanges.append(exchange)
+            elif event["type"] == RecordedEventType.RECEIVE:
+                exchange.replies.append(
+                    (max(event["time"] - send_time, 0.0), event["data"])
+                )
+            elif event["type"] == RecordedEventType.SEQUENCE_NUMBER:
+                (sequence_number,) = SEQUENCE_NUMBER_STRUCT.unpack(event["data"])
+                self._sequence_numbers.append(sequence_number)
+            elif event["type"] == RecordedEventType.DEVICE_STATE:
+                exchange.device_state = DeviceState(event["data"][0])
+
+    def _start(self) -> None:
+        # Packets received before the first write are delivered from the start
+        if not self._started:
+            self._started = True
+            self._schedule(self._initial.replies)
+
+    async def get_connection_type(self) -> str:
+        return self.connection_type
+
+    async def is_connected(self) -> bool:
+        return not self.is_destroyed
+
+    async def before_operation(self) -> None:
+        self._start()
+
+    async def after_operation(self) -> None:
+        pass
+
+    async def get_sequence_number(self) -> int:
+        return self.sequence_number
+
+    async def get_new_sequence_number(self) -> int:
+        if self._sequence_numbers:
+            self.sequence_number = self._sequence_numbers.popleft()
+        else:
+            self.sequence_number += 1
+        return self.sequence_number
+
+    async def get_device_state(self) -> DeviceState:
+        return self.device_state
+
+    async def destroy(self) -> None:
+        self.is_destroyed = True
+        self.pool.close()
+        self.readable.notify()
+
+    async def send(self, data: bytes) -> None:
+        if self.is_destroyed:
+            raise DeviceConnectionError(DeviceConnectionErrorType.CONNECTION_CLOSED)
+        self._start()
+
+        if not self._exchanges:
+            self.unmatched_sends += 1
+            return
+
+        exchange = self._exchanges.popleft()
+        if bytes(data) != exchange.data:
+            if self.strict:
+                raise ValueError("Replayed write differs from the recorded one")
+            if len(data) != len(exchange.data):
+                self.mismatched_sends += 1
+
+        if exchange.device_state is not None:
+            self.device_state = exchange.device_state
+        self._schedule(exchange.replies)
+
+    async def receive(self) -> Optional[bytes]:
+        return self.pool.get()
+
+    async def wait_readable(self, timeout: Optional[float] = None) -> bool:
+        return await self.readable.wait(
+            lambda: len(self.pool) > 0 or self.is_destroyed, timeout
+        )
+
+    async def peek(self) -> List[PoolData]:
+        return self.pool.peek()
+
+    async def peek_since(self, last_id: int) -> List[PoolData]:
+        return self.pool.peek_since(last_id)
+
+    def _schedule(self, replies: List[Tuple[float, bytes]]) -> None:
+        loop = asyncio.get_running_loop()
+        for delay, data in replies:
+            if self.realtime and delay > 0:
+                loop.call_later(delay, self._deliver, data)
+            else:
+                self._deliver(data)
+
+    def _deliver(self, data: bytes) -> None:
+        if self.is_destroyed:
+            return
+
+        self.pool.put(data)
+        self.readable.notify()
@@ -12,6 +12,7 @@ from typing import (
 from interfaces import DeviceState, IDeviceConnection
 from .utils.packetversion import PacketVersion
 from .encoders.raw.types import RawData, StatusData
+from .encoders.packet.codec import BytesLike
 from .encoders.proto.generated.core import AppVersionResultResponse
 from .encoders.proto.generated.common import Version
 
@@ -65,6 +66,11 @@ class IFeatureSupport(TypedDict):
     from_version: str
 
 
+class OperationContext(TypedDict):
+    device_state: DeviceState
+    is_supported: bool
+
+
 class ISDK(Protocol):
     deprecated: IDeprecatedCommunication
 
@@ -88,6 +94,8 @@ class ISDK(Protocol):
 
     async def destroy(self) -> None: ...
 
+    async def invalidate_capabilities(self) -> None: ...
+
     async def is_in_bootloader(self) -> bool: ...
 
     async def get_device_state(self) -> DeviceState: ...
@@ -148,7 +156,7 @@ class ISDK(Protocol):
 
     async def send_bootloader_data(
         self,
-        data: str,
+        data: Union[str, BytesLike],
         on_progress: Optional[Callable[[int], None]] = None,
         options: Optional[Dict[str, Any]] = None,
     ) -> None: ...
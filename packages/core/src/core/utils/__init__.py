@@ -1,4 +1,4 @@
-from .crypto import byte_stuffing, byte_unstuffing
+from .crypto import byte_stuffing, byte_unstuffing, stuff_bytes, unstuff_bytes
 from .logger import logger, update_logger
 from .sdk_version import (
     get_packet_version_from_sdk,
@@ -10,11 +10,21 @@ from .common_error import assert_or_throw_invalid_result, parse_common_error
 from .feature_map import FeatureName, is_feature_enabled
 from .http import http
 from .version_compare import compare_versions
+from .capability_cache import (
+    DEFAULT_CAPABILITY_TTL,
+    DeviceCapabilities,
+    DeviceCapabilityCache,
+    get_device_capability_cache,
+    set_device_capability_cache,
+    get_device_serial,
+)
 
 __all__ = [
     # Crypto utilities
     "byte_stuffing",
     "byte_unstuffing",
+    "stuff_bytes",
+    "unstuff_bytes",
     # Logger
     "logger",
     "update_logger",
@@ -36,4 +46,11 @@ __all__ = [
     "http",
     # Version comparison
     "compare_versions",
+    # Device capability cache
+    "DEFAULT_CAPABILITY_TTL",
+    "DeviceCapabilities",
+    "DeviceCapabilityCache",
+    "get_device_capability_cache",
+    "set_device_capability_cache",
+    "get_device_serial",
 ]
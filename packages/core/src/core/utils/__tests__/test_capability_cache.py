@@ -0,0 +1,107 @@
+import asyncio
+import pytest
+
+from util.utils import DeviceMonitor
+from core.simulator import SimulatedDeviceConnection
+from core.utils.capability_cache import (
+    DeviceCapabilities,
+    DeviceCapabilityCache,
+    get_device_serial,
+)
+from core.utils.packetversion import PacketVersionMap
+
+CAPABILITIES = DeviceCapabilities(
+    sdk_version="3.0.1",
+    packet_version=PacketVersionMap.v3,
+    app_versions=None,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestDeviceCapabilityCache:
+    def test_should_return_stored_capabilities(self):
+        cache = DeviceCapabilityCache()
+        cache.set("serial-1", CAPABILITIES)
+
+        assert cache.get("serial-1") == CAPABILITIES
+        assert cache.get("serial-2") is None
+
+    def test_should_expire_after_ttl(self):
+        clock = FakeClock()
+        cache = DeviceCapabilityCache(ttl=10, clock=clock)
+        cache.set("serial-1", CAPABILITIES)
+
+        clock.now = 9.9
+        assert cache.get("serial-1") is not None
+        clock.now = 10
+        assert cache.get("serial-1") is None
+        assert len(cache) == 0
+
+    def test_should_add_app_versions_to_cached_devices_only(self):
+        cache = DeviceCapabilityCache()
+        cache.set("serial-1", CAPABILITIES)
+
+        cache.set_app_versions("serial-1", ["app"])
+        cache.set_app_versions("serial-2", ["app"])
+
+        assert cache.get("serial-1")["app_versions"] == ["app"]
+        assert cache.get("serial-2") is None
+        assert CAPABILITIES["app_versions"] is None
+
+    def test_should_forget_invalidated_devices(self):
+        cache = DeviceCapabilityCache()
+        cache.set("serial-1", CAPABILITIES)
+        cache.set("serial-2", CAPABILITIES)
+
+        cache.invalidate("serial-1")
+        assert cache.get("serial-1") is None
+        assert cache.get("serial-2") is not None
+
+        cache.clear()
+        assert len(cache) == 0
+
+    def test_should_forget_unplugged_devices(self):
+        devices = [
+            {"path": "a", "serial": "serial-1"},
+            {"path": "b", "serial": "serial-2"},
+        ]
+        device_monitor = DeviceMonitor(interval=60, use_udev=False)
+        device_monitor.register_source("fake", lambda: list(devices))
+        cache = DeviceCapabilityCache(device_monitor=device_monitor)
+        try:
+            cache.set("serial-1", CAPABILITIES, "fake")
+            cache.set("serial-2", CAPABILITIES, "fake")
+            device_monitor.poll()
+
+            devices.pop(0)
+            device_monitor.poll()
+
+            assert cache.get("serial-1") is None
+            assert cache.get("serial-2") is not None
+        finally:
+            cache.clear()
+
+    def test_should_ignore_unregistered_sources(self):
+        cache = DeviceCapabilityCache(device_monitor=DeviceMonitor(use_udev=False))
+        cache.set("serial-1", CAPABILITIES, "unknown")
+
+        assert cache.get("serial-1") is not None
+
+    def test_should_read_serial_of_identifiable_connections(self):
+        async def _test():
+            connection = SimulatedDeviceConnection(serial="serial-1")
+            assert await get_device_serial(connection) == "serial-1"
+            assert await get_device_serial(object()) is None
+
+        asyncio.run(_test())
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
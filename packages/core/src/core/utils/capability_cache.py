@@ -0,0 +1,162 @@
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple, TypedDict
+from interfaces import IDeviceConnection, IIdentifiableDeviceConnection
+from util.utils import DeviceEvent, DeviceMonitor, get_device_monitor
+from .packetversion import PacketVersion
+
+# Seconds a device's capabilities are trusted without asking it again
+DEFAULT_CAPABILITY_TTL = 10 * 60
+
+
+class DeviceCapabilities(TypedDict):
+    sdk_version: str
+    packet_version: Optional[PacketVersion]
+    # AppVersionResultResponse, once an SDK asked the device for it
+    app_versions: Optional[Any]
+
+
+class DeviceCapabilityCache:
+    """
+    Capabilities of connected devices shared by every SDK of the process.
+
+    `SDK.create` looks a device up by its serial number before running the
+    SDK version handshake, so creating the SDK of another app, or of the same
+    app on a new connection, skips the round trips. Entries expire after
+    `ttl` seconds and are dropped when the device monitor reports the device
+    as unplugged, when the firmware is updated, or on `invalidate`.
+
+    While the cache holds a device of a connection type, it keeps a
+    subscription to that type's device monitor source, so an unplug is seen
+    even after every connection is closed.
+    """
+
+    def __init__(
+        self,
+        ttl: float = DEFAULT_CAPABILITY_TTL,
+        device_monitor: Optional[DeviceMonitor] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl = ttl
+        self.device_monitor = device_monitor
+        self.clock = clock
+        # Expiry time and capabilities by device serial
+        self._entries: Dict[str, Tuple[float, DeviceCapabilities]] = {}
+        self._unsubscribers: Dict[str, Callable[[], None]] = {}
+        self._lock = threading.RLock()
+
+    def get(self, serial: str) -> Optional[DeviceCapabilities]:
+        """Get the capabilities of a device, None if unknown or expired."""
+        with self._lock:
+            entry = self._entries.get(serial)
+            if entry is None:
+                return None
+
+            expires_at, capabilities = entry
+            if self.clock() >= expires_at:
+                self.invalidate(serial)
+                return None
+
+            return DeviceCapabilities(**capabilities)
+
+    def set(
+        self,
+        serial: str,
+        capabilities: DeviceCapabilities,
+        source: Optional[str] = None,
+    ) -> None:
+        """
+        Store the capabilities of a device.
+
+        Args:
+            serial: Serial number of the device
+            capabilities: Capabilities read from the device
+            source: Device monitor source to watch for the device's unplug,
+                usually the connection type
+        """
+        with self._lock:
+            self._entries[serial] = (
+                self.clock() + self.ttl,
+                DeviceCapabilities(**capabilities),
+            )
+            if source is not None:
+                self._watch(source)
+
+    def set_app_versions(self, serial: str, app_versions: Any) -> None:
+        """Add the app versions of a device that is already cached."""
+        with self._lock:
+            entry = self._entries.get(serial)
+            if entry is not None:
+                entry[1]["app_versions"] = app_versions
+
+    def invalidate(self, serial: str) -> None:
+        """Forget a device, so its capabilities are read again."""
+        with self._lock:
+            self._entries.pop(serial, None)
+            if not self._entries:
+                self._unwatch()
+
+    def clear(self) -> None:
+        """Forget every device."""
+        with self._lock:
+            self._entries = {}
+            self._unwatch()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _watch(self, source: str) -> None:
+        if source in self._unsubscribers:
+            return
+
+        device_monitor = self.device_monitor or get_device_monitor()
+        try:
+            self._unsubscribers[source] = device_monitor.subscribe(
+                source, self._on_device_event
+            )
+        except ValueError:
+            # No transport registered the source, so only the TTL applies
+            pass
+
+    def _unwatch(self) -> None:
+        unsubscribers = list(self._unsubscribers.values())
+        self._unsubscribers = {}
+        for unsubscribe in unsubscribers:
+            unsubscribe()
+
+    def _on_device_event(self, event: DeviceEvent) -> None:
+        # Called on the device monitor thread
+        serial = event["device"].get("serial")
+        if event["type"] == "disconnect" and serial:
+            self.invalidate(serial)
+
+
+_device_capability_cache: Optional[DeviceCapabilityCache] = None
+
+
+def get_device_capability_cache() -> Optional[DeviceCapabilityCache]:
+    """Get the cache used by `SDK.create` by default, None if disabled."""
+    return _device_capability_cache
+
+
+def set_device_capability_cache(cache: Optional[DeviceCapabilityCache]) -> None:
+    """
+    Set the cache used by `SDK.create` by default.
+
+    No cache is used until one is set, since a firmware update done by
+    another process goes unnoticed until the entry expires.
+
+    Args:
+        cache: Cache shared by the SDKs of the process, None to disable it
+    """
+    global _device_capability_cache
+    if _device_capability_cache is not None and _device_capability_cache is not cache:
+        _device_capability_cache.clear()
+    _device_capability_cache = cache
+
+
+async def get_device_serial(connection: IDeviceConnection) -> Optional[str]:
+    """Get the serial number of the connected device, if the transport knows it."""
+    if isinstance(connection, IIdentifiableDeviceConnection):
+        return await connection.get_device_serial()
+    return None
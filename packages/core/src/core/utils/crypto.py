@@ -1,8 +1,38 @@
 from util.utils.assert_utils import assert_condition
-from util.utils.crypto import uint8array_to_hex
 from core.config import v1, v2
 from .packetversion import PacketVersion, PacketVersionMap
 
+ESCAPE_BYTE = 0xA3
+ESCAPED_STUFFING_BYTE = 0x3A
+ESCAPED_ESCAPE_BYTE = 0x33
+
+_ESCAPE = bytes([ESCAPE_BYTE])
+_ESCAPED_ESCAPE = bytes([ESCAPE_BYTE, ESCAPED_ESCAPE_BYTE])
+_ESCAPED_STUFFING = bytes([ESCAPE_BYTE, ESCAPED_STUFFING_BYTE])
+
+
+def stuff_bytes(data: bytes, stuffing_byte: int) -> bytes:
+    """
+    Escape the stuffing byte and the escape byte in `data`.
+
+    Each replacement is a single C-level pass over the buffer. The escape
+    byte is replaced first so the escapes added by the second pass are kept.
+    """
+    stuffed = bytes(data).replace(_ESCAPE, _ESCAPED_ESCAPE)
+    return stuffed.replace(bytes([stuffing_byte]), _ESCAPED_STUFFING)
+
+
+def unstuff_bytes(data: bytes, stuffing_byte: int) -> bytes:
+    """
+    Reverse `stuff_bytes`. An escape byte followed by anything else is kept.
+
+    Replacing the escaped stuffing byte first gives the same result as a left
+    to right scan: neither replacement can create or break a match of the
+    other.
+    """
+    unstuffed = bytes(data).replace(_ESCAPED_STUFFING, bytes([stuffing_byte]))
+    return unstuffed.replace(_ESCAPED_ESCAPE, _ESCAPE)
+
 
 def byte_unstuffing(input_buff: bytes, version: PacketVersion) -> str:
     assert_condition(input_buff, "Invalid inputBuff")
@@ -13,25 +43,7 @@ def byte_unstuffing(input_buff: bytes, version: PacketVersion) -> str:
     if version == PacketVersionMap.v2:
         usable_config = v2
 
-    size = len(input_buff)
-    output_data = []
-
-    i = 0
-    while i < size:
-        if input_buff[i] == 0xA3 and i < size - 1:
-            if input_buff[i + 1] == 0x3A:
-                output_data.append(usable_config.constants.STUFFING_BYTE)
-                i += 1
-            elif input_buff[i + 1] == 0x33:
-                output_data.append(0xA3)
-                i += 1
-            else:
-                output_data.append(input_buff[i])
-        else:
-            output_data.append(input_buff[i])
-        i += 1
-
-    return uint8array_to_hex(bytes(output_data))
+    return unstuff_bytes(input_buff, usable_config.constants.STUFFING_BYTE).hex()
 
 
 def byte_stuffing(input_buff: bytes, version: PacketVersion) -> str:
@@ -45,15 +57,4 @@ def byte_stuffing(input_buff: bytes, version: PacketVersion) -> str:
     if version == PacketVersionMap.v2:
         usable_config = v2
 
-    output_data = []
-    for byte in input_buff:
-        if byte == usable_config.constants.STUFFING_BYTE:
-            output_data.append(0xA3)
-            output_data.append(0x3A)
-        elif byte == 0xA3:
-            output_data.append(0xA3)
-            output_data.append(0x33)
-        else:
-            output_data.append(byte)
-
-    return uint8array_to_hex(bytes(output_data))
+    return stuff_bytes(input_buff, usable_config.constants.STUFFING_BYTE).hex()
@@ -24,7 +24,7 @@ class TestSDKGetResult:
         )
         with (
             patch("time.time", return_value=utc_timestamp),
-            patch("core.encoders.packet.packet.time.time", return_value=utc_timestamp),
+            patch("core.encoders.packet.codec.time.time", return_value=utc_timestamp),
             patch(
                 "os.times", return_value=type("MockTimes", (), {"elapsed": 16778725})()
             ),
@@ -0,0 +1,68 @@
+import asyncio
+import pytest
+from unittest.mock import patch
+
+from interfaces import DeviceState
+from interfaces.__mocks__.connection import MockDeviceConnection
+from interfaces.errors.communication_error import DeviceCommunicationError
+from core import SDK
+from core.utils.packetversion import PacketVersionMap
+
+
+async def create_sdk():
+    connection = await MockDeviceConnection.create()
+    sdk = SDK(connection, 12, "3.0.1", PacketVersionMap.v3)
+    return connection, sdk
+
+
+class TestSDKOperationContext:
+    """Test the checks cached by sdk.before_operation"""
+
+    def test_should_check_device_state_once_per_operation(self):
+        async def _test():
+            connection, sdk = await create_sdk()
+            with patch.object(
+                connection, "get_device_state", wraps=connection.get_device_state
+            ) as get_device_state:
+                await sdk.before_operation()
+                for _ in range(10):
+                    assert await sdk.is_supported()
+
+                assert get_device_state.call_count == 1
+
+        asyncio.run(_test())
+
+    def test_should_check_again_after_the_operation(self):
+        async def _test():
+            connection, sdk = await create_sdk()
+            await sdk.before_operation()
+            connection.configure_device(
+                DeviceState.BOOTLOADER, connection.connection_type
+            )
+            assert await sdk.is_supported()
+
+            await sdk.after_operation()
+            assert sdk.operation_context is None
+            assert not await sdk.is_supported()
+
+        asyncio.run(_test())
+
+    def test_should_check_again_after_a_disconnect(self):
+        async def _test():
+            connection, sdk = await create_sdk()
+            await sdk.before_operation()
+            connection.configure_device(
+                DeviceState.BOOTLOADER, connection.connection_type
+            )
+            await connection.destroy()
+
+            with pytest.raises(DeviceCommunicationError):
+                await sdk.send_query(bytes([1]))
+
+            assert sdk.operation_context is None
+
+        asyncio.run(_test())
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
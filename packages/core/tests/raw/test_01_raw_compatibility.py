@@ -29,7 +29,7 @@ async def setup():
             + constant_date.microsecond / 1e6,
         ),
         patch(
-            "core.encoders.packet.packet.time.time",
+            "core.encoders.packet.codec.time.time",
             return_value=calendar.timegm(constant_date.timetuple())
             + constant_date.microsecond / 1e6,
         ),
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark of the HID data listener against a fake `hid.device`.
+
+Compares the default task-per-report reader with the dedicated reader thread
+by pushing a fixed number of 64 byte reports through `DataListener` and
+reporting received reports/sec and bytes/sec for each mode. The fake device
+is never empty, so reports the consumer cannot keep up with are dropped by
+the ring buffer and reported separately.
+
+Usage:
+    python packages/hw_hid/benchmarks/reader.py [--reports 20000]
+"""
+
+import argparse
+import asyncio
+import sys
+import threading
+import time
+from typing import List, Optional, Tuple
+
+from interfaces import ConnectionTypeMap, DeviceState, IDevice
+from util.utils import get_device_monitor
+
+from hw_hid.helpers import DataListener
+from hw_hid.helpers.report_buffer import REPORT_SIZE
+
+DEFAULT_REPORTS = 20000
+
+fake_device: IDevice = {
+    "path": "fake",
+    "device_state": DeviceState.MAIN,
+    "vendor_id": 0x3503,
+    "product_id": 0x0103,
+    "serial": "fake",
+    "type": ConnectionTypeMap.HID,
+}
+
+
+class FakeHidDevice:
+    """Serves `total` reports as fast as they are read, like a full IN queue."""
+
+    def __init__(self, total: int):
+        self.remaining = total
+        self.report = list(range(REPORT_SIZE))
+        self.lock = threading.Lock()
+
+    def read(self, max_length: int, timeout_ms: int = 0) -> List[int]:
+        with self.lock:
+            if self.remaining > 0:
+                self.remaining -= 1
+                return self.report[:max_length]
+
+        time.sleep(timeout_ms / 1000)
+        return []
+
+    def close(self) -> None:
+        pass
+
+
+def list_fake_devices() -> List[IDevice]:
+    return [fake_device]
+
+
+async def measure(total: int, use_reader_thread: bool) -> Tuple[int, float]:
+    listener = DataListener(
+        {
+            "connection": FakeHidDevice(total),
+            "device": fake_device,
+            "use_reader_thread": use_reader_thread,
+        }
+    )
+
+    start = time.perf_counter()
+    listener.start_listening()
+
+    received = 0
+    while received + dropped(listener) < total:
+        data = await listener.receive()
+        if data is None:
+            await listener.wait_readable(0.1)
+            continue
+        received += 1
+
+    elapsed = time.perf_counter() - start
+    listener.stop_listening()
+    listener.remove_all_listeners()
+
+    return received, elapsed
+
+
+def dropped(listener: DataListener) -> int:
+    if listener.report_buffer is None:
+        return 0
+    return listener.report_buffer.dropped
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--reports", type=int, default=DEFAULT_REPORTS)
+    args = parser.parse_args(argv)
+
+    # Registered first, so the listeners watch the fake device for disconnects
+    get_device_monitor().register_source(ConnectionTypeMap.HID.value, list_fake_devices)
+
+    for name, use_reader_thread in [
+        ("task per report", False),
+        ("reader thread", True),
+    ]:
+        received, elapsed = asyncio.run(measure(args.reports, use_reader_thread))
+        print(
+            f"{name:16} {received / elapsed:12.0f} reports/s"
+            f"  {received * REPORT_SIZE / elapsed / 1e6:8.2f} MB/s"
+            f"  {args.reports - received} dropped"
+        )
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,7 @@
 import asyncio
+import threading
 import uuid
-from typing import Any, List, Optional
+from typing import Any, List, Optional, Sequence
 
 import hid
 
@@ -15,23 +16,31 @@ from interfaces import (
 )
 
 from .helpers import DataListener, get_available_devices
+from .helpers.report_buffer import REPORT_SIZE
 from .logger import logger
 
 
 class DeviceConnection(IDeviceConnection):
-    def __init__(self, device: IDevice, connection: Any):
+    def __init__(
+        self, device: IDevice, connection: Any, use_reader_thread: bool = False
+    ):
         self.device: IDevice = device
         self.connection_id = str(uuid.uuid4())
         self.sequence_number = 0
         self.initialized = True
         self.is_port_open = True
         self.connection = connection
+        # Report id followed by the report, reused for every write
+        self._report = bytearray(REPORT_SIZE + 1)
+        self._padding = memoryview(bytes(REPORT_SIZE))
+        self._write_lock = threading.Lock()
 
         listener_params = {
             "connection": self.connection,
             "device": self.device,
             "on_close": self.on_close,
             "on_error": self.on_error,
+            "use_reader_thread": use_reader_thread,
         }
         self.data_listener: DataListener = DataListener(listener_params)
 
@@ -40,18 +49,18 @@ class DeviceConnection(IDeviceConnection):
         return ConnectionTypeMap.HID
 
     @staticmethod
-    async def connect(device: IDevice):
+    async def connect(device: IDevice, use_reader_thread: bool = False):
         # Create HID device connection
         connection = hid.device()  # type: ignore
         await asyncio.to_thread(connection.open_path, device["path"])
-        return DeviceConnection(device, connection)
+        return DeviceConnection(device, connection, use_reader_thread)
 
     @staticmethod
     async def list():
         return await get_available_devices()
 
     @staticmethod
-    async def create():
+    async def create(use_reader_thread: bool = False):
         devices = await get_available_devices()
         if not devices:
             raise DeviceConnectionError(DeviceConnectionErrorType.NOT_CONNECTED)
@@ -59,7 +68,7 @@ class DeviceConnection(IDeviceConnection):
         # Create HID device connection
         connection = hid.device()  # type: ignore
         await asyncio.to_thread(connection.open_path, device_to_connect["path"])
-        return DeviceConnection(device_to_connect, connection)
+        return DeviceConnection(device_to_connect, connection, use_reader_thread)
 
     @staticmethod
     async def get_available_connection():
@@ -69,6 +78,9 @@ class DeviceConnection(IDeviceConnection):
     async def get_device_state(self) -> DeviceState:
         return self.device["device_state"]
 
+    async def get_device_serial(self) -> Optional[str]:
+        return self.device.get("serial")
+
     async def is_initialized(self) -> bool:
         return self.initialized
 
@@ -100,15 +112,37 @@ class DeviceConnection(IDeviceConnection):
         self.data_listener.stop_listening()
 
     async def send(self, data: bytearray) -> None:
-        data_to_write = [0x00] + list(data) + [0x00] * (64 - len(data))
-        await asyncio.to_thread(self.connection.write, bytes(data_to_write))
+        await asyncio.to_thread(self._write_reports, [data])
+
+    async def send_many(self, packets: Sequence[bytes]) -> None:
+        if packets:
+            await asyncio.to_thread(self._write_reports, packets)
+
+    def _write_reports(self, packets: Sequence[bytes]) -> None:
+        report = self._report
+        with self._write_lock:
+            for packet in packets:
+                length = len(packet)
+                if length > REPORT_SIZE:
+                    self.connection.write(b"\x00" + bytes(packet))
+                    continue
+
+                report[1 : 1 + length] = packet
+                report[1 + length :] = self._padding[: REPORT_SIZE - length]
+                self.connection.write(report)
 
     async def receive(self) -> Optional[bytearray]:
         result = await self.data_listener.receive()
         return bytearray(result) if result is not None else None
 
+    async def wait_readable(self, timeout: Optional[float] = None) -> bool:
+        return await self.data_listener.wait_readable(timeout)
+
     async def peek(self) -> List[PoolData]:
-        return await self.data_listener.peek()
+        return self.data_listener.peek()
+
+    async def peek_since(self, last_id: int) -> List[PoolData]:
+        return self.data_listener.peek_since(last_id)
 
     def on_close(self):
         self.is_port_open = False
@@ -1,4 +1,10 @@
-from .connection import get_available_devices
+from .connection import get_available_devices, list_available_devices
 from .data_listeners import DataListener
+from .report_buffer import ReportRingBuffer
 
-__all__ = ["get_available_devices", "DataListener"]
+__all__ = [
+    "get_available_devices",
+    "list_available_devices",
+    "DataListener",
+    "ReportRingBuffer",
+]
@@ -32,13 +32,16 @@ def format_device_info(device: Dict[str, Any]) -> Optional[IDevice]:
     return None
 
 
-async def get_available_devices() -> List[IDevice]:
+def list_available_devices() -> List[IDevice]:
     device_list: List[IDevice] = []
-    all_hid_devices = await asyncio.to_thread(hid.enumerate)
 
-    for port_param in all_hid_devices:
+    for port_param in hid.enumerate():
         device = format_device_info(port_param)
         if device:
             device_list.append(device)
 
     return device_list
+
+
+async def get_available_devices() -> List[IDevice]:
+    return await asyncio.to_thread(list_available_devices)
@@ -1,35 +1,78 @@
 import asyncio
 import threading
-import time
-import uuid
-from typing import Any, Dict, Optional
-
-from interfaces import IDevice, PoolData
+from typing import Any, Callable, Dict, List, Optional
+
+from interfaces import ConnectionTypeMap, IDevice, PoolData
+from util.utils import (
+    DEFAULT_POOL_CAPACITY,
+    DeviceEvent,
+    FramePool,
+    FramePoolOverflow,
+    ReadableSignal,
+    default_device_key,
+    get_device_monitor,
+)
 
 from ..logger import logger
-from .connection import get_available_devices
+from .connection import list_available_devices
+from .report_buffer import REPORT_SIZE, ReportRingBuffer
+
+READ_TIMEOUT_MS = 100
+MAX_REPORTS_PER_BATCH = 64
 
 
 class DataListener:
+    """
+    Reads input reports of a HID device into a pool.
+
+    By default every report is read by a task that hops to the thread pool.
+    With `use_reader_thread` a dedicated thread blocks on the device instead,
+    drains every available report per wakeup into a `ReportRingBuffer` and
+    signals the event loop once per batch.
+
+    Both stores hold at most `pool_capacity` reports and apply the
+    `pool_overflow` policy when the consumer falls behind.
+
+    Disconnects are detected by the process-wide device monitor, which
+    enumerates HID devices once per interval for all open connections.
+    """
+
     def __init__(self, params: Dict[str, Any]):
         self.connection = params["connection"]
         self.device: IDevice = params["device"]
         self.on_close_callback = params.get("on_close")
         self.on_error_callback = params.get("on_error")
-        self.on_some_device_disconnect_binded = self.on_some_device_disconnect
+        self.use_reader_thread: bool = params.get("use_reader_thread", False)
         self.listening = False
-        self.pool: [PoolData] = []
+        pool_capacity: int = params.get("pool_capacity", DEFAULT_POOL_CAPACITY)
+        pool_overflow: FramePoolOverflow = params.get(
+            "pool_overflow", FramePoolOverflow.DROP_OLDEST
+        )
+        self.pool = FramePool(pool_capacity, pool_overflow)
+        self.readable = ReadableSignal()
 
         self.read_timeout_id = None
         self.read_promise = None
 
-        self.read_thread = None
-        self._monitor_thread: Optional[threading.Thread] = None
-        self._stop_event = threading.Event()
+        self.read_thread: Optional[threading.Thread] = None
+        self._read_stop_event = threading.Event()
+        self.report_buffer: Optional[ReportRingBuffer] = (
+            ReportRingBuffer(pool_capacity, overflow=pool_overflow)
+            if self.use_reader_thread
+            else None
+        )
+        self._unsubscribe_device_monitor: Optional[Callable[[], None]] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        try:
+            self._loop = asyncio.get_running_loop()
+        except RuntimeError:
+            pass
 
         self.add_all_listeners()
 
     async def destroy(self):
+        # Releases a read blocked on a full pool
+        self.pool.close()
         if self.read_promise:
             await self.read_promise
 
@@ -38,17 +81,33 @@ class DataListener:
 
         if self.on_close_callback:
             self.on_close_callback()
+        self.readable.notify()
 
     def is_listening(self):
         return self.listening
 
     async def receive(self):
-        if self.pool:
-            return self.pool.pop(0).get("data")
-        return None
+        if self.report_buffer is not None:
+            return self.report_buffer.pop()
+        return self.pool.get()
+
+    def _has_data(self) -> bool:
+        if self.report_buffer is not None:
+            return len(self.report_buffer) > 0
+        return len(self.pool) > 0
 
-    def peek(self):
-        return self.pool.copy()
+    async def wait_readable(self, timeout: Optional[float] = None) -> bool:
+        return await self.readable.wait(self._has_data, timeout)
+
+    def peek(self) -> List[PoolData]:
+        if self.report_buffer is not None:
+            return self.report_buffer.peek()
+        return self.pool.peek()
+
+    def peek_since(self, last_id: int) -> List[PoolData]:
+        if self.report_buffer is not None:
+            return self.report_buffer.peek_since(last_id)
+        return self.pool.peek_since(last_id)
 
     def clear_read_interval(self):
         if self.read_timeout_id:
@@ -60,25 +119,80 @@ class DataListener:
 
     def start_listening(self):
         self.listening = True
-        self.set_read_interval()
+        if self.use_reader_thread:
+            self.start_reader_thread()
+        else:
+            self.set_read_interval()
 
     def stop_listening(self):
         self.clear_read_interval()
+        self.stop_reader_thread()
         self.listening = False
 
+    def start_reader_thread(self) -> None:
+        if self.read_thread and self.read_thread.is_alive():
+            return
+
+        self._read_stop_event.clear()
+        self.read_thread = threading.Thread(target=self._run_reader, daemon=True)
+        self.read_thread.start()
+
+    def stop_reader_thread(self) -> None:
+        self._read_stop_event.set()
+        if self.read_thread and self.read_thread.is_alive():
+            self.read_thread.join(timeout=1.0)
+        self.read_thread = None
+
+    def _run_reader(self) -> None:
+        blocking = self.report_buffer.overflow is FramePoolOverflow.BLOCK
+
+        while not self._read_stop_event.is_set():
+            try:
+                batch_size = MAX_REPORTS_PER_BATCH
+                if blocking:
+                    # Leave the reports in the device queue until there is room
+                    if not self.report_buffer.wait_for_space(READ_TIMEOUT_MS / 1000):
+                        continue
+                    batch_size = min(batch_size, self.report_buffer.free_slots())
+
+                report = self.connection.read(REPORT_SIZE, timeout_ms=READ_TIMEOUT_MS)
+                if not report:
+                    continue
+
+                # Drain whatever else is queued, waiting at most 1 ms per read
+                reports = [report]
+                while len(reports) < batch_size:
+                    report = self.connection.read(REPORT_SIZE, timeout_ms=1)
+                    if not report:
+                        break
+                    reports.append(report)
+
+                self.report_buffer.push_batch(reports)
+                self.readable.notify()
+            except Exception as error:
+                if self.on_error_callback:
+                    self.on_error_callback(error)
+                self._read_stop_event.wait(READ_TIMEOUT_MS / 1000)
+
     def add_all_listeners(self) -> None:
-        if not self._monitor_thread or not self._monitor_thread.is_alive():
-            logger.debug("Starting device disconnect monitor thread.")
-            self._monitor_thread = threading.Thread(
-                target=self._run_device_monitor, daemon=True
-            )
-            self._monitor_thread.start()
+        if self._unsubscribe_device_monitor:
+            return
+
+        device_monitor = get_device_monitor()
+        device_monitor.register_source(
+            ConnectionTypeMap.HID.value,
+            list_available_devices,
+            udev_subsystems=["hidraw"],
+            on_error=on_device_monitor_error,
+        )
+        self._unsubscribe_device_monitor = device_monitor.subscribe(
+            ConnectionTypeMap.HID.value, self.on_device_event, present=[self.device]
+        )
 
     def remove_all_listeners(self) -> None:
-        self._stop_event.set()
-        if self._monitor_thread and self._monitor_thread.is_alive():
-            self._monitor_thread.join(timeout=1.0)
-            logger.debug("Device disconnect monitor thread stopped.")
+        if self._unsubscribe_device_monitor:
+            self._unsubscribe_device_monitor()
+            self._unsubscribe_device_monitor = None
 
     async def on_read(self):
         if not self.listening:
@@ -111,7 +225,8 @@ class DataListener:
 
     async def on_data(self, data):
         if data and len(data) > 0:
-            self.pool.append({"id": str(uuid.uuid4()), "data": bytearray(data)})
+            await self.pool.put_async(bytearray(data))
+            self.readable.notify()
 
     async def on_close(self):
         self.stop_listening()
@@ -119,35 +234,24 @@ class DataListener:
 
         if self.on_close_callback:
             self.on_close_callback()
+        self.readable.notify()
 
     def on_error(self, error: Exception):
         if self.on_error_callback:
             self.on_error_callback(error)
 
-    def _run_device_monitor(self):
-        while not self._stop_event.is_set():
-            asyncio.run(self._check_device_connection())
-            time.sleep(1)
+    def on_device_event(self, event: DeviceEvent) -> None:
+        # Called on the device monitor thread
+        if event["type"] != "disconnect" or default_device_key(
+            event["device"]
+        ) != default_device_key(self.device):
+            return
+
+        if self._loop and not self._loop.is_closed():
+            asyncio.run_coroutine_threadsafe(self.destroy(), self._loop)
+        else:
+            asyncio.run(self.destroy())
 
-    async def _check_device_connection(self):
-        try:
-            await self.on_some_device_disconnect()
-        except Exception as e:
-            logger.error(f"Error in device monitor: {e}")
-
-    async def on_some_device_disconnect(self):
-        connected_devices = await get_available_devices()
-
-        is_device_connected = any(
-            d["path"] == self.device["path"]
-            and d["serial"] == self.device["serial"]
-            and d["product_id"] == self.device["product_id"]
-            and d["type"] == self.device["type"]
-            and d["device_state"] == self.device["device_state"]
-            and d["vendor_id"] == self.device["vendor_id"]
-            for d in connected_devices
-        )
 
-        if not is_device_connected:
-            await self.destroy()
-            await self.on_close()
+def on_device_monitor_error(error: Exception) -> None:
+    logger.error(f"Error in device monitor: {error}")
@@ -0,0 +1,97 @@
+import threading
+from typing import Iterable, List, Optional, Sequence
+
+from interfaces import PoolData
+from util.utils import FramePoolOverflow
+
+REPORT_SIZE = 64
+
+
+class ReportRingBuffer:
+    """
+    Preallocated ring of HID input reports.
+
+    The reader thread pushes reports in batches and the event loop pops them,
+    both under one lock. Report ids are monotonic like those of a `FramePool`.
+    When the ring is full the oldest report is dropped and counted in
+    `dropped`; with the `BLOCK` overflow policy the reader waits for free
+    slots with `wait_for_space` before reading instead.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        report_size: int = REPORT_SIZE,
+        overflow: FramePoolOverflow = FramePoolOverflow.DROP_OLDEST,
+    ):
+        if capacity <= 0:
+            raise ValueError("capacity should be greater than 0")
+
+        self.capacity = capacity
+        self.report_size = report_size
+        self.overflow = overflow
+        self.dropped = 0
+        self._data = bytearray(capacity * report_size)
+        self._lengths = [0] * capacity
+        self._ids = [0] * capacity
+        self._head = 0
+        self._count = 0
+        self._next_id = 0
+        self._lock = threading.Lock()
+        self._not_full = threading.Condition(self._lock)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def free_slots(self) -> int:
+        return self.capacity - self._count
+
+    def wait_for_space(self, timeout: Optional[float] = None) -> bool:
+        """Wait until at least one slot is free."""
+        with self._not_full:
+            return self._not_full.wait_for(lambda: self._count < self.capacity, timeout)
+
+    def push_batch(self, reports: Iterable[Sequence[int]]) -> None:
+        with self._lock:
+            for report in reports:
+                if self._count == self.capacity:
+                    self._head = (self._head + 1) % self.capacity
+                    self._count -= 1
+                    self.dropped += 1
+
+                slot = (self._head + self._count) % self.capacity
+                length = min(len(report), self.report_size)
+                offset = slot * self.report_size
+                self._data[offset : offset + length] = report[:length]
+                self._lengths[slot] = length
+                self._ids[slot] = self._next_id
+                self._next_id += 1
+                self._count += 1
+
+    def pop(self) -> Optional[bytearray]:
+        with self._lock:
+            if self._count == 0:
+                return None
+
+            slot = self._head
+            self._head = (self._head + 1) % self.capacity
+            self._count -= 1
+            self._not_full.notify()
+            return self._read_slot(slot)
+
+    def peek(self) -> List[PoolData]:
+        return self.peek_since(-1)
+
+    def peek_since(self, last_id: int) -> List[PoolData]:
+        with self._lock:
+            # Ids are contiguous, so the first new report is found directly
+            oldest_id = self._next_id - self._count
+            skip = min(max(last_id + 1 - oldest_id, 0), self._count)
+            slots = [(self._head + i) % self.capacity for i in range(skip, self._count)]
+            return [
+                {"id": self._ids[slot], "data": self._read_slot(slot)} for slot in slots
+            ]
+
+    def _read_slot(self, slot: int) -> bytearray:
+        offset = slot * self.report_size
+        return self._data[offset : offset + self._lengths[slot]]
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Ack latency of the serial transport over a pty loopback.
+
+A thread plays the device on the master side of a pseudo terminal and echoes
+every write back at once, so the measured round trip is the time the
+transport takes to notice the reply. Both the event loop reader and the
+thread reader are measured through `DeviceConnection`.
+
+Usage:
+    python packages/hw_serialport/benchmarks/loopback.py [--pings 500]
+"""
+
+import argparse
+import asyncio
+import os
+import pty
+import statistics
+import sys
+import threading
+import time
+import tty
+from typing import List, Optional
+
+from interfaces import ConnectionTypeMap, DeviceState, IDevice
+from util.utils import get_device_monitor
+
+from hw_serialport import DeviceConnection
+
+DEFAULT_PINGS = 500
+PING = b"\xaa\x01\x00\x00"
+
+
+class EchoDevice:
+    """Echoes everything written to the slave side of a pty."""
+
+    def __init__(self):
+        self.master, self.slave = pty.openpty()
+        tty.setraw(self.master)
+        tty.setraw(self.slave)
+        self.path = os.ttyname(self.slave)
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def _run(self) -> None:
+        while True:
+            try:
+                data = os.read(self.master, 1024)
+            except OSError:
+                return
+            if not data:
+                return
+            os.write(self.master, data)
+
+    def close(self) -> None:
+        os.close(self.slave)
+        os.close(self.master)
+
+
+def create_device(path: str) -> IDevice:
+    return {
+        "path": path,
+        "device_state": DeviceState.MAIN,
+        "vendor_id": 0x3503,
+        "product_id": 0x0103,
+        "serial": "loopback",
+        "type": ConnectionTypeMap.SERIAL_PORT.value,
+    }
+
+
+async def measure(device: IDevice, pings: int, use_loop_reader: bool) -> List[float]:
+    connection = DeviceConnection(device)
+    connection.data_listener.use_loop_reader = use_loop_reader
+    await connection.open()
+
+    latencies: List[float] = []
+    for _ in range(pings):
+        start = time.perf_counter()
+        await connection.send(bytearray(PING))
+
+        received = bytearray()
+        while len(received) < len(PING):
+            data = await connection.receive()
+            if data is None:
+                if not await connection.is_connected():
+                    raise RuntimeError("Loopback connection closed")
+                await connection.wait_readable(1)
+                continue
+            received.extend(data)
+
+        latencies.append(time.perf_counter() - start)
+
+    await connection.destroy()
+    return latencies
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--pings", type=int, default=DEFAULT_PINGS)
+    args = parser.parse_args(argv)
+
+    loopback_devices: List[IDevice] = []
+    # Registered first, so the connection is not closed as unplugged: a pty is
+    # not listed as a serial port
+    get_device_monitor().register_source(
+        ConnectionTypeMap.SERIAL_PORT.value, lambda: list(loopback_devices)
+    )
+
+    for name, use_loop_reader in [("loop reader", True), ("thread reader", False)]:
+        echo_device = EchoDevice()
+        device = create_device(echo_device.path)
+        loopback_devices[:] = [device]
+        latencies = asyncio.run(measure(device, args.pings, use_loop_reader))
+        echo_device.close()
+
+        latencies.sort()
+        print(
+            f"{name:14}"
+            f"  median {statistics.median(latencies) * 1000:7.3f} ms"
+            f"  p99 {latencies[int(len(latencies) * 0.99) - 1] * 1000:7.3f} ms"
+        )
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,6 @@
 import uuid
 import serial
-from typing import Optional, List
+from typing import Optional, List, Sequence
 
 from interfaces.connection import DeviceState, ConnectionTypeMap, IDevice, PoolData
 from interfaces.errors.connection_error import (
@@ -34,7 +34,9 @@ class DeviceConnection:
             self.connection.close()
 
         self.initialized = True
-        self.data_listener = DataListener({"connection": self.connection})
+        self.data_listener = DataListener(
+            {"connection": self.connection, "device": device}
+        )
 
     async def get_connection_type(self) -> str:
         return ConnectionTypeMap.SERIAL_PORT.value
@@ -69,6 +71,12 @@ class DeviceConnection:
         """
         return self.device_state
 
+    async def get_device_serial(self) -> Optional[str]:
+        """
+        Get the serial number of the device.
+        """
+        return self.serial
+
     async def is_initialized(self) -> bool:
         return self.initialized
 
@@ -114,15 +122,33 @@ class DeviceConnection:
         except Exception as e:
             raise e
 
+    async def send_many(self, packets: Sequence[bytes]) -> None:
+        """
+        Send packets back to back with a single write.
+        """
+        await self.send(bytearray(b"".join(packets)))
+
     async def receive(self) -> Optional[bytearray]:
         """
         Receive data from the device.
         """
         return await self.data_listener.receive()
 
+    async def wait_readable(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until received data is available.
+        """
+        return await self.data_listener.wait_readable(timeout)
+
     async def peek(self) -> List[PoolData]:
         return self.data_listener.peek()
 
+    async def peek_since(self, last_id: int) -> List[PoolData]:
+        """
+        Get the received data after `last_id` without removing it.
+        """
+        return self.data_listener.peek_since(last_id)
+
     async def is_open(self) -> bool:
         """
         Check if the connection is open and ready to communicate.
@@ -138,9 +164,11 @@ class DeviceConnection:
             return
 
         await open_connection(self.connection)
+        self.data_listener.start_listening()
 
     async def close(self) -> None:
         """
         Close the connection.
         """
+        self.data_listener.stop_listening()
         return await close_connection(self.connection)
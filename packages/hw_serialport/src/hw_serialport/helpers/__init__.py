@@ -1,9 +1,10 @@
-from .connection import get_available_devices
+from .connection import get_available_devices, list_available_devices
 from .dataListeners import DataListener
 from .utils import open_connection, close_connection
 
 __all__ = [
     "get_available_devices",
+    "list_available_devices",
     "DataListener",
     "open_connection",
     "close_connection",
@@ -13,7 +13,7 @@ supported_versions_to_device_state: Dict[str, DeviceState] = {
 }
 
 
-async def get_available_devices() -> List[IDevice]:
+def list_available_devices() -> List[IDevice]:
     port_list = serial.tools.list_ports.comports()
     devices: List[IDevice] = []
 
@@ -56,3 +56,7 @@ async def get_available_devices() -> List[IDevice]:
                 )
 
     return devices
+
+
+async def get_available_devices() -> List[IDevice]:
+    return list_available_devices()
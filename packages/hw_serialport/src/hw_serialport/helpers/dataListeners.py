@@ -1,13 +1,38 @@
-import uuid
+import asyncio
+import os
 import threading
-from typing import List, Optional, Dict, Any
+from typing import Callable, List, Optional, Dict, Any
 import serial
-from interfaces.connection import PoolData
+from interfaces.connection import ConnectionTypeMap, IDevice, PoolData
+from util.utils import (
+    DEFAULT_POOL_CAPACITY,
+    DeviceEvent,
+    FramePool,
+    FramePoolOverflow,
+    ReadableSignal,
+    default_device_key,
+    get_device_monitor,
+)
+from ..logger import logger
+from .connection import list_available_devices
+
+READ_CHUNK_SIZE = 4096
 
 
 class DataListener:
     """
     Listens for data events from a serial port connection and manages a data pool.
+
+    Where the event loop can watch file descriptors, as on Linux, the open
+    port's descriptor is registered with `loop.add_reader` and bytes are read
+    on the loop as soon as they arrive. Otherwise, or with `use_loop_reader`
+    disabled, a thread blocks on the port instead.
+
+    The pool holds at most `pool_capacity` reads; with the `BLOCK` overflow
+    policy the port is not read until there is room again.
+
+    When the device is given, the process-wide device monitor reports its
+    removal and the port is closed.
     """
 
     def __init__(self, params: Dict[str, Any]):
@@ -15,13 +40,26 @@ class DataListener:
         self.on_close_callback = params.get("onClose")
         self.on_error_callback = params.get("onError")
         self.listening = False
-        self.pool: List[PoolData] = []
-        self.pool_lock = threading.Lock()
+        self.pool = FramePool(
+            params.get("pool_capacity", DEFAULT_POOL_CAPACITY),
+            params.get("pool_overflow", FramePoolOverflow.DROP_OLDEST),
+        )
+        self.readable = ReadableSignal()
         self.read_thread = None
+        self.use_loop_reader: bool = params.get("use_loop_reader", True)
+        self._reader_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._reader_fd: Optional[int] = None
+        self._reader_paused = False
+        self.device: Optional[IDevice] = params.get("device")
+        self._unsubscribe_device_monitor: Optional[Callable[[], None]] = None
         self.start_listening()
+        self._watch_device()
 
     def destroy(self) -> None:
         self.stop_listening()
+        if self._unsubscribe_device_monitor:
+            self._unsubscribe_device_monitor()
+            self._unsubscribe_device_monitor = None
 
     def is_listening(self) -> bool:
         return self.listening
@@ -30,45 +68,145 @@ class DataListener:
         """
         Get and remove the first data item from the pool.
         """
-        with self.pool_lock:
-            if not self.pool:
-                return None
-            return self.pool.pop(0).get("data")
+        data = self.pool.get()
+        if self._reader_paused:
+            self._resume_loop_reader()
+        return data
+
+    async def wait_readable(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until the reader has pooled data.
+        """
+        return await self.readable.wait(lambda: len(self.pool) > 0, timeout)
 
     def peek(self) -> List[PoolData]:
         """
         Get a copy of all data items in the pool without removing them.
         """
-        with self.pool_lock:
-            return self.pool.copy()
+        return self.pool.peek()
+
+    def peek_since(self, last_id: int) -> List[PoolData]:
+        """
+        Get the data items received after `last_id` without removing them.
+        """
+        return self.pool.peek_since(last_id)
 
     def start_listening(self) -> None:
-        if self.listening:
+        if self.listening or not (self.connection and self.connection.is_open):
             return
 
         self.listening = True
+        if self.use_loop_reader and self._start_loop_reader():
+            return
+
         self.read_thread = threading.Thread(target=self._read_loop)
         self.read_thread.daemon = True
         self.read_thread.start()
 
     def stop_listening(self) -> None:
         self.listening = False
+        self._stop_loop_reader()
         if self.read_thread and self.read_thread.is_alive():
+            # Wakes the thread from a blocking read
+            if self.connection and hasattr(self.connection, "cancel_read"):
+                self.connection.cancel_read()
             self.read_thread.join(timeout=1.0)
 
+    def _start_loop_reader(self) -> bool:
+        """
+        Register the port with the running event loop, False if unsupported.
+        """
+        try:
+            loop = asyncio.get_running_loop()
+            fd = self.connection.fileno()
+            loop.add_reader(fd, self._on_readable)
+        except (RuntimeError, AttributeError, NotImplementedError, ValueError):
+            # No running loop, a port without descriptor or a loop that
+            # cannot watch descriptors, such as the Windows proactor
+            return False
+
+        self._reader_loop = loop
+        self._reader_fd = fd
+        self._reader_paused = False
+        return True
+
+    def _stop_loop_reader(self) -> None:
+        loop, fd = self._reader_loop, self._reader_fd
+        self._reader_loop = None
+        self._reader_fd = None
+        self._reader_paused = False
+        if loop is None or fd is None or loop.is_closed():
+            return
+
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+
+        if running_loop is loop:
+            loop.remove_reader(fd)
+        else:
+            loop.call_soon_threadsafe(loop.remove_reader, fd)
+
+    def _resume_loop_reader(self) -> None:
+        self._reader_paused = False
+        if self._reader_loop is not None and self._reader_fd is not None:
+            self._reader_loop.add_reader(self._reader_fd, self._on_readable)
+
+    def _on_readable(self) -> None:
+        """Read the bytes that arrived, called by the event loop."""
+        loop, fd = self._reader_loop, self._reader_fd
+        if loop is None or fd is None:
+            # The reader was stopped after this callback was queued
+            return
+
+        if (
+            self.pool.overflow is FramePoolOverflow.BLOCK
+            and len(self.pool) >= self.pool.capacity
+        ):
+            # Leave the bytes to the port until `receive` frees a slot
+            loop.remove_reader(fd)
+            self._reader_paused = True
+            return
+
+        try:
+            data = os.read(fd, READ_CHUNK_SIZE)
+        except BlockingIOError:
+            return
+        except OSError as e:
+            self._on_loop_reader_closed(e)
+            return
+
+        if not data:
+            self._on_loop_reader_closed(
+                serial.SerialException("Serial port returned no data")
+            )
+            return
+
+        self.pool.put(bytearray(data))
+        self.readable.notify()
+
+    def _on_loop_reader_closed(self, error: Exception) -> None:
+        self.listening = False
+        self._stop_loop_reader()
+        if self.on_error_callback:
+            self.on_error_callback(error)
+        if self.on_close_callback:
+            self.on_close_callback()
+        self.readable.notify()
+
     def _read_loop(self) -> None:
         """Background thread that reads data from the serial port."""
         try:
             while self.listening and self.connection and self.connection.is_open:
                 try:
-                    # Check if data is available
-                    if self.connection.in_waiting > 0:
-                        # Read available data
-                        data = self.connection.read(self.connection.in_waiting)
-                        if data:
-                            self._on_data(data)
-                    # Small sleep to prevent CPU hogging
-                    threading.Event().wait(0.01)
+                    # Blocks for the first byte, up to the port timeout, then
+                    # takes whatever else has arrived
+                    data = self.connection.read(1)
+                    if data and self.connection.in_waiting > 0:
+                        data += self.connection.read(self.connection.in_waiting)
+                    if data:
+                        self._on_data(data)
                 except serial.SerialException as e:
                     if self.on_error_callback:
                         self.on_error_callback(e)
@@ -79,13 +217,64 @@ class DataListener:
         finally:
             if self.on_close_callback:
                 self.on_close_callback()
+            self.readable.notify()
+
+    def _watch_device(self) -> None:
+        if self.device is None:
+            return
+
+        device_monitor = get_device_monitor()
+        device_monitor.register_source(
+            ConnectionTypeMap.SERIAL_PORT.value,
+            list_available_devices,
+            udev_subsystems=["tty"],
+            on_error=on_device_monitor_error,
+        )
+        self._unsubscribe_device_monitor = device_monitor.subscribe(
+            ConnectionTypeMap.SERIAL_PORT.value,
+            self._on_device_event,
+            present=[self.device],
+        )
+
+    def _on_device_event(self, event: DeviceEvent) -> None:
+        """
+        Close the port once the device is unplugged.
+        """
+        if event["type"] != "disconnect" or default_device_key(
+            event["device"]
+        ) != default_device_key(self.device):
+            return
+
+        # Called on the device monitor thread. With the loop reader, the
+        # teardown runs on its loop so the reader is removed before the port
+        # is closed and no queued read sees a closed descriptor.
+        loop = self._reader_loop
+        if loop is not None and not loop.is_closed():
+            try:
+                loop.call_soon_threadsafe(self._close_after_unplug)
+                return
+            except RuntimeError:
+                # The loop was closed meanwhile
+                pass
+
+        self._close_after_unplug()
+
+    def _close_after_unplug(self) -> None:
+        self.destroy()
+        if self.connection and self.connection.is_open:
+            self.connection.close()
+        self.readable.notify()
 
     def _on_data(self, data: bytes) -> None:
         """
         Handle incoming data.
         """
-        with self.pool_lock:
-            self.pool.append({"id": str(uuid.uuid4()), "data": bytearray(data)})
+        frame = bytearray(data)
+        # A full pool only holds the thread back with the `BLOCK` policy
+        while self.pool.put(frame, timeout=0.1) is None:
+            if not self.listening:
+                return
+        self.readable.notify()
 
     def _on_close(self) -> None:
         if self.on_close_callback:
@@ -97,3 +286,7 @@ class DataListener:
         """
         if self.on_error_callback:
             self.on_error_callback(error)
+
+
+def on_device_monitor_error(error: Exception) -> None:
+    logger.error(f"Error in device monitor: {error}")
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark of the WebUSB data listener against a fake
+`usb.core.Device`.
+
+The fake device takes a fixed time per bulk IN transfer, like a device that
+streams data as fast as the bus allows. Reading through a thread pool hop per
+`receive` (`in_flight` 0) is compared with the read pipeline at different
+`in_flight` settings by reporting transfers/sec and bytes/sec.
+
+Usage:
+    python packages/hw_webusb/benchmarks/reader.py [--transfers 5000]
+"""
+
+import argparse
+import asyncio
+import sys
+import threading
+import time
+from typing import List, Optional, Tuple
+
+from hw_webusb.helpers import DataListener
+
+DEFAULT_TRANSFERS = 5000
+TRANSFER_SIZE = 64
+TRANSFER_TIME = 0.0002
+
+
+class FakeUsbDevice:
+    """Completes `total` bulk IN transfers, each after `TRANSFER_TIME`."""
+
+    def __init__(self, total: int):
+        self.remaining = total
+        self.data = bytes(range(TRANSFER_SIZE))
+        self.lock = threading.Lock()
+
+    def read(self, endpoint: int, size: int, timeout: int = 1000) -> bytes:
+        time.sleep(TRANSFER_TIME)
+        with self.lock:
+            if self.remaining <= 0:
+                return b""
+            self.remaining -= 1
+        return self.data[:size]
+
+
+async def measure(total: int, in_flight: int) -> Tuple[int, float]:
+    listener = DataListener(
+        {
+            "connection": FakeUsbDevice(total),
+            "interface_number": 0,
+            "endpoint_in": 0x81,
+            "endpoint_out": 0x01,
+            "in_flight": in_flight,
+        }
+    )
+
+    start = time.perf_counter()
+    received = 0
+    while received < total:
+        data = await listener.receive()
+        if data is None:
+            await listener.wait_readable(0.1)
+            continue
+        received += 1
+
+    elapsed = time.perf_counter() - start
+    listener.destroy()
+    return received, elapsed
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--transfers", type=int, default=DEFAULT_TRANSFERS)
+    parser.add_argument("--in-flight", type=int, nargs="+", default=[0, 1, 2, 4, 8])
+    args = parser.parse_args(argv)
+
+    for in_flight in args.in_flight:
+        received, elapsed = asyncio.run(measure(args.transfers, in_flight))
+        print(
+            f"in_flight {in_flight:2}  {received / elapsed:10.0f} transfers/s"
+            f"  {received * TRANSFER_SIZE / elapsed / 1e6:8.2f} MB/s"
+        )
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
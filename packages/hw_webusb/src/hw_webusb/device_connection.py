@@ -1,5 +1,5 @@
 import uuid
-from typing import List, Optional
+from typing import List, Optional, Sequence
 
 import usb.core
 import usb.util
@@ -11,7 +11,7 @@ from interfaces import (
     PoolData,
 )
 
-from .helpers import DataListener, create_port
+from .helpers import DEFAULT_IN_FLIGHT, DataListener, create_port
 from .logger import logger
 
 
@@ -29,14 +29,14 @@ class DeviceConnection(IDeviceConnection):
         return ConnectionTypeMap.WEBUSB
 
     @staticmethod
-    async def connect(connection: usb.core.Device):
-        data_listener = await DataListener.create(connection)
+    async def connect(connection: usb.core.Device, in_flight: int = DEFAULT_IN_FLIGHT):
+        data_listener = await DataListener.create(connection, in_flight)
         return DeviceConnection(connection, data_listener)
 
     @staticmethod
-    async def create() -> "DeviceConnection":
+    async def create(in_flight: int = DEFAULT_IN_FLIGHT) -> "DeviceConnection":
         connection = await create_port()
-        return await DeviceConnection.connect(connection)
+        return await DeviceConnection.connect(connection, in_flight)
 
     async def get_device_state(self) -> DeviceState:
         return self.device_state
@@ -52,12 +52,15 @@ class DeviceConnection(IDeviceConnection):
         return self.sequence_number
 
     async def is_connected(self) -> bool:
+        if not self.data_listener.is_listening():
+            return False
         try:
             return self.connection.is_kernel_driver_active(0) is not None
         except Exception:
             return False
 
     async def destroy(self) -> None:
+        self.data_listener.destroy()
         await self.close()
 
     async def before_operation(self) -> None:
@@ -69,12 +72,21 @@ class DeviceConnection(IDeviceConnection):
     async def send(self, data: bytearray) -> None:
         return await self.data_listener.send(data)
 
+    async def send_many(self, packets: Sequence[bytes]) -> None:
+        return await self.data_listener.send_many(packets)
+
     async def receive(self) -> Optional[bytearray]:
         return await self.data_listener.receive()
 
+    async def wait_readable(self, timeout: Optional[float] = None) -> bool:
+        return await self.data_listener.wait_readable(timeout)
+
     async def peek(self) -> List[PoolData]:
         return await self.data_listener.peek()
 
+    async def peek_since(self, last_id: int) -> List[PoolData]:
+        return await self.data_listener.peek_since(last_id)
+
     async def close(self) -> None:
         try:
             usb.util.dispose_resources(self.connection)
@@ -1,4 +1,12 @@
-from .connection import create_port
+from .connection import create_port, format_device_info, list_available_devices
 from .data_listeners import DataListener
+from .read_pipeline import DEFAULT_IN_FLIGHT, ReadPipeline
 
-__all__ = ["create_port", "DataListener"]
+__all__ = [
+    "create_port",
+    "format_device_info",
+    "list_available_devices",
+    "DataListener",
+    "DEFAULT_IN_FLIGHT",
+    "ReadPipeline",
+]
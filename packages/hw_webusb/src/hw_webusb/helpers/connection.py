@@ -1,6 +1,12 @@
+from typing import Any, Dict, List
+
 import usb.core
 import usb.util
-from interfaces import DeviceConnectionError, DeviceConnectionErrorType
+from interfaces import (
+    ConnectionTypeMap,
+    DeviceConnectionError,
+    DeviceConnectionErrorType,
+)
 from ..logger import logger
 
 supported_devices = [{"vendorId": 0x3503, "productId": 259}]
@@ -32,3 +38,28 @@ async def create_port() -> usb.core.Device:
     except Exception as e:
         logger.error(f"Unexpected error when finding device: {e}")
         raise DeviceConnectionError(DeviceConnectionErrorType.NOT_CONNECTED)
+
+
+def format_device_info(device: usb.core.Device) -> Dict[str, Any]:
+    # Reading the serial number needs a control transfer, so the device is
+    # identified by its position on the bus instead
+    return {
+        "path": f"{device.bus}:{device.address}",
+        "vendor_id": device.idVendor,
+        "product_id": device.idProduct,
+        "type": ConnectionTypeMap.WEBUSB.value,
+    }
+
+
+def list_available_devices() -> List[Dict[str, Any]]:
+    devices: List[Dict[str, Any]] = []
+    for device_filter in supported_devices:
+        devices.extend(
+            format_device_info(device)
+            for device in usb.core.find(
+                idVendor=device_filter["vendorId"],
+                idProduct=device_filter["productId"],
+                find_all=True,
+            )
+        )
+    return devices
@@ -1,30 +1,74 @@
 import asyncio
-import uuid
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Sequence
 
 import usb.core
 import usb.util
 
 from interfaces import (
+    ConnectionTypeMap,
     DeviceConnectionError,
     DeviceConnectionErrorType,
     PoolData,
 )
 
+from util.utils import (
+    DEFAULT_POOL_CAPACITY,
+    DeviceEvent,
+    FramePool,
+    FramePoolOverflow,
+    ReadableSignal,
+    default_device_key,
+    get_device_monitor,
+)
+
 from ..logger import logger
+from .connection import format_device_info, list_available_devices
+from .read_pipeline import DEFAULT_IN_FLIGHT, ReadPipeline
 
 
 class DataListener:
+    """
+    Reads bulk IN transfers of a WebUSB device into a pool.
+
+    With a positive `in_flight` a `ReadPipeline` keeps requesting transfers
+    from a dedicated thread. With `in_flight` set to 0 every read is a
+    thread pool hop started by `receive`, `wait_readable` or `peek`.
+    """
+
     def __init__(self, params: Dict[str, Any]):
         self.connection: usb.core.Device = params["connection"]
         self.interface_number: int = params["interface_number"]
         self.endpoint_in: int = params["endpoint_in"]
         self.endpoint_out: int = params["endpoint_out"]
         self.listening: bool = True
-        self.pool: List[PoolData] = []
+        self.pool = FramePool(
+            params.get("pool_capacity", DEFAULT_POOL_CAPACITY),
+            params.get("pool_overflow", FramePoolOverflow.DROP_OLDEST),
+        )
+        self.readable = ReadableSignal()
+        self.read_task: Optional[asyncio.Task] = None
+        self.device: Optional[Dict[str, Any]] = params.get("device")
+        self._unsubscribe_device_monitor: Optional[Callable[[], None]] = None
+        in_flight: int = params.get("in_flight", DEFAULT_IN_FLIGHT)
+        self.read_pipeline: Optional[ReadPipeline] = (
+            ReadPipeline(
+                self.connection,
+                self.endpoint_in,
+                self.pool,
+                self.readable,
+                in_flight=in_flight,
+            )
+            if in_flight > 0
+            else None
+        )
+        if self.read_pipeline:
+            self.read_pipeline.start()
+        self._watch_device()
 
     @staticmethod
-    async def create(connection: usb.core.Device) -> "DataListener":
+    async def create(
+        connection: usb.core.Device, in_flight: int = DEFAULT_IN_FLIGHT
+    ) -> "DataListener":
         interface_number = 0
         endpoint_in = 0
         endpoint_out = 0
@@ -74,6 +118,8 @@ class DataListener:
                     "interface_number": interface_number,
                     "endpoint_in": endpoint_in,
                     "endpoint_out": endpoint_out,
+                    "device": format_device_info(connection),
+                    "in_flight": in_flight,
                 }
             )
 
@@ -87,11 +133,78 @@ class DataListener:
     def is_listening(self) -> bool:
         return self.listening
 
+    def destroy(self) -> None:
+        self.listening = False
+        self.pool.close()
+        if self.read_pipeline:
+            self.read_pipeline.stop()
+        if self._unsubscribe_device_monitor:
+            self._unsubscribe_device_monitor()
+            self._unsubscribe_device_monitor = None
+        self.readable.notify()
+
+    def _watch_device(self) -> None:
+        if self.device is None:
+            return
+
+        device_monitor = get_device_monitor()
+        device_monitor.register_source(
+            ConnectionTypeMap.WEBUSB.value,
+            list_available_devices,
+            udev_subsystems=["usb"],
+            on_error=on_device_monitor_error,
+        )
+        self._unsubscribe_device_monitor = device_monitor.subscribe(
+            ConnectionTypeMap.WEBUSB.value,
+            self._on_device_event,
+            present=[self.device],
+        )
+
+    def _on_device_event(self, event: DeviceEvent) -> None:
+        # Called on the device monitor thread
+        if event["type"] == "disconnect" and default_device_key(
+            event["device"]
+        ) == default_device_key(self.device):
+            self.destroy()
+
     async def receive(self) -> Optional[bytearray]:
+        if self.read_pipeline:
+            data = self.pool.get()
+            if data is not None:
+                self.read_pipeline.release()
+            return data
+
+        if not self.pool and self.read_task is not None and not self.read_task.done():
+            # A read started by `wait_readable` is in flight, take its result
+            await self.read_task
+            return self.pool.get()
+
         if self.pool:
-            return self.pool.pop(0).get("data")
+            return self.pool.get()
         return await self.receive_new()
 
+    async def wait_readable(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until a transfer from the device is pooled.
+
+        Without a read pipeline, starts a background read if none is in
+        flight; the read outlives a timed out wait so the next wait picks up
+        its result.
+        """
+        if (
+            not self.read_pipeline
+            and not self.pool
+            and (self.read_task is None or self.read_task.done())
+        ):
+            self.read_task = asyncio.create_task(self._read_into_pool())
+        return await self.readable.wait(lambda: len(self.pool) > 0, timeout)
+
+    async def _read_into_pool(self) -> None:
+        data = await self.receive_new()
+        if data:
+            await self.pool.put_async(data)
+            self.readable.notify()
+
     async def send(self, data: bytearray) -> None:
         try:
             # Use asyncio.to_thread to prevent blocking
@@ -103,11 +216,42 @@ class DataListener:
         except Exception as e:
             logger.error(f"Unexpected error during write: {e}")
 
+    async def send_many(self, packets: Sequence[bytes]) -> None:
+        try:
+            await asyncio.to_thread(self._write_usb_data, packets)
+        except usb.core.USBError as e:
+            logger.error(f"USB error during write: {e}")
+        except Exception as e:
+            logger.error(f"Unexpected error during write: {e}")
+
+    def _write_usb_data(self, packets: Sequence[bytes]) -> None:
+        # One bulk OUT transfer per packet, all from one worker thread
+        for packet in packets:
+            self.connection.write(self.endpoint_out, packet, timeout=1000)
+
     async def peek(self) -> List[PoolData]:
+        await self._read_for_peek()
+        return self._mark_peeked(self.pool.peek())
+
+    async def peek_since(self, last_id: int) -> List[PoolData]:
+        await self._read_for_peek()
+        return self._mark_peeked(self.pool.peek_since(last_id))
+
+    def _mark_peeked(self, frames: List[PoolData]) -> List[PoolData]:
+        # Consumers that only peek never take frames from the pool, so the
+        # pipeline is released by the frames they have seen
+        if self.read_pipeline and frames:
+            self.read_pipeline.release(frames[-1]["id"])
+        return frames
+
+    async def _read_for_peek(self) -> None:
+        # The pipeline keeps the pool filled on its own
+        if self.read_pipeline:
+            return
+
         new_data = await self.receive_new()
         if new_data:
-            self.pool.append({"id": str(uuid.uuid4()), "data": new_data})
-        return self.pool.copy()
+            await self.pool.put_async(new_data)
 
     async def receive_new(self) -> Optional[bytearray]:
         try:
@@ -137,3 +281,7 @@ class DataListener:
             if e.errno == 110:
                 return b""
             raise
+
+
+def on_device_monitor_error(error: Exception) -> None:
+    logger.error(f"Error in device monitor: {error}")
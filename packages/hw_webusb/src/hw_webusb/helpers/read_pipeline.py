@@ -0,0 +1,132 @@
+import errno
+import threading
+from typing import Callable, Optional
+
+import usb.core
+
+from util.utils import FramePool, ReadableSignal
+
+from ..logger import logger
+
+DEFAULT_IN_FLIGHT = 4
+READ_SIZE = 6 * 1024
+READ_TIMEOUT_MS = 1000
+ERROR_RETRY_TIME = 0.1
+
+
+class ReadPipeline:
+    """
+    Requests bulk IN transfers back to back from a dedicated thread.
+
+    The thread resubmits as soon as a transfer completes instead of waiting
+    for the event loop to ask for the next one, and pushes the data into the
+    pool. At most `in_flight` transfers are requested ahead of the consumer,
+    counting the pooled ones it has not seen yet, so a slow consumer leaves
+    the data in the device instead of dropping it. The consumer calls
+    `release` after taking data from the pool, or with the id of the newest
+    frame it peeked, to let the thread request the next transfer.
+
+    Transfers are requested one at a time. pyusb has no asynchronous transfer
+    API, and synchronous reads issued from several threads may return out of
+    order.
+    """
+
+    def __init__(
+        self,
+        connection: usb.core.Device,
+        endpoint: int,
+        pool: FramePool,
+        readable: ReadableSignal,
+        in_flight: int = DEFAULT_IN_FLIGHT,
+        on_error: Optional[Callable[[Exception], None]] = None,
+    ):
+        if in_flight <= 0:
+            raise ValueError("in_flight should be greater than 0")
+
+        self.connection = connection
+        self.endpoint = endpoint
+        self.pool = pool
+        self.readable = readable
+        self.in_flight = in_flight
+        self.on_error = on_error
+        self._taken = threading.Condition()
+        # Id of the newest pooled frame the consumer has peeked
+        self._seen_id = -1
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        with self._taken:
+            self._taken.notify_all()
+
+        thread, self._thread = self._thread, None
+        if thread and thread.is_alive() and thread is not threading.current_thread():
+            thread.join(timeout=READ_TIMEOUT_MS / 1000 + 0.5)
+
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def release(self, seen_id: Optional[int] = None) -> None:
+        """
+        Wake the thread after data was taken from the pool.
+
+        Args:
+            seen_id: Id of the newest frame peeked by the consumer, which
+                stops counting against `in_flight` while it stays pooled
+        """
+        with self._taken:
+            if seen_id is not None:
+                self._seen_id = max(self._seen_id, seen_id)
+            self._taken.notify()
+
+    def _get_unseen_count(self) -> int:
+        return len(self.pool.peek_since(self._seen_id))
+
+    def _acquire(self) -> bool:
+        # The transfer about to be requested is in flight too
+        with self._taken:
+            self._taken.wait_for(
+                lambda: self._stop_event.is_set()
+                or self._get_unseen_count() < self.in_flight
+            )
+            return not self._stop_event.is_set()
+
+    def _run(self) -> None:
+        while self._acquire():
+            try:
+                data = self.connection.read(self.endpoint, READ_SIZE, READ_TIMEOUT_MS)
+            except usb.core.USBError as error:
+                if error.errno == errno.ETIMEDOUT:
+                    continue
+                if not self._handle_error(error):
+                    return
+                continue
+            except Exception as error:
+                if not self._handle_error(error):
+                    return
+                continue
+
+            if data and self.pool.put(bytearray(data)) is not None:
+                self.readable.notify()
+
+    def _handle_error(self, error: Exception) -> bool:
+        """Report a failed transfer, False once the device is gone."""
+        logger.error(f"USB error during read: {error}")
+        if self.on_error:
+            self.on_error(error)
+
+        if getattr(error, "errno", None) == errno.ENODEV:
+            self.readable.notify()
+            return False
+
+        self._stop_event.wait(ERROR_RETRY_TIME)
+        return not self._stop_event.is_set()
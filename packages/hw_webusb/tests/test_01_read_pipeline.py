@@ -0,0 +1,84 @@
+import asyncio
+import threading
+import time
+
+from hw_webusb.helpers.data_listeners import DataListener
+
+
+class FakeUsbDevice:
+    """Completes `total` bulk IN transfers of one byte, then times out."""
+
+    def __init__(self, total: int):
+        self.remaining = total
+        self.reads = 0
+        self.lock = threading.Lock()
+
+    def read(self, endpoint: int, size: int, timeout: int = 1000) -> bytes:
+        with self.lock:
+            if self.remaining <= 0:
+                time.sleep(0.01)
+                return b""
+            self.remaining -= 1
+            self.reads += 1
+            return bytes([self.reads])
+
+
+def create_listener(device: FakeUsbDevice, in_flight: int) -> DataListener:
+    return DataListener(
+        {
+            "connection": device,
+            "interface_number": 0,
+            "endpoint_in": 0x81,
+            "endpoint_out": 0x01,
+            "in_flight": in_flight,
+        }
+    )
+
+
+async def wait_for_reads(device: FakeUsbDevice, reads: int) -> None:
+    for _ in range(100):
+        if device.reads >= reads:
+            return
+        await asyncio.sleep(0.01)
+
+
+class TestReadPipeline:
+    def test_stops_requesting_transfers_ahead_of_consumer(self):
+        async def run_test():
+            device = FakeUsbDevice(10)
+            listener = create_listener(device, in_flight=4)
+            try:
+                await wait_for_reads(device, 4)
+                await asyncio.sleep(0.05)
+                assert device.reads == 4
+
+                assert await listener.receive() == bytearray([1])
+                await wait_for_reads(device, 5)
+                await asyncio.sleep(0.05)
+                assert device.reads == 5
+            finally:
+                listener.destroy()
+
+        asyncio.run(run_test())
+
+    def test_keeps_reading_for_consumer_that_only_peeks(self):
+        async def run_test():
+            device = FakeUsbDevice(10)
+            listener = create_listener(device, in_flight=4)
+            try:
+                received = []
+                last_id = -1
+                for _ in range(100):
+                    frames = await listener.peek_since(last_id)
+                    if frames:
+                        last_id = frames[-1]["id"]
+                        received.extend(frame["data"][0] for frame in frames)
+                    if len(received) == 10:
+                        break
+                    await asyncio.sleep(0.01)
+
+                assert received == list(range(1, 11))
+            finally:
+                listener.destroy()
+
+        asyncio.run(run_test())
@@ -2,7 +2,11 @@ from .connection import (
     ConnectionTypeMap,
     DeviceState,
     IDevice,
+    IBatchDeviceConnection,
     IDeviceConnection,
+    IIdentifiableDeviceConnection,
+    IPeekableDeviceConnection,
+    IReadableDeviceConnection,
     PoolData,
 )
 from .logger import ILogger, LogCreator
@@ -18,12 +22,15 @@ from .errors.compatibility_error import (
     DeviceCompatibilityErrorType,
 )
 
-
 __all__ = [
     "ConnectionTypeMap",
     "DeviceState",
     "IDevice",
+    "IBatchDeviceConnection",
     "IDeviceConnection",
+    "IIdentifiableDeviceConnection",
+    "IPeekableDeviceConnection",
+    "IReadableDeviceConnection",
     "PoolData",
     "ILogger",
     "LogCreator",
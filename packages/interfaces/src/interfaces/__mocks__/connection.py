@@ -1,5 +1,5 @@
-import uuid
 import inspect
+import itertools
 from typing import List, Optional, Callable, Awaitable, Union
 
 from ..connection import ConnectionTypeMap, DeviceState, PoolData
@@ -11,6 +11,7 @@ class MockDeviceConnection:
         self.is_destroyed = False
         self.sequence_number = 0
         self.pool: List[PoolData] = []
+        self.packet_ids = itertools.count()
         self.device_state = DeviceState.MAIN
         self.connection_type = ConnectionTypeMap.SERIAL_PORT.value
         self.on_data: Optional[
@@ -77,7 +78,7 @@ class MockDeviceConnection:
                 pass
 
     async def mock_device_send(self, data: bytes) -> None:
-        packet_data = {"id": str(uuid.uuid4()), "data": data}
+        packet_data = {"id": next(self.packet_ids), "data": data}
         self.pool.append(packet_data)
 
     async def receive(self) -> Optional[bytes]:
@@ -89,3 +90,6 @@ class MockDeviceConnection:
 
     async def peek(self) -> List[PoolData]:
         return self.pool.copy()
+
+    async def peek_since(self, last_id: int) -> List[PoolData]:
+        return [packet for packet in self.pool if packet["id"] > last_id]
@@ -1,5 +1,12 @@
 from enum import Enum
-from typing import List, Optional, Protocol, TypedDict, runtime_checkable
+from typing import (
+    List,
+    Optional,
+    Protocol,
+    Sequence,
+    TypedDict,
+    runtime_checkable,
+)
 
 
 class ConnectionTypeMap(str, Enum):
@@ -24,7 +31,10 @@ class IDevice(TypedDict):
 
 
 class PoolData(TypedDict):
-    id: str
+    # Monotonic per connection, so a consumer can resume after the last id
+    # seen. Readers of `peek` only compare ids for equality, so connections
+    # that still use string ids keep working without `peek_since`.
+    id: int
     data: bytes
 
 
@@ -51,3 +61,77 @@ class IDeviceConnection(Protocol):
     async def peek(self) -> List[PoolData]: ...
 
     async def destroy(self) -> None: ...
+
+
+@runtime_checkable
+class IReadableDeviceConnection(Protocol):
+    """
+    Optional extension of `IDeviceConnection` for transports that can signal
+    packet arrival instead of being polled.
+    """
+
+    async def wait_readable(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until received data is available to `receive`.
+
+        Args:
+            timeout: Maximum time to wait in seconds, None to wait forever
+
+        Returns:
+            bool: True if data is available, False on timeout
+        """
+        ...
+
+
+@runtime_checkable
+class IBatchDeviceConnection(Protocol):
+    """
+    Optional extension of `IDeviceConnection` for transports that can write
+    several packets with less overhead than one `send` per packet.
+    """
+
+    async def send_many(self, packets: Sequence[bytes]) -> None:
+        """
+        Send packets in order, as if `send` was called for each of them.
+
+        Args:
+            packets: Packets to send
+        """
+        ...
+
+
+@runtime_checkable
+class IPeekableDeviceConnection(Protocol):
+    """
+    Optional extension of `IDeviceConnection` for transports that can return
+    only the pooled data received after a given id.
+    """
+
+    async def peek_since(self, last_id: int) -> List[PoolData]:
+        """
+        Get the pooled data with an id greater than `last_id`, oldest first.
+
+        Args:
+            last_id: Id of the last pool entry already seen, -1 for all
+
+        Returns:
+            List[PoolData]: Pool entries received after `last_id`
+        """
+        ...
+
+
+@runtime_checkable
+class IIdentifiableDeviceConnection(Protocol):
+    """
+    Optional extension of `IDeviceConnection` for transports that know the
+    serial number of the connected device.
+    """
+
+    async def get_device_serial(self) -> Optional[str]:
+        """
+        Get the serial number the device was enumerated with.
+
+        Returns:
+            Optional[str]: Serial number, None if the device did not report one
+        """
+        ...
@@ -4,6 +4,8 @@ from .create_flow_status import create_flow_status
 from .create_status_listener import create_status_listener, ForceStatusUpdate, OnStatus
 from .crypto import (
     crc16,
+    crc16_batch,
+    Crc16,
     is_hex,
     format_hex,
     hex_to_uint8array,
@@ -14,11 +16,19 @@ from .crypto import (
     sha256,
     num_to_byte_array,
 )
+from .device_monitor import (
+    DeviceEvent,
+    DeviceMonitor,
+    default_device_key,
+    get_device_monitor,
+)
+from .frame_pool import DEFAULT_POOL_CAPACITY, FramePool, FramePoolOverflow
 from .logger import (
     create_default_console_logger,
     update_logger_object,
     create_logger_with_prefix,
 )
+from .readable_signal import ReadableSignal
 from .queryString import create_query_string, parse_query_string
 from .sleep import sleep
 from .version import string_to_version
@@ -32,6 +42,8 @@ __all__ = [
     "ForceStatusUpdate",
     "OnStatus",
     "crc16",
+    "crc16_batch",
+    "Crc16",
     "is_hex",
     "format_hex",
     "hex_to_uint8array",
@@ -41,11 +53,19 @@ __all__ = [
     "hex_to_ascii",
     "sha256",
     "num_to_byte_array",
+    "DeviceEvent",
+    "DeviceMonitor",
+    "default_device_key",
+    "get_device_monitor",
+    "DEFAULT_POOL_CAPACITY",
+    "FramePool",
+    "FramePoolOverflow",
     "create_default_console_logger",
     "update_logger_object",
     "create_logger_with_prefix",
     "create_query_string",
     "parse_query_string",
+    "ReadableSignal",
     "sleep",
     "string_to_version",
 ]
@@ -1,5 +1,6 @@
+import binascii
 import hashlib
-from typing import List, Union
+from typing import Iterable, List, Union
 import re
 from .assert_utils import assert_condition
 
@@ -44,14 +45,72 @@ def crc16(data_buff: bytes) -> int:
     """
     assert_condition(data_buff is not None, "Data buffer cannot be empty")
 
-    crc = 0
-    for i in data_buff:
-        crc = update_crc16(crc, i)
+    return Crc16(data_buff).digest()
 
-    crc = update_crc16(crc, 0)
-    crc = update_crc16(crc, 0)
 
-    return crc & 0xFFFF
+def _to_buffer(data_buff: bytes) -> bytes:
+    # binascii only takes buffers, lists of ints are copied into bytes
+    if isinstance(data_buff, (bytes, bytearray, memoryview)):
+        return data_buff
+    return bytes(data_buff)
+
+
+class Crc16:
+    """
+    Incremental CRC16-XMODEM, giving the same result as `crc16` over the
+    concatenation of every buffer passed to `update`.
+
+    `binascii.crc_hqx` is the table-driven CRC-CCITT (XMODEM) implementation
+    shipped with CPython, so each update runs in C.
+    """
+
+    __slots__ = ("_crc",)
+
+    def __init__(self, data_buff: bytes = b""):
+        self._crc = 0
+        if data_buff:
+            self.update(data_buff)
+
+    def update(self, data_buff: bytes) -> "Crc16":
+        """
+        Feed more data into the checksum.
+
+        Args:
+            data_buff: Byte array to add
+
+        Returns:
+            Crc16: The same object, to allow chaining
+        """
+        self._crc = binascii.crc_hqx(_to_buffer(data_buff), self._crc)
+        return self
+
+    def digest(self) -> int:
+        return self._crc
+
+    def hexdigest(self) -> str:
+        return f"{self._crc:04x}"
+
+    def copy(self) -> "Crc16":
+        other = Crc16()
+        other._crc = self._crc
+        return other
+
+
+def crc16_batch(data_buffs: Iterable[bytes]) -> List[int]:
+    """
+    Calculate CRC16 for each byte array in a list of frames.
+
+    Args:
+        data_buffs: Byte arrays to calculate CRC for, taking the same inputs
+            as `crc16`
+
+    Returns:
+        List[int]: CRC16 value of every byte array, in order
+    """
+    assert_condition(data_buffs is not None, "Data buffers cannot be empty")
+
+    crc_hqx = binascii.crc_hqx
+    return [crc_hqx(_to_buffer(data_buff), 0) for data_buff in data_buffs]
 
 
 def is_hex(maybe_hex: str) -> bool:
@@ -0,0 +1,309 @@
+import sys
+import threading
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    List,
+    Literal,
+    Optional,
+    Sequence,
+    Set,
+    TypedDict,
+)
+
+try:
+    import pyudev
+
+    UDEV_AVAILABLE = sys.platform.startswith("linux")
+except ImportError:
+    pyudev = None
+    UDEV_AVAILABLE = False
+
+DEFAULT_INTERVAL = 1.0
+UDEV_RESCAN_INTERVAL = 10.0
+UDEV_SETTLE_TIME = 0.05
+
+DeviceInfo = Dict[str, Any]
+EnumerateDevices = Callable[[], List[DeviceInfo]]
+DeviceKey = Callable[[DeviceInfo], Hashable]
+
+
+class DeviceEvent(TypedDict):
+    type: Literal["connect", "disconnect"]
+    source: str
+    device: DeviceInfo
+
+
+DeviceEventListener = Callable[[DeviceEvent], None]
+
+
+def default_device_key(device: DeviceInfo) -> Hashable:
+    return tuple(
+        device.get(field)
+        for field in [
+            "path",
+            "serial",
+            "vendor_id",
+            "product_id",
+            "type",
+            "device_state",
+        ]
+    )
+
+
+class _Source:
+    def __init__(
+        self,
+        enumerate_devices: EnumerateDevices,
+        key: DeviceKey,
+        udev_subsystems: Sequence[str],
+        on_error: Optional[Callable[[Exception], None]],
+    ):
+        self.enumerate_devices = enumerate_devices
+        self.key = key
+        self.udev_subsystems = list(udev_subsystems)
+        self.on_error = on_error
+        self.devices: Dict[Hashable, DeviceInfo] = {}
+        self.listeners: List[DeviceEventListener] = []
+
+
+class DeviceMonitor:
+    """
+    Watches device sources and fans connect and disconnect events out to
+    subscribers.
+
+    A source is one transport's way of enumerating devices. Every source with
+    subscribers is enumerated once per `interval` on a single thread, however
+    many connections are open. On Linux with `pyudev` installed the thread
+    sleeps on udev netlink events instead and rescans only when the kernel
+    reports a change on one of the source's subsystems, falling back to a
+    rescan every `UDEV_RESCAN_INTERVAL` seconds.
+
+    Listeners are called on the monitor thread.
+    """
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL, use_udev: bool = True):
+        self.interval = interval
+        self.use_udev = use_udev and UDEV_AVAILABLE
+        self._sources: Dict[str, _Source] = {}
+        self._lock = threading.RLock()
+        self._wake_event = threading.Event()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def register_source(
+        self,
+        source: str,
+        enumerate_devices: EnumerateDevices,
+        key: DeviceKey = default_device_key,
+        udev_subsystems: Sequence[str] = (),
+        on_error: Optional[Callable[[Exception], None]] = None,
+    ) -> None:
+        """
+        Register how devices of a source are enumerated.
+
+        Registering an already known source is a no-op, so every connection
+        of a transport may register it.
+
+        Args:
+            source: Name of the source, usually the connection type
+            enumerate_devices: Blocking function listing the connected devices
+            key: Identifies a device across enumerations
+            udev_subsystems: udev subsystems whose events trigger a rescan
+            on_error: Called with errors raised by `enumerate_devices`
+        """
+        with self._lock:
+            if source not in self._sources:
+                self._sources[source] = _Source(
+                    enumerate_devices, key, udev_subsystems, on_error
+                )
+
+    def subscribe(
+        self,
+        source: str,
+        listener: DeviceEventListener,
+        present: Sequence[DeviceInfo] = (),
+    ) -> Callable[[], None]:
+        """
+        Subscribe to the events of a registered source.
+
+        Starts the monitor thread if needed and triggers a scan. Devices the
+        subscriber knows to be connected, such as the one it just opened, are
+        passed as `present`; they are added to the snapshot so the scan
+        reports a `disconnect` if they are already gone. Other devices found by
+        the first scan of a source are reported as `connect` events.
+
+        Args:
+            source: Name of a registered source
+            listener: Called on the monitor thread with every event
+            present: Devices known to be connected
+
+        Returns:
+            Callable[[], None]: Removes the subscription
+        """
+        with self._lock:
+            if source not in self._sources:
+                raise ValueError(f"Unknown device source: {source}")
+
+            source_info = self._sources[source]
+            for device in present:
+                source_info.devices.setdefault(source_info.key(device), device)
+            source_info.listeners.append(listener)
+            self._start()
+
+        return lambda: self.unsubscribe(source, listener)
+
+    def unsubscribe(self, source: str, listener: DeviceEventListener) -> None:
+        """Remove a listener; the thread stops once no listener is left."""
+        with self._lock:
+            source_info = self._sources.get(source)
+            if source_info and listener in source_info.listeners:
+                source_info.listeners.remove(listener)
+                if not source_info.listeners:
+                    # The snapshot goes stale while nobody watches the source
+                    source_info.devices = {}
+
+            if not self._has_listeners():
+                self._stop()
+
+    def get_devices(self, source: str) -> List[DeviceInfo]:
+        """Get the devices seen by the last scan of a source."""
+        with self._lock:
+            source_info = self._sources.get(source)
+            return list(source_info.devices.values()) if source_info else []
+
+    def poll(self) -> None:
+        """Scan every source with subscribers once and dispatch the changes."""
+        with self._lock:
+            sources = [
+                (name, source_info)
+                for name, source_info in self._sources.items()
+                if source_info.listeners
+            ]
+
+        for name, source_info in sources:
+            self._scan(name, source_info)
+
+    def _scan(self, name: str, source_info: _Source) -> None:
+        try:
+            devices = {
+                source_info.key(device): device
+                for device in source_info.enumerate_devices()
+            }
+        except Exception as error:
+            if source_info.on_error:
+                source_info.on_error(error)
+            return
+
+        with self._lock:
+            previous = source_info.devices
+            source_info.devices = devices
+            listeners = list(source_info.listeners)
+
+        events: List[DeviceEvent] = [
+            {"type": "disconnect", "source": name, "device": device}
+            for key, device in previous.items()
+            if key not in devices
+        ] + [
+            {"type": "connect", "source": name, "device": device}
+            for key, device in devices.items()
+            if key not in previous
+        ]
+
+        for event in events:
+            for listener in listeners:
+                try:
+                    listener(event)
+                except Exception as error:
+                    if source_info.on_error:
+                        source_info.on_error(error)
+
+    def _has_listeners(self) -> bool:
+        return any(source_info.listeners for source_info in self._sources.values())
+
+    def _start(self) -> None:
+        if self._thread and self._thread.is_alive() and not self._stop_event.is_set():
+            self._wake_event.set()
+            return
+
+        # Each thread owns its stop event, so a thread still finishing its
+        # last wait never picks up the event of its successor
+        self._stop_event = threading.Event()
+        self._wake_event.clear()
+        self._thread = threading.Thread(
+            target=self._run, args=(self._stop_event,), daemon=True
+        )
+        self._thread.start()
+
+    def _stop(self) -> None:
+        self._stop_event.set()
+        self._wake_event.set()
+        self._thread = None
+
+    def _run(self, stop_event: threading.Event) -> None:
+        udev_monitor = None
+        udev_subsystems: Set[str] = set()
+
+        while not stop_event.is_set():
+            self.poll()
+            self._wake_event.clear()
+
+            if self.use_udev:
+                subsystems = self._get_udev_subsystems()
+                if subsystems != udev_subsystems:
+                    udev_subsystems = subsystems
+                    udev_monitor = self._create_udev_monitor(subsystems)
+
+            if udev_monitor is not None:
+                self._wait_for_udev_event(udev_monitor)
+            else:
+                self._wake_event.wait(self.interval)
+
+    def _get_udev_subsystems(self) -> Set[str]:
+        with self._lock:
+            return {
+                subsystem
+                for source_info in self._sources.values()
+                for subsystem in source_info.udev_subsystems
+            }
+
+    @staticmethod
+    def _create_udev_monitor(subsystems: Set[str]) -> Optional[Any]:
+        if not subsystems:
+            return None
+
+        try:
+            monitor = pyudev.Monitor.from_netlink(pyudev.Context())
+            for subsystem in sorted(subsystems):
+                monitor.filter_by(subsystem)
+            monitor.start()
+            return monitor
+        except Exception:
+            # No netlink access, e.g. inside a container
+            return None
+
+    def _wait_for_udev_event(self, udev_monitor: Any) -> None:
+        # Wake at least every `interval` to notice a stop or a new subscriber
+        waited = 0.0
+        while waited < UDEV_RESCAN_INTERVAL and not self._wake_event.is_set():
+            if udev_monitor.poll(timeout=self.interval) is not None:
+                # A plug emits a burst of events; drain it before rescanning
+                while udev_monitor.poll(timeout=UDEV_SETTLE_TIME) is not None:
+                    pass
+                return
+            waited += self.interval
+
+
+_device_monitor: Optional[DeviceMonitor] = None
+_device_monitor_lock = threading.Lock()
+
+
+def get_device_monitor() -> DeviceMonitor:
+    """Get the device monitor shared by every transport of the process."""
+    global _device_monitor
+    with _device_monitor_lock:
+        if _device_monitor is None:
+            _device_monitor = DeviceMonitor()
+        return _device_monitor
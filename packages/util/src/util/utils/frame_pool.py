@@ -0,0 +1,140 @@
+import asyncio
+import threading
+from collections import deque
+from enum import Enum
+from typing import Deque, List, Optional
+
+from interfaces.connection import PoolData
+
+DEFAULT_POOL_CAPACITY = 1024
+
+
+class FramePoolOverflow(Enum):
+    # Discard the oldest frame to make room for the new one
+    DROP_OLDEST = "drop_oldest"
+    # Make the reader wait until the consumer frees a slot
+    BLOCK = "block"
+
+
+class FramePool:
+    """
+    Bounded FIFO of frames received from a device.
+
+    Frames get monotonic integer ids, so a consumer that only peeks keeps a
+    cursor and asks for the frames after it with `peek_since`. Producers may
+    run on any thread. When the pool is full the `overflow` policy either
+    drops the oldest frame, counted in `dropped`, or blocks the producer until
+    a frame is taken or the pool is closed.
+    """
+
+    def __init__(
+        self,
+        capacity: int = DEFAULT_POOL_CAPACITY,
+        overflow: FramePoolOverflow = FramePoolOverflow.DROP_OLDEST,
+    ):
+        if capacity <= 0:
+            raise ValueError("capacity should be greater than 0")
+
+        self.capacity = capacity
+        self.overflow = overflow
+        self.dropped = 0
+        self._frames: Deque[PoolData] = deque()
+        self._next_id = 0
+        self._closed = False
+        self._not_full = threading.Condition(threading.Lock())
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+    @property
+    def last_id(self) -> int:
+        """Id of the newest frame ever stored, -1 before the first one."""
+        return self._next_id - 1
+
+    def put(self, data: bytes, timeout: Optional[float] = None) -> Optional[int]:
+        """
+        Store a frame.
+
+        Args:
+            data: Frame received from the device
+            timeout: Longest time to wait for a free slot with the `BLOCK`
+                policy, None to wait until one is freed or the pool closes
+
+        Returns:
+            Optional[int]: Id of the stored frame, None if it was not stored
+        """
+        with self._not_full:
+            # A closed pool keeps its frames for `get`, even when full
+            if self._closed:
+                return None
+
+            if len(self._frames) >= self.capacity:
+                if self.overflow is FramePoolOverflow.DROP_OLDEST:
+                    self._frames.popleft()
+                    self.dropped += 1
+                elif not self._not_full.wait_for(
+                    lambda: self._closed or len(self._frames) < self.capacity,
+                    timeout,
+                ):
+                    return None
+
+            if self._closed:
+                return None
+
+            frame_id = self._next_id
+            self._next_id += 1
+            self._frames.append({"id": frame_id, "data": data})
+            return frame_id
+
+    async def put_async(self, data: bytes) -> Optional[int]:
+        """
+        Store a frame from the event loop.
+
+        With the `BLOCK` policy the wait for a free slot happens on a worker
+        thread so the loop keeps running.
+        """
+        if self.overflow is FramePoolOverflow.DROP_OLDEST:
+            return self.put(data)
+        return await asyncio.to_thread(self.put, data)
+
+    def get(self) -> Optional[bytes]:
+        """Remove and return the oldest frame, None if the pool is empty."""
+        with self._not_full:
+            if not self._frames:
+                return None
+
+            frame = self._frames.popleft()
+            self._not_full.notify()
+            return frame["data"]
+
+    def peek(self) -> List[PoolData]:
+        """Get a copy of the pooled frames without removing them."""
+        with self._not_full:
+            return list(self._frames)
+
+    def peek_since(self, last_id: int) -> List[PoolData]:
+        """
+        Get the pooled frames with an id greater than `last_id`.
+
+        Walks from the newest frame, so the cost depends on the number of new
+        frames and not on the size of the pool.
+        """
+        frames: List[PoolData] = []
+        with self._not_full:
+            for frame in reversed(self._frames):
+                if frame["id"] <= last_id:
+                    break
+                frames.append(frame)
+        frames.reverse()
+        return frames
+
+    def clear(self) -> None:
+        with self._not_full:
+            self._frames.clear()
+            self._not_full.notify_all()
+
+    def close(self) -> None:
+        """Reject further frames and release blocked producers."""
+        with self._not_full:
+            self._closed = True
+            self._not_full.notify_all()
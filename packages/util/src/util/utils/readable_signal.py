@@ -0,0 +1,69 @@
+import asyncio
+from typing import Callable, Optional
+
+
+class ReadableSignal:
+    """
+    Wakes coroutines waiting for data delivered by a reader thread or callback.
+
+    `notify` may be called from any thread; the wakeup is scheduled on the
+    event loop of the waiter with `call_soon_threadsafe`.
+    """
+
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._event: Optional[asyncio.Event] = None
+
+    def _bind(self) -> asyncio.Event:
+        loop = asyncio.get_running_loop()
+        if self._event is None or self._loop is not loop:
+            self._loop = loop
+            self._event = asyncio.Event()
+        return self._event
+
+    def notify(self) -> None:
+        loop, event = self._loop, self._event
+        if loop is None or event is None or loop.is_closed():
+            return
+
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+
+        if running_loop is loop:
+            event.set()
+            return
+
+        try:
+            loop.call_soon_threadsafe(event.set)
+        except RuntimeError:
+            # The loop was closed after the check above
+            pass
+
+    async def wait(
+        self, is_ready: Callable[[], bool], timeout: Optional[float] = None
+    ) -> bool:
+        """
+        Wait until `is_ready` returns True or a notification arrives.
+
+        The event is cleared before `is_ready` is checked, so data delivered
+        between the check and the wait is not missed.
+
+        Args:
+            is_ready: Returns True if data is already available
+            timeout: Maximum time to wait in seconds, None to wait forever
+
+        Returns:
+            bool: True if data is available or a notification arrived
+        """
+        event = self._bind()
+        event.clear()
+        if is_ready():
+            return True
+
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+        except asyncio.TimeoutError:
+            return is_ready()
+        return True
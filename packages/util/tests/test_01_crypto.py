@@ -1,6 +1,8 @@
 import pytest
 from util.utils.crypto import (
+    Crc16,
     crc16,
+    crc16_batch,
     is_hex,
     hex_to_uint8array,
     uint8array_to_hex,
@@ -392,3 +394,32 @@ class TestCrypto:
         for test_case in test_cases:
             result = crc16(test_case["uint8"])
             assert result == test_case["result"]
+
+    def test_crc16_incremental(self):
+        data = bytes(range(256)) * 4
+        expected = crc16(data)
+
+        for split in [0, 1, 7, 48, 512, len(data)]:
+            checksum = Crc16()
+            checksum.update(data[:split]).update(memoryview(data)[split:])
+            assert checksum.digest() == expected
+
+        checksum = Crc16(data[:100])
+        copy = checksum.copy()
+        copy.update(data[100:])
+        assert copy.digest() == expected
+        assert checksum.digest() == crc16(data[:100])
+        assert Crc16(bytes([0x00, 0x01])).hexdigest() == "1021"
+        assert Crc16().digest() == 0
+
+    def test_crc16_batch(self):
+        frames = [bytes(), bytes([1, 2, 3]), bytes(range(64)), bytearray(b"xmodem")]
+        assert crc16_batch(frames) == [crc16(frame) for frame in frames]
+        assert crc16_batch([]) == []
+        assert crc16_batch([[1, 2, 3], range(64)]) == [
+            crc16([1, 2, 3]),
+            crc16(bytes(range(64))),
+        ]
+
+        with pytest.raises(Exception):
+            crc16_batch(None)
@@ -0,0 +1,53 @@
+import asyncio
+import threading
+
+from util.utils.readable_signal import ReadableSignal
+
+
+class TestReadableSignal:
+    def test_returns_immediately_when_ready(self):
+        async def run_test():
+            signal = ReadableSignal()
+            assert await signal.wait(lambda: True, 0)
+
+        asyncio.run(run_test())
+
+    def test_times_out_without_notification(self):
+        async def run_test():
+            signal = ReadableSignal()
+            assert not await signal.wait(lambda: False, 0.01)
+
+        asyncio.run(run_test())
+
+    def test_wakes_on_notification_from_thread(self):
+        async def run_test():
+            signal = ReadableSignal()
+            pool = []
+
+            def deliver():
+                pool.append(b"\x01")
+                signal.notify()
+
+            loop = asyncio.get_running_loop()
+            waiter = asyncio.create_task(signal.wait(lambda: len(pool) > 0, 5))
+            await asyncio.sleep(0)
+
+            start = loop.time()
+            thread = threading.Thread(target=deliver)
+            thread.start()
+            assert await waiter
+            assert loop.time() - start < 1
+            thread.join()
+
+        asyncio.run(run_test())
+
+    def test_ignores_notification_without_waiter(self):
+        signal = ReadableSignal()
+        signal.notify()
+
+        async def run_test():
+            assert not await signal.wait(lambda: False, 0.01)
+
+        asyncio.run(run_test())
+        # The loop of the last waiter is closed now
+        signal.notify()
@@ -0,0 +1,135 @@
+import threading
+
+import pytest
+
+from util.utils.device_monitor import DeviceMonitor, get_device_monitor
+
+
+class FakeEnumerator:
+    def __init__(self, devices=None):
+        self.devices = list(devices or [])
+        self.calls = 0
+        self.called = threading.Event()
+
+    def __call__(self):
+        self.calls += 1
+        self.called.set()
+        return list(self.devices)
+
+
+def create_device(path: str):
+    return {"path": path, "serial": f"serial-{path}", "type": "hid"}
+
+
+class TestDeviceMonitor:
+    def test_reports_present_devices_as_connected_on_first_scan(self):
+        monitor = DeviceMonitor(interval=60, use_udev=False)
+        enumerator = FakeEnumerator([create_device("a")])
+        events = []
+
+        monitor.register_source("hid", enumerator)
+        monitor._sources["hid"].listeners.append(events.append)
+        monitor.poll()
+
+        assert [e["type"] for e in events] == ["connect"]
+        assert events[0]["device"]["path"] == "a"
+        assert monitor.get_devices("hid") == [create_device("a")]
+
+    def test_fans_out_connect_and_disconnect_events(self):
+        monitor = DeviceMonitor(interval=60, use_udev=False)
+        enumerator = FakeEnumerator([create_device("a")])
+        first, second = [], []
+
+        monitor.register_source("hid", enumerator)
+        monitor._sources["hid"].listeners.extend([first.append, second.append])
+        monitor.poll()
+        first.clear()
+        second.clear()
+
+        enumerator.devices = [create_device("b")]
+        monitor.poll()
+
+        expected = [("disconnect", "a"), ("connect", "b")]
+        assert [(e["type"], e["device"]["path"]) for e in first] == expected
+        assert [(e["type"], e["device"]["path"]) for e in second] == expected
+
+    def test_enumerates_once_per_scan_for_every_subscriber(self):
+        monitor = DeviceMonitor(interval=60, use_udev=False)
+        enumerator = FakeEnumerator([create_device("a")])
+
+        monitor.register_source("hid", enumerator)
+        monitor._sources["hid"].listeners.extend([lambda _: None] * 20)
+        monitor.poll()
+
+        assert enumerator.calls == 1
+
+    def test_skips_sources_without_subscribers(self):
+        monitor = DeviceMonitor(interval=60, use_udev=False)
+        enumerator = FakeEnumerator()
+
+        monitor.register_source("hid", enumerator)
+        monitor.poll()
+
+        assert enumerator.calls == 0
+
+    def test_reports_enumeration_and_listener_errors(self):
+        errors = []
+        monitor = DeviceMonitor(interval=60, use_udev=False)
+
+        def failing_enumerator():
+            raise RuntimeError("bus error")
+
+        def failing_listener(_):
+            raise RuntimeError("listener error")
+
+        monitor.register_source("hid", failing_enumerator, on_error=errors.append)
+        monitor.register_source(
+            "serial", FakeEnumerator([create_device("a")]), on_error=errors.append
+        )
+        monitor._sources["hid"].listeners.append(lambda _: None)
+        monitor._sources["serial"].listeners.append(failing_listener)
+        monitor.poll()
+
+        assert [str(e) for e in errors] == ["bus error", "listener error"]
+
+    def test_thread_runs_only_while_subscribed(self):
+        monitor = DeviceMonitor(interval=0.01, use_udev=False)
+        enumerator = FakeEnumerator([create_device("a")])
+        connected = threading.Event()
+
+        monitor.register_source("hid", enumerator)
+        unsubscribe = monitor.subscribe("hid", lambda _: connected.set())
+        assert connected.wait(1)
+        thread = monitor._thread
+
+        unsubscribe()
+        thread.join(1)
+        assert not thread.is_alive()
+        assert monitor.get_devices("hid") == []
+
+    def test_reports_present_devices_that_are_already_gone(self):
+        monitor = DeviceMonitor(interval=60, use_udev=False)
+        disconnected = threading.Event()
+        events = []
+
+        def listener(event):
+            events.append(event)
+            disconnected.set()
+
+        monitor.register_source("hid", FakeEnumerator())
+        unsubscribe = monitor.subscribe("hid", listener, present=[create_device("a")])
+        assert disconnected.wait(1)
+        unsubscribe()
+
+        assert [(e["type"], e["device"]["path"]) for e in events] == [
+            ("disconnect", "a")
+        ]
+
+    def test_rejects_unknown_sources(self):
+        monitor = DeviceMonitor(use_udev=False)
+
+        with pytest.raises(ValueError):
+            monitor.subscribe("hid", lambda _: None)
+
+    def test_shares_one_monitor_per_process(self):
+        assert get_device_monitor() is get_device_monitor()
@@ -0,0 +1,98 @@
+import asyncio
+import threading
+
+import pytest
+
+from util.utils.frame_pool import FramePool, FramePoolOverflow
+
+
+class TestFramePool:
+    def test_returns_frames_in_order_with_monotonic_ids(self):
+        pool = FramePool(capacity=4)
+
+        assert [pool.put(bytes([i])) for i in range(3)] == [0, 1, 2]
+        assert pool.last_id == 2
+        assert [pool.get() for _ in range(4)] == [b"\x00", b"\x01", b"\x02", None]
+
+    def test_drops_oldest_frames_when_full(self):
+        pool = FramePool(capacity=2)
+
+        for i in range(5):
+            pool.put(bytes([i]))
+
+        assert pool.dropped == 3
+        assert [frame["id"] for frame in pool.peek()] == [3, 4]
+
+    def test_peeks_frames_after_cursor(self):
+        pool = FramePool(capacity=8)
+        for i in range(5):
+            pool.put(bytes([i]))
+        pool.get()
+
+        assert [frame["id"] for frame in pool.peek_since(-1)] == [1, 2, 3, 4]
+        assert [frame["id"] for frame in pool.peek_since(2)] == [3, 4]
+        assert pool.peek_since(4) == []
+        assert len(pool) == 4
+
+    def test_blocks_producer_until_frame_is_taken(self):
+        pool = FramePool(capacity=1, overflow=FramePoolOverflow.BLOCK)
+        pool.put(b"\x00")
+        stored = []
+
+        producer = threading.Thread(target=lambda: stored.append(pool.put(b"\x01")))
+        producer.start()
+        producer.join(0.05)
+        assert producer.is_alive()
+
+        assert pool.get() == b"\x00"
+        producer.join(1)
+        assert stored == [1]
+        assert pool.dropped == 0
+
+    def test_times_out_blocked_producer(self):
+        pool = FramePool(capacity=1, overflow=FramePoolOverflow.BLOCK)
+        pool.put(b"\x00")
+
+        assert pool.put(b"\x01", timeout=0.01) is None
+        assert len(pool) == 1
+
+    def test_close_releases_blocked_producer(self):
+        pool = FramePool(capacity=1, overflow=FramePoolOverflow.BLOCK)
+        pool.put(b"\x00")
+        stored = []
+
+        producer = threading.Thread(target=lambda: stored.append(pool.put(b"\x01")))
+        producer.start()
+        pool.close()
+        producer.join(1)
+
+        assert stored == [None]
+
+    def test_blocking_put_from_event_loop_keeps_loop_running(self):
+        async def run_test():
+            pool = FramePool(capacity=1, overflow=FramePoolOverflow.BLOCK)
+            await pool.put_async(b"\x00")
+
+            put = asyncio.create_task(pool.put_async(b"\x01"))
+            await asyncio.sleep(0.05)
+            assert not put.done()
+
+            assert pool.get() == b"\x00"
+            assert await asyncio.wait_for(put, 1) == 1
+
+        asyncio.run(run_test())
+
+    def test_keeps_frames_when_putting_after_close(self):
+        for overflow in FramePoolOverflow:
+            pool = FramePool(capacity=2, overflow=overflow)
+            pool.put(b"a")
+            pool.put(b"b")
+            pool.close()
+
+            assert pool.put(b"c") is None
+            assert pool.dropped == 0
+            assert [pool.get(), pool.get(), pool.get()] == [b"a", b"b", None]
+
+    def test_rejects_invalid_capacity(self):
+        with pytest.raises(ValueError):
+            FramePool(capacity=0)